@@ -23,6 +23,8 @@ class GameConfig(Config):
         self.wincap = 5000.0
         self.win_type = "lines"
         self.rtp = 0.9700
+        # no game state persists between repeat attempts, so rejected attempts skip event construction
+        self.defer_rejected_events = True
         self.construct_paths()
 
         # Game Dimensions
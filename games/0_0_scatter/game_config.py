@@ -23,6 +23,8 @@ class GameConfig(Config):
         self.wincap = 5000.0
         self.win_type = "scatter"
         self.rtp = 0.9700
+        # no game state persists between repeat attempts, so rejected attempts skip event construction
+        self.defer_rejected_events = True
         self.construct_paths()
 
         # Game Dimensions
@@ -163,6 +165,8 @@ class GameConfig(Config):
                             "force_wincap": False,
                             "force_freegame": False,
                         },
+                        # zero-win spins are rejected as soon as a tumble or free spin starts with a win
+                        abort_conditions=["exceeds_win_criteria"],
                     ),
                     Distribution(
                         criteria="basegame",
@@ -25,7 +25,7 @@ class GameStateOverride(GameExecutables):
     def assign_mult_property(self, symbol):
         """Use betmode conditions to assign multiplier attribute to multiplier symbol."""
         multiplier_value = get_random_outcome(
-            self.get_current_distribution_conditions()["mult_values"][self.gametype]
+            self.get_current_distribution_conditions()["mult_values"][self.gametype], rng=self.rng
         )
         symbol.assign_attribute({"multiplier": multiplier_value})
 
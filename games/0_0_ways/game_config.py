@@ -22,6 +22,8 @@ class GameConfig(Config):
         self.wincap = 5000
         self.win_type = "ways"
         self.rtp = 0.97
+        # no game state persists between repeat attempts, so rejected attempts skip event construction
+        self.defer_rejected_events = True
         self.construct_paths()
 
         # Game Dimensions
@@ -1,8 +1,8 @@
 from .game_calculations import GameCalculations
 from src.calculations.cluster import Cluster
+from src.calculations.statistics import get_weighted_sampler
 from .game_events import update_grid_mult_event
 from src.events.events import update_freespin_event
-import random
 
 
 class GameExecutables(GameCalculations):
@@ -51,20 +51,15 @@ class GameExecutables(GameCalculations):
         self._collector_marked = set()
         # Мапа множників C за ідентифікатором інстансу символу (щоб не писати в сам Symbol)
         self._collector_symbol_mult = {}
+        # Тримаємо відстежені інстанси C живими до кінця спіну, щоб їх id() не перевикористався новими символами
+        self._collector_symbols = []
 
     def _weighted_pick(self, weights_map: dict) -> int:
         """Pick an integer key from weights_map with probability proportional to weight."""
-        total = sum(weights_map.values())
-        r = random.randint(1, total)
-        acc = 0
-        last_key = None
-        for k, w in weights_map.items():
-            acc += w
-            last_key = k
-            if r <= acc:
-                return int(k)
-        # fallback (не має статись, але лишаємо на випадок похибок)
-        return int(last_key) if last_key is not None else 0
+        sampler = get_weighted_sampler(weights_map)
+        if self.rng.alias_sampling:
+            return int(sampler.draw_alias(self.rng))
+        return int(sampler.draw_randint(self.rng))
 
     def assign_special_sym_function(self):
         """
@@ -106,6 +101,7 @@ class GameExecutables(GameCalculations):
                         picked = self._weighted_pick(values_map)
                         # Зберігаємо множник у локальній мапі (не в Symbol)
                         self._collector_symbol_mult[sid] = int(picked)
+                        self._collector_symbols.append(sym)
 
     def collect_collectors_current_reveal(self):
         """
@@ -133,6 +129,7 @@ class GameExecutables(GameCalculations):
                     if sid in self._collector_marked:
                         continue
                     self._collector_marked.add(sid)
+                    self._collector_symbols.append(sym)
 
                     # Базовий множник символу C (з нашої мапи)
                     base = self._collector_symbol_mult.get(sid, 0)
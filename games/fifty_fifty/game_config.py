@@ -16,6 +16,8 @@ class GameConfig(Config):
         self.wincap = 2
         self.win_type = "other"
         self.rtp = 0
+        # no game state persists between repeat attempts, so rejected attempts skip event construction
+        self.defer_rejected_events = True
         self.construct_paths()
 
         # Game Dimensions
@@ -1,46 +1,52 @@
 """Handles generating game-boards from reelstrips"""
 
-import random
 from typing import List
 from src.state.state import GeneralGameState
+from src.config.reelstrips import Reelstrip
+from src.calculations.board_sampling import ReelstripIndex
 from src.calculations.statistics import get_random_outcome
 from src.events.events import reveal_event
+from src.state.phase_timer import detailed_phase
 
 
 class Board(GeneralGameState):
     """Handles generation of a game board and symbols"""
 
-    def create_board_reelstrips(self) -> None:
-        """Randomly selects stopping positions from a reelstrip."""
+    _reelstrip_indexes = None
+    _conditioned_reel_weights = None
+
+    @detailed_phase("create_board_reelstrips")
+    def create_board_reelstrips(self, reelstrip_id: str = None, reel_positions: List[int] = None) -> None:
+        """Randomly selects stopping positions from a reelstrip (unless the reelstrip and positions are given)."""
         if self.config.include_padding:
             top_symbols = []
             bottom_symbols = []
         self.refresh_special_syms()
-        self.reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
-        )
-        self.reelstrip = self.config.reels[self.reelstrip_id]
+        if reelstrip_id is None:
+            reelstrip_id = get_random_outcome(
+                self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
+            )
+        self.reelstrip_id = reelstrip_id
+        self.reelstrip = self.get_reelstrip(self.reelstrip_id)
         anticipation = [0] * self.config.num_reels
         board = [[]] * self.config.num_reels
         for i in range(self.config.num_reels):
             board[i] = [0] * self.config.num_rows[i]
-        reel_positions = [random.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
+        if reel_positions is None:
+            reel_positions = [
+                self.rng.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)
+            ]
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
             reel_pos = reel_positions[reel]
+            window_ids = self.reelstrip.window_ids[reel]
+            start = reel_pos % len(self.reelstrip[reel])
             if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
+                top_symbols.append(self.create_symbol_by_id(window_ids[start - 1]))
+                bottom_symbols.append(self.create_symbol_by_id(window_ids[start + len(board[reel])]))
+            for row, symbol_id in enumerate(window_ids[start : start + self.config.num_rows[reel]]):
+                sym = self.create_symbol_by_id(symbol_id)
                 board[reel][row] = sym
                 if sym.special:
                     for special_symbol in self.special_syms_on_board:
@@ -75,42 +81,44 @@ class Board(GeneralGameState):
             self.top_symbols = top_symbols
             self.bottom_symbols = bottom_symbols
 
-    def force_board_from_reelstrips(self, reelstrip_id: str, force_stop_positions: List[List]) -> None:
-        """Creates a gameboard from specified stopping positions."""
+    @detailed_phase("create_board_reelstrips")
+    def force_board_from_reelstrips(
+        self, reelstrip_id: str, force_stop_positions: List[List], reel_positions: List[int] = None
+    ) -> None:
+        """
+        Creates a gameboard from specified stopping positions.
+        Forced reels stop with the symbol in a random row, unless the positions of all reels are given.
+        """
         if self.config.include_padding:
             top_symbols = []
             bottom_symbols = []
         self.refresh_special_syms()
         self.reelstrip_id = reelstrip_id
-        self.reelstrip = self.config.reels[self.reelstrip_id]
+        self.reelstrip = self.get_reelstrip(self.reelstrip_id)
         anticipation = [0] * self.config.num_reels
         board = [[]] * self.config.num_reels
         for i in range(self.config.num_reels):
             board[i] = [0] * self.config.num_rows[i]
 
-        reel_positions = [None] * self.config.num_reels
-        for r, s in force_stop_positions.items():
-            reel_positions[r] = s - random.randint(0, self.config.num_rows[r] - 1)
-        for r, _ in enumerate(reel_positions):
-            if reel_positions[r] is None:
-                reel_positions[r] = random.randrange(0, len(self.reelstrip[r]))
+        if reel_positions is None:
+            reel_positions = [None] * self.config.num_reels
+            for r, s in force_stop_positions.items():
+                reel_positions[r] = s - self.rng.randint(0, self.config.num_rows[r] - 1)
+            for r, _ in enumerate(reel_positions):
+                if reel_positions[r] is None:
+                    reel_positions[r] = self.rng.randrange(0, len(self.reelstrip[r]))
 
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
             reel_pos = reel_positions[reel]
+            window_ids = self.reelstrip.window_ids[reel]
+            start = reel_pos % len(self.reelstrip[reel])
             if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
+                top_symbols.append(self.create_symbol_by_id(window_ids[start - 1]))
+                bottom_symbols.append(self.create_symbol_by_id(window_ids[start + len(board[reel])]))
+            for row, symbol_id in enumerate(window_ids[start : start + self.config.num_rows[reel]]):
+                sym = self.create_symbol_by_id(symbol_id)
                 board[reel][row] = sym
 
                 if sym.special:
@@ -152,6 +160,16 @@ class Board(GeneralGameState):
 
         return symObject
 
+    def create_symbol_by_id(self, symbol_id: int) -> object:
+        """create_symbol() from a compiled paytable symbol id, as read from compiled reelstrips."""
+        symObject = self.symbol_storage.create_symbol_state_by_id(symbol_id)
+        special_functions = self.special_symbol_functions.get(symObject.name)
+        if special_functions is not None:
+            for func in special_functions:
+                func(symObject)
+
+        return symObject
+
     def refresh_special_syms(self) -> None:
         """Reset recorded speical symbols on board."""
         self.special_syms_on_board = {}
@@ -192,6 +210,7 @@ class Board(GeneralGameState):
             board_str.append([x.name for x in board[reel]])
         return board_str
 
+    @detailed_phase("draw_board")
     def draw_board(self, emit_event: bool = True, trigger_symbol: str = "scatter") -> None:
         """Instead of retrying to draw a board, force the initial revel to have a
         specific number of scatters, if the betmode criteria specifies this."""
@@ -199,17 +218,21 @@ class Board(GeneralGameState):
             self.get_current_distribution_conditions()["force_freegame"]
             and self.gametype == self.config.basegame_type
         ):
-            num_scatters = get_random_outcome(self.get_current_distribution_conditions()["scatter_triggers"])
+            num_scatters = get_random_outcome(
+                self.get_current_distribution_conditions()["scatter_triggers"], rng=self.rng
+            )
             self.force_special_board(trigger_symbol, num_scatters)
         elif (
             not (self.get_current_distribution_conditions()["force_freegame"])
             and self.gametype == self.config.basegame_type
         ):
-            self.create_board_reelstrips()
-            while self.count_special_symbols(trigger_symbol) >= min(
-                self.config.freespin_triggers[self.gametype].keys()
-            ):
+            trigger_limit = min(self.config.freespin_triggers[self.gametype].keys())
+            if self.config.board_sampling == "conditioned":
+                self.create_board_below_trigger(trigger_symbol, trigger_limit)
+            else:
                 self.create_board_reelstrips()
+                while self.count_special_symbols(trigger_symbol) >= trigger_limit:
+                    self.create_board_reelstrips()
         else:
             self.create_board_reelstrips()
         if emit_event:
@@ -228,26 +251,114 @@ class Board(GeneralGameState):
         Note: If it is possible for two target symbols to appear on one reel, this method
         will not be able to guarantee an exact number of target symbols or actually random
         reel positions. I.e. Ensure the reels do not have stacked scatter symbols.
+
+        With config.board_sampling = "conditioned" the board is drawn in a single pass from the
+        distribution of boards this loop accepts, see ReelstripIndex.sample_forced().
         """
+        if self.config.board_sampling == "conditioned":
+            reelstrip_id = get_random_outcome(
+                self.get_conditioned_reel_weights(force_criteria, "forced", num_force_syms), rng=self.rng
+            )
+            reel_positions = self.get_reelstrip_index(reelstrip_id, force_criteria).sample_forced(
+                num_force_syms, self.rng
+            )
+            self.force_board_from_reelstrips(reelstrip_id, {}, reel_positions)
+            if self.count_forced_symbols(force_criteria) != num_force_syms:
+                raise RuntimeError(
+                    f"Conditioned board has {self.count_forced_symbols(force_criteria)} '{force_criteria}' symbols, "
+                    f"expected {num_force_syms}. Symbol functions may change '{force_criteria}' symbols, "
+                    "use config.board_sampling = 'rejection'."
+                )
+            return
         while True:
             self._force_special_board(force_criteria, num_force_syms)
-            if (
-                force_criteria in self.config.special_symbols
-                and self.count_special_symbols(force_criteria) == num_force_syms
-            ):
-                break
-            elif (
-                not (force_criteria in self.config.special_symbols)
-                and self.count_symbols_on_board(force_criteria) == num_force_syms
-            ):
+            if self.count_forced_symbols(force_criteria) == num_force_syms:
                 break
 
+    def count_forced_symbols(self, force_criteria: str) -> int:
+        """Number of special symbols of kind 'force_criteria', or of symbols with that name, on the board."""
+        if force_criteria in self.config.special_symbols:
+            return self.count_special_symbols(force_criteria)
+        return self.count_symbols_on_board(force_criteria)
+
+    def create_board_below_trigger(self, trigger_symbol: str, trigger_limit: int) -> None:
+        """
+        Draw a board with fewer than 'trigger_limit' special symbols of kind 'trigger_symbol' in a single pass,
+        from the distribution of boards accepted by redrawing create_board_reelstrips() until there are.
+        """
+        reelstrip_id = get_random_outcome(
+            self.get_conditioned_reel_weights(trigger_symbol, "below", trigger_limit), rng=self.rng
+        )
+        reel_positions = self.get_reelstrip_index(reelstrip_id, trigger_symbol).sample_below(trigger_limit, self.rng)
+        self.create_board_reelstrips(reelstrip_id, reel_positions)
+        if self.count_special_symbols(trigger_symbol) >= trigger_limit:
+            raise RuntimeError(
+                f"Conditioned board has {self.count_special_symbols(trigger_symbol)} '{trigger_symbol}' symbols. "
+                f"Symbol functions may change '{trigger_symbol}' symbols, use config.board_sampling = 'rejection'."
+            )
+
+    def get_reelstrip(self, reelstrip_id: str) -> Reelstrip:
+        """Compiled reelstrip of config.reels, compiling reelstrips assigned after the gamestate was created."""
+        reelstrip = self.config.reels[reelstrip_id]
+        if not isinstance(reelstrip, Reelstrip) or reelstrip.window_ids is None:
+            self.config.compile_reels(list(self.symbol_storage.symbols))
+            reelstrip = self.config.reels[reelstrip_id]
+        return reelstrip
+
+    def get_reelstrip_index(self, reelstrip_id: str, target_symbol: str) -> ReelstripIndex:
+        """
+        Cached stop positions of a reelstrip grouped by the number of 'target_symbol' symbols they reveal.
+        Special symbol kinds count all symbols of that kind, other targets are matched by name
+        (as count_symbols_on_board() and get_syms_on_reel() do).
+        """
+        if self._reelstrip_indexes is None:
+            self._reelstrip_indexes = {}
+        key = (reelstrip_id, target_symbol)
+        if key not in self._reelstrip_indexes:
+            reelstrip = self.config.reels[reelstrip_id]
+            if target_symbol in self.config.special_symbols:
+                counted_names = stop_names = set(self.config.special_symbols[target_symbol])
+            else:
+                names = {name for reel in reelstrip for name in reel}
+                counted_names = {name for name in names if name.upper() == target_symbol.upper()}
+                stop_names = {target_symbol}
+            self._reelstrip_indexes[key] = ReelstripIndex(reelstrip, self.config.num_rows, counted_names, stop_names)
+        return self._reelstrip_indexes[key]
+
+    def get_conditioned_reel_weights(self, target_symbol: str, condition: str, num_symbols: int) -> dict:
+        """
+        Current reel_weights, with each reelstrip weighted by the probability that it produces an accepted board:
+        fewer than 'num_symbols' target symbols ("below"), or exactly 'num_symbols' when forcing as many reels
+        ("forced"). Cached per reel_weights distribution.
+        """
+        if self._conditioned_reel_weights is None:
+            self._conditioned_reel_weights = {}
+        reel_weights = self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+        key = (id(reel_weights), target_symbol, condition, num_symbols)
+        cached = self._conditioned_reel_weights.get(key)
+        if cached is None or cached[0] is not reel_weights:
+            conditioned = {}
+            for reelstrip_id, weight in reel_weights.items():
+                index = self.get_reelstrip_index(reelstrip_id, target_symbol)
+                if condition == "below":
+                    conditioned[reelstrip_id] = weight * index.get_below_probability(num_symbols)
+                else:
+                    conditioned[reelstrip_id] = weight * index.get_forced_probability(num_symbols)
+            if sum(conditioned.values()) <= 0:
+                raise RuntimeError(
+                    f"No reelstrip in {list(reel_weights)} can produce a board with {condition} {num_symbols} "
+                    f"'{target_symbol}' symbols."
+                )
+            cached = (reel_weights, conditioned)
+            self._conditioned_reel_weights[key] = cached
+        return cached[1]
+
     def _force_special_board(self, force_criteria: str, num_force_syms: int) -> None:
         """
         Helper function for forcing special (or name specific) symbols
         """
         reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
         )
         reelstops = self.get_syms_on_reel(reelstrip_id, force_criteria)
 
@@ -258,8 +369,8 @@ class Board(GeneralGameState):
         while len(force_stop_positions) != num_force_syms:
             possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
             possible_probs = [p for p in sym_prob if p > 0]
-            chosen_reel = random.choices(possible_reels, possible_probs)[0]
-            chosen_stop = random.choice(reelstops[chosen_reel])
+            chosen_reel = self.rng.choices(possible_reels, possible_probs)[0]
+            chosen_stop = self.rng.choice(reelstops[chosen_reel])
             sym_prob[chosen_reel] = 0
             force_stop_positions[int(chosen_reel)] = int(chosen_stop)
 
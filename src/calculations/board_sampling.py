@@ -0,0 +1,187 @@
+"""
+Conditioned board sampling: stop positions drawn directly with a required number of target symbols.
+Each ReelstripIndex groups the stop positions of a reelstrip by the number of target symbols in their window,
+so boards which would be accepted by the rejection loops in Board.draw_board() and Board.force_special_board()
+are sampled in a single pass, with the same distribution as the accepted boards of those loops.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List
+
+
+def add_count_distributions(first: List[float], second: List[float]) -> List[float]:
+    """Distribution of the sum of two independent counts."""
+    total = [0.0] * (len(first) + len(second) - 1)
+    for i, p in enumerate(first):
+        if p > 0:
+            for j, q in enumerate(second):
+                total[i + j] += p * q
+    return total
+
+
+class ReelstripIndex:
+    """
+    Stop positions of one reelstrip, grouped per reel by the number of target symbols in the window they reveal.
+
+    Unforced reels stop uniformly, so the count of a reel follows 'count_probs' and a stop is uniform among
+    'positions_by_count'. Reels forced by force_special_board() stop on a uniformly chosen target stop shifted
+    by a uniform row offset: 'forced_positions_by_count' lists every (stop - offset) position this can produce
+    (with multiplicity) by the resulting window count, and 'densities' are the reel weights used to choose
+    which reels are forced.
+    """
+
+    def __init__(self, reelstrip: List[List[str]], num_rows: List[int], counted_names: set, stop_names: set):
+        self.num_reels = len(num_rows)
+        self.positions_by_count = []
+        self.count_probs = []
+        self.forced_positions_by_count = []
+        self.forced_count_probs = []
+        self.densities = []
+        for reel, rows in enumerate(num_rows):
+            strip = reelstrip[reel]
+            length = len(strip)
+            counted = [1 if name in counted_names else 0 for name in strip]
+            window_counts = [
+                sum(counted[(position + row) % length] for row in range(rows)) for position in range(length)
+            ]
+            positions_by_count = [[] for _ in range(rows + 1)]
+            for position, count in enumerate(window_counts):
+                positions_by_count[count].append(position)
+            self.positions_by_count.append(positions_by_count)
+            self.count_probs.append([len(positions) / length for positions in positions_by_count])
+
+            stops = [position for position, name in enumerate(strip) if name in stop_names]
+            forced_positions_by_count = [[] for _ in range(rows + 1)]
+            for stop in stops:
+                for offset in range(rows):
+                    forced_positions_by_count[window_counts[(stop - offset) % length]].append(stop - offset)
+            num_forced = max(len(stops) * rows, 1)
+            self.forced_positions_by_count.append(forced_positions_by_count)
+            self.forced_count_probs.append([len(positions) / num_forced for positions in forced_positions_by_count])
+            self.densities.append(len(stops) / length)
+
+        self._below_tails = None
+        self._forced_masks = {}
+        self._forced_tails = {}
+        self._forced_weights = {}
+        self._count_tables = {}
+
+    def get_tails(self, reel_probs: List[List[float]]) -> List[List[float]]:
+        """tails[r][t]: probability that reels r, r+1, ... reveal exactly t target symbols in total."""
+        tails = [[1.0]]
+        for probs in reversed(reel_probs):
+            tails.insert(0, add_count_distributions(probs, tails[0]))
+        return tails
+
+    def get_count_table(self, key: tuple, reel_probs: List[List[float]], allowed) -> List[List[List[float]]]:
+        """
+        table[reel][total]: cumulative weights of each count of 'reel', given that the earlier reels revealed 'total'
+        target symbols and the board total must satisfy allowed(board total). Cached under 'key'.
+        """
+        if key not in self._count_tables:
+            tails = self.get_tails(reel_probs)
+            table = []
+            for reel, probs in enumerate(reel_probs):
+                tail = tails[reel + 1]
+                reel_table = []
+                for total in range(len(tails[0])):
+                    weights = [
+                        p * sum(q for rest, q in enumerate(tail) if allowed(total + count + rest)) if p > 0 else 0.0
+                        for count, p in enumerate(probs)
+                    ]
+                    reel_table.append(list(accumulate(weights)))
+                table.append(reel_table)
+            self._count_tables[key] = table
+        return self._count_tables[key]
+
+    def sample_counts(self, table: List[List[List[float]]], rng) -> List[int]:
+        """Per-reel counts drawn reel by reel from the exact conditionals of a count table."""
+        counts = []
+        total = 0
+        for reel_table in table:
+            cumulative = reel_table[total]
+            count = bisect_right(cumulative, rng.random() * cumulative[-1])
+            counts.append(count)
+            total += count
+        return counts
+
+    def get_below_probability(self, limit: int) -> float:
+        """Probability that uniform stops reveal fewer than 'limit' target symbols."""
+        if self._below_tails is None:
+            self._below_tails = self.get_tails(self.count_probs)
+        return sum(self._below_tails[0][:limit])
+
+    def sample_below(self, limit: int, rng) -> List[int]:
+        """Uniform stops conditioned on revealing fewer than 'limit' target symbols."""
+        table = self.get_count_table(("below", limit), self.count_probs, lambda total: total < limit)
+        counts = self.sample_counts(table, rng)
+        return [rng.choice(self.positions_by_count[reel][count]) for reel, count in enumerate(counts)]
+
+    def get_forced_masks(self, num_forced: int) -> dict:
+        """
+        {reel mask: probability} of the set of forced reels, chosen one at a time with probability proportional
+        to their density among reels not chosen yet.
+        """
+        if num_forced not in self._forced_masks:
+            mask_probs = {0: 1.0}
+            for _ in range(num_forced):
+                next_probs = {}
+                for mask, probability in mask_probs.items():
+                    remaining = [
+                        reel for reel in range(self.num_reels) if not mask >> reel & 1 and self.densities[reel] > 0
+                    ]
+                    remaining_density = sum(self.densities[reel] for reel in remaining)
+                    for reel in remaining:
+                        chosen = mask | 1 << reel
+                        chosen_probability = probability * self.densities[reel] / remaining_density
+                        next_probs[chosen] = next_probs.get(chosen, 0.0) + chosen_probability
+                mask_probs = next_probs
+            self._forced_masks[num_forced] = mask_probs
+        return self._forced_masks[num_forced]
+
+    def get_mask_probs(self, mask: int) -> List[List[float]]:
+        """Per-reel count distributions when the reels in 'mask' are forced."""
+        return [
+            self.forced_count_probs[reel] if mask >> reel & 1 else self.count_probs[reel]
+            for reel in range(self.num_reels)
+        ]
+
+    def get_mask_tails(self, mask: int) -> List[List[float]]:
+        """Cached get_tails() of a forced reel mask."""
+        if mask not in self._forced_tails:
+            self._forced_tails[mask] = self.get_tails(self.get_mask_probs(mask))
+        return self._forced_tails[mask]
+
+    def get_forced_weights(self, num_forced: int) -> dict:
+        """{mask: probability that the reels in mask are forced and the board reveals exactly num_forced symbols}."""
+        if num_forced not in self._forced_weights:
+            weights = {}
+            for mask, probability in self.get_forced_masks(num_forced).items():
+                tail = self.get_mask_tails(mask)[0]
+                weights[mask] = probability * (tail[num_forced] if num_forced < len(tail) else 0.0)
+            self._forced_weights[num_forced] = weights
+        return self._forced_weights[num_forced]
+
+    def get_forced_probability(self, num_forced: int) -> float:
+        """Probability that forcing 'num_forced' reels reveals exactly 'num_forced' target symbols in total."""
+        return sum(self.get_forced_weights(num_forced).values())
+
+    def sample_forced(self, num_forced: int, rng) -> List[int]:
+        """
+        Stops of force_special_board() conditioned on revealing exactly 'num_forced' target symbols in total.
+        Forced reels keep the unwrapped (stop - offset) position, as force_board_from_reelstrips() does.
+        """
+        weights = self.get_forced_weights(num_forced)
+        masks = list(weights)
+        cumulative = list(accumulate(weights.values()))
+        mask = masks[bisect_right(cumulative, rng.random() * cumulative[-1])]
+        table = self.get_count_table(
+            ("forced", mask, num_forced), self.get_mask_probs(mask), lambda total: total == num_forced
+        )
+        counts = self.sample_counts(table, rng)
+        reel_positions = []
+        for reel, count in enumerate(counts):
+            positions = self.forced_positions_by_count if mask >> reel & 1 else self.positions_by_count
+            reel_positions.append(rng.choice(positions[reel][count]))
+        return reel_positions
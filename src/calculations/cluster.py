@@ -1,10 +1,11 @@
 from collections import defaultdict
 from abc import ABC
 from typing import List, Dict
-from src.calculations.board import Board
 from src.calculations.symbol import Symbol
 from src.config.config import Config
+from src.config.paytable import get_compiled_paytable
 from src.wins.multiplier_strategy import apply_mult
+from src.state.phase_timer import detailed_phase
 
 
 class Cluster:
@@ -24,27 +25,35 @@ class Cluster:
 
         return (reel_to_overlay, row_to_overlay)
 
+    _neighbour_tables = {}
+
     @staticmethod
-    def get_neighbours(board: list[list[Symbol]], reel: int, row: int, local_checked: list) -> list:
-        """All neighbouring symbols within board range."""
-        neighbours = []
-        if reel > 0:
-            if (reel - 1, row) not in local_checked:
-                neighbours += [(reel - 1, row)]
-                local_checked += [(reel - 1, row)]
-        if reel < len(board) - 1:
-            if (reel + 1, row) not in local_checked:
-                neighbours += [(reel + 1, row)]
-                local_checked += [(reel + 1, row)]
-        if row > 0:
-            if (reel, row - 1) not in local_checked:
-                neighbours += [(reel, row - 1)]
-                local_checked += [(reel, row - 1)]
-        if row < len(board[reel]) - 1:
-            if (reel, row + 1) not in local_checked:
-                neighbours += [(reel, row + 1)]
-                local_checked += [(reel, row + 1)]
-        return neighbours
+    def get_neighbour_table(board_shape: tuple) -> tuple:
+        """
+        Flat-indexed board geometry, cached per board shape (number of rows on each reel).
+        Returns the (reel, row) position of each flat cell index and the neighbouring cell indices
+        in (left, right, up, down) order.
+        """
+        table = Cluster._neighbour_tables.get(board_shape)
+        if table is None:
+            offsets = [sum(board_shape[:reel]) for reel in range(len(board_shape))]
+            positions, neighbours = [], []
+            for reel, num_rows in enumerate(board_shape):
+                for row in range(num_rows):
+                    cell_neighbours = []
+                    if reel > 0 and row < board_shape[reel - 1]:
+                        cell_neighbours.append(offsets[reel - 1] + row)
+                    if reel < len(board_shape) - 1 and row < board_shape[reel + 1]:
+                        cell_neighbours.append(offsets[reel + 1] + row)
+                    if row > 0:
+                        cell_neighbours.append(offsets[reel] + row - 1)
+                    if row < num_rows - 1:
+                        cell_neighbours.append(offsets[reel] + row + 1)
+                    positions.append((reel, row))
+                    neighbours.append(tuple(cell_neighbours))
+            table = (tuple(positions), tuple(neighbours))
+            Cluster._neighbour_tables[board_shape] = table
+        return table
 
     @staticmethod
     def in_cluster(board: list[list[Symbol]], reel: int, row: int, og_symbol: str) -> bool:
@@ -52,57 +61,62 @@ class Cluster:
         return og_symbol == board[reel][row].name
 
     @staticmethod
-    def check_all_neighbours(
-        board: Board,
-        already_checked: list,
-        local_checked: list,
-        potential_cluster: list,
-        reel,
-        row,
-        og_symbol: str,
-    ):
-        """Recursively check neighbours for like-symbols (no wild logic)."""
-        neighbours = Cluster.get_neighbours(board, reel, row, local_checked)
-        for reel_, row_ in neighbours:
-            if Cluster.in_cluster(board, reel_, row_, og_symbol):
-                potential_cluster += [(reel_, row_)]
-                already_checked += [(reel_, row_)]
-                Cluster.check_all_neighbours(
-                    board,
-                    already_checked,
-                    local_checked,
-                    potential_cluster,
-                    reel_,
-                    row_,
-                    og_symbol,
-                )
-
-    @staticmethod
+    @detailed_phase("get_clusters")
     def get_clusters(board: list[list[Symbol]]) -> dict:
-        """Return all symbol clusters of size >= 1 (strict symbol equality, no wild)."""
-        already_checked = []
+        """
+        Return all symbol clusters of size >= 1 (strict symbol equality, no wild).
+        Iterative depth-first flood-fill over a flat board, with byte-mask visited sets. When a cell is expanded
+        all of its unchecked neighbours are claimed at once and then followed in (left, right, up, down) order,
+        so cluster positions are listed in the same order as the previous recursive search.
+        """
+        positions, neighbours = Cluster.get_neighbour_table(tuple(len(reel) for reel in board))
+        names = [sym.name for reel in board for sym in reel]
+        num_cells = len(names)
+        already_checked = bytearray(num_cells)
         clusters = defaultdict(list)
-        for reel, _ in enumerate(board):
-            for row, _ in enumerate(board[reel]):
-                if (reel, row) not in already_checked:
-                    potential_cluster = [(reel, row)]
-                    already_checked += [(reel, row)]
-                    local_checked = [(reel, row)]
-                    symbol = board[reel][row].name
-                    Cluster.check_all_neighbours(
-                        board,
-                        already_checked,
-                        local_checked,
-                        potential_cluster,
-                        reel,
-                        row,
-                        symbol,
-                    )
-                    clusters[symbol].append(potential_cluster)
+        for cell in range(num_cells):
+            if already_checked[cell]:
+                continue
+            symbol = names[cell]
+            already_checked[cell] = 1
+            cell_neighbours = neighbours[cell]
+            for neighbour in cell_neighbours:
+                if names[neighbour] == symbol:
+                    break
+            else:
+                clusters[symbol].append([positions[cell]])
+                continue
+
+            potential_cluster = [positions[cell]]
+            local_checked = bytearray(num_cells)
+            local_checked[cell] = 1
+            claimed = []
+            for neighbour in cell_neighbours:
+                if not local_checked[neighbour]:
+                    local_checked[neighbour] = 1
+                    claimed.append(neighbour)
+            stack = [iter(claimed)]
+            while stack:
+                for candidate in stack[-1]:
+                    if names[candidate] == symbol:
+                        potential_cluster.append(positions[candidate])
+                        already_checked[candidate] = 1
+                        claimed = []
+                        for neighbour in neighbours[candidate]:
+                            if not local_checked[neighbour]:
+                                local_checked[neighbour] = 1
+                                claimed.append(neighbour)
+                        stack.append(iter(claimed))
+                        break
+                else:
+                    stack.pop()
+
+            clusters[symbol].append(potential_cluster)
 
         return clusters
 
     @staticmethod
+    @detailed_phase("evaluate_clusters")
     def evaluate_clusters(
         config: Config,
         board: list[list[Symbol]],
@@ -112,19 +126,20 @@ class Cluster:
         return_data: dict = {"totalWin": 0, "wins": []},
     ) -> type:
         """Determine payout amount from cluster, including symbol multiplier and global multiplier value."""
+        paytable = get_compiled_paytable(config)
         exploding_symbols = []
         total_win = 0
         for sym in clusters:
             for cluster in clusters[sym]:
                 syms_in_cluster = len(cluster)
-                if (syms_in_cluster, sym) in config.paytable:
+                sym_win = paytable.get_pay(syms_in_cluster, sym)
+                if sym_win is not None:
                     cluster_mult = 0
                     for positions in cluster:
-                        if board[positions[0]][positions[1]].check_attribute(multiplier_key):
-                            if int(board[positions[0]][positions[1]].get_attribute(multiplier_key)) > 0:
-                                cluster_mult += board[positions[0]][positions[1]].get_attribute(multiplier_key)
+                        multiplier = board[positions[0]][positions[1]].get_active_attribute(multiplier_key)
+                        if multiplier is not None and int(multiplier) > 0:
+                            cluster_mult += multiplier
                     cluster_mult = max(cluster_mult, 1)
-                    sym_win = config.paytable[(syms_in_cluster, sym)]
                     symwin_mult = sym_win * cluster_mult * global_multiplier
                     total_win += symwin_mult
                     json_positions = [{"reel": p[0], "row": p[1]} for p in cluster]
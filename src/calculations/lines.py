@@ -2,7 +2,9 @@
 
 from src.calculations.symbol import Symbol
 from src.config.config import Config
+from src.config.paytable import get_compiled_paytable
 from src.wins.multiplier_strategy import apply_mult
+from src.state.phase_timer import detailed_phase
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -25,6 +27,7 @@ class Lines:
         }
 
     @staticmethod
+    @detailed_phase("get_lines")
     def get_lines(
         board: list[list[Symbol]],
         config: Config,
@@ -38,11 +41,14 @@ class Lines:
             "totalWin": 0,
             "wins": [],
         }
+        paytable = get_compiled_paytable(config)
+        wild_names = paytable.get_special_names(wild_key)
+        wild_pays = paytable.pays_by_name.get(wild_sym)
 
         for line_index in config.paylines.keys():
             line = config.paylines[line_index]
             first_sym = board[0][line[0]]
-            finished_wild_win = False if first_sym.check_attribute(wild_key) else True
+            finished_wild_win = False if first_sym.name in wild_names else True
             first_non_wild = first_sym if finished_wild_win else None
             potential_line = [first_sym]
 
@@ -53,12 +59,12 @@ class Lines:
             for reel in range(1, len(line)):
                 sym = board[reel][line[reel]]
                 if finished_wild_win:
-                    if sym.name == first_non_wild.name or sym.check_attribute(wild_key):
+                    if sym.name == first_non_wild.name or sym.name in wild_names:
                         matches += 1
                     else:
                         break
                 else:
-                    if sym.check_attribute(wild_key) and first_non_wild is None:
+                    if sym.name in wild_names and first_non_wild is None:
                         wild_matches += 1
                     elif first_non_wild is None:
                         first_non_wild = sym
@@ -68,11 +74,12 @@ class Lines:
                         break
                 potential_line.append(sym)
 
-            if (wild_matches, wild_sym) in config.paytable:
-                wild_win = config.paytable[(wild_matches, wild_sym)]
+            if wild_pays is not None and wild_matches <= paytable.max_kind and wild_pays[wild_matches] is not None:
+                wild_win = wild_pays[wild_matches]
             if first_non_wild is not None:
-                if (wild_matches + matches, first_non_wild.name) in config.paytable:
-                    base_win = config.paytable[(wild_matches + matches, first_non_wild.name)]
+                pay = paytable.get_pay(wild_matches + matches, first_non_wild.name)
+                if pay is not None:
+                    base_win = pay
 
             if base_win > 0 or wild_win > 0:
                 if wild_win > base_win:
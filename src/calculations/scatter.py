@@ -4,6 +4,8 @@ from typing import List, Dict
 from collections import defaultdict
 from src.calculations.symbol import Symbol
 from src.config.config import Config
+from src.config.paytable import get_compiled_paytable
+from src.state.phase_timer import detailed_phase
 
 
 class Scatter:
@@ -32,6 +34,7 @@ class Scatter:
         return (reel_to_overlay, row_to_overlay)
 
     @staticmethod
+    @detailed_phase("get_scatterpay_wins")
     def get_scatterpay_wins(
         config: Config,
         board: list[list[Symbol]],
@@ -44,13 +47,15 @@ class Scatter:
             "totalWin": 0,
             "wins": [],
         }
+        paytable = get_compiled_paytable(config)
+        wild_names = paytable.get_special_names(wild_key)
         rows_for_overlay = []
         symbols_on_board = defaultdict(list)
         wild_positions = []
         total_win = 0.0
         for reel_idx, reel in enumerate(board):
             for row_idx, symbol in enumerate(reel):
-                if symbol.name not in config.special_symbols[wild_key]:
+                if symbol.name not in wild_names:
                     symbols_on_board[symbol.name].append({"reel": reel_idx, "row": row_idx})
                 else:
                     wild_positions.append({"reel": reel_idx, "row": row_idx})
@@ -60,13 +65,15 @@ class Scatter:
             if len(wild_positions) > 0:
                 symbols_on_board[sym].extend(wild_positions)
             win_size = len(symbols_on_board[sym])
-            if (win_size, sym) in config.paytable:
+            pay = paytable.get_pay(win_size, sym)
+            if pay is not None:
                 symbol_mult = 0
                 for p in symbols_on_board[sym]:
-                    if board[p["reel"]][p["row"]].check_attribute(multiplier_key):
-                        symbol_mult += board[p["reel"]][p["row"]].get_attribute(multiplier_key)
+                    multiplier = board[p["reel"]][p["row"]].get_active_attribute(multiplier_key)
+                    if multiplier is not None:
+                        symbol_mult += multiplier
 
-                    board[p["reel"]][p["row"]].assign_attribute({"explode": True})
+                    board[p["reel"]][p["row"]].explode = True
 
                 symbol_mult = max(symbol_mult, 1)
                 overlay_position = Scatter.get_central_scatter_position(
@@ -75,12 +82,12 @@ class Scatter:
                 rows_for_overlay.append(overlay_position[1])
                 symbol_win_data = {
                     "symbol": sym,
-                    "win": config.paytable[(win_size, sym)] * global_multiplier * symbol_mult,
+                    "win": pay * global_multiplier * symbol_mult,
                     "positions": symbols_on_board[sym],
                     "meta": {
                         "globalMult": global_multiplier,
                         "clusterMult": symbol_mult,
-                        "winWithoutMult": config.paytable[(win_size, sym)],
+                        "winWithoutMult": pay,
                         "overlay": {
                             "reel": overlay_position[0],
                             "row": overlay_position[1],
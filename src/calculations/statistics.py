@@ -1,20 +1,133 @@
 import random
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import accumulate
 from typing import Union
 
+MAX_CACHED_SAMPLERS = 1024
 
-def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[float, int]:
-    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}"""
+
+class WeightedSampler:
+    """
+    Draw tables of a {value: weight, ...} distribution, built once per distribution object.
+    draw() and draw_randint() reproduce the draws of the linear cumulative walk exactly (same rng calls, same
+    value for every roll), draw_alias() is a Walker alias draw using a single rng.random() call.
+    """
+
+    __slots__ = ("size", "values", "weights", "total", "cumulative", "int_total", "int_cumulative", "probability", "alias")
+
+    def __init__(self, distribution: dict):
+        assert all(weight >= 0 for weight in distribution.values()), "distribution weights must be non-negative"
+        self.size = len(distribution)
+        self.values = list(distribution)
+        self.weights = list(distribution.values())
+        self.total = sum(distribution.values())
+        self.cumulative = []
+        cumulative = 0.0
+        for weight in distribution.values():
+            cumulative += weight
+            self.cumulative.append(cumulative)
+        self.int_total = None
+        self.int_cumulative = None
+        self.probability = None
+        self.alias = None
+
+    def draw(self, rng=random) -> Union[float, int]:
+        """Value of a uniform roll in [0, total] along the cumulative weights."""
+        index = bisect_left(self.cumulative, rng.uniform(0, self.total))
+        if index == self.size:
+            return Exception("error drawing item from distribution")
+        return self.values[index]
+
+    def draw_randint(self, rng=random) -> Union[float, int]:
+        """Value of an integer roll in [1, total] along the cumulative weights, for integer weights."""
+        if self.int_cumulative is None:
+            self.int_cumulative = list(accumulate(self.weights))
+            self.int_total = self.int_cumulative[-1]
+        return self.values[bisect_left(self.int_cumulative, rng.randint(1, self.int_total))]
+
+    def build_alias_table(self) -> None:
+        """Vose's construction of the alias table: O(n) once, every draw is then O(1)."""
+        scaled = [self.size * weight / self.total for weight in self.weights]
+        probability = [1.0] * self.size
+        alias = list(range(self.size))
+        small = [index for index, weight in enumerate(scaled) if weight < 1.0]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        self.probability = probability
+        self.alias = alias
+
+    def draw_alias(self, rng=random) -> Union[float, int]:
+        """Walker alias draw: the integer part of random() * n picks a column, the fraction picks value or alias."""
+        if self.alias is None:
+            self.build_alias_table()
+        roll = rng.random() * self.size
+        index = int(roll)
+        if roll - index < self.probability[index]:
+            return self.values[index]
+        return self.values[self.alias[index]]
+
+
+_sampler_cache = OrderedDict()
+
+
+def get_weighted_sampler(distribution: dict) -> WeightedSampler:
+    """
+    Cached sampler of a distribution, keyed by the distribution object (i.e the dicts in Distribution._conditions
+    and game configs). Distributions are expected to stay unchanged once drawn from, call clear_sampler_cache()
+    after modifying one in place. Once MAX_CACHED_SAMPLERS distributions are cached, the sampler drawn from least
+    recently is dropped, so samplers of short-lived dicts do not evict those drawn from on every spin.
+    """
+    key = id(distribution)
+    cached = _sampler_cache.get(key)
+    if cached is not None and cached[0] is distribution and cached[1].size == len(distribution):
+        _sampler_cache.move_to_end(key)
+        return cached[1]
+    if cached is None and len(_sampler_cache) >= MAX_CACHED_SAMPLERS:
+        _sampler_cache.popitem(last=False)
+    sampler = WeightedSampler(distribution)
+    # the distribution is held by the cache so its id() cannot be reused by another object
+    _sampler_cache[key] = (distribution, sampler)
+    _sampler_cache.move_to_end(key)
+    return sampler
+
+
+def clear_sampler_cache() -> None:
+    """Drop all cached samplers."""
+    _sampler_cache.clear()
+
+
+def get_random_outcome(distribution: dict, totalWeight: float = None, rng=random) -> Union[float, int]:
+    """
+    Returns a value from a distibution passed as a dictionary: {value : weight, ...}
+    Gamestates should pass their generator (rng=self.rng), the module-level generator is used otherwise.
+    Generators created with config.weighted_sampling = "alias" draw from the distribution's alias table,
+    otherwise the draw sequence of the linear cumulative walk is kept.
+    Draws use a sampler built once per distribution object: weights changed in place after a distribution was
+    first drawn from are not seen until clear_sampler_cache() is called (pass a new dict instead).
+    """
     assert isinstance(distribution, dict), "distribution must be of type: dict "
-    if totalWeight is None:
-        totalWeight = sum(distribution.values())
-    roll = random.uniform(0, totalWeight)
-    cumulative = 0.0
-    for value, weight in distribution.items():
-        cumulative += weight
-        if cumulative >= roll:
-            return value
-
-    return Exception("error drawing item from distribution")
+    if totalWeight is not None:
+        roll = rng.uniform(0, totalWeight)
+        cumulative = 0.0
+        for value, weight in distribution.items():
+            cumulative += weight
+            if cumulative >= roll:
+                return value
+        return Exception("error drawing item from distribution")
+
+    sampler = get_weighted_sampler(distribution)
+    if getattr(rng, "alias_sampling", False):
+        return sampler.draw_alias(rng)
+    return sampler.draw(rng)
 
 
 def get_mean_std_median(dist: dict) -> tuple[float, float, float]:
@@ -2,48 +2,169 @@
 
 from typing import Dict
 
+from src.config.paytable import get_compiled_paytable
+
 
 class SymbolStorage:
     """Initial symbol generation from configuration file."""
 
     def __init__(self, config: object, all_symbols: list):
         self.config = config
+        self.prototypes: Dict[str, SymbolPrototype] = {}
         self.symbols: Dict[str, Symbol] = {}
         for symbol in all_symbols:
-            self.symbols[symbol] = Symbol(self.config, symbol)
+            self.symbols[symbol] = Symbol(self.config, symbol, self.get_prototype(symbol))
+        # symbol classes by symbol id of the compiled paytable (the ids of compiled reelstrips)
+        self.symbol_classes = [
+            self.get_prototype(name).symbol_class for name in get_compiled_paytable(config).symbol_names
+        ]
+
+    def get_prototype(self, symbol_name: str) -> object:
+        """Retrieve (or construct once) the shared, read-only properties of a symbol name."""
+        prototype = self.prototypes.get(symbol_name)
+        if prototype is None:
+            prototype = SymbolPrototype(self.config, symbol_name)
+            self.prototypes[symbol_name] = prototype
+        return prototype
 
     def create_symbol_state(self, symbol_name: str) -> object:
         """Create new symbol class instance."""
-        return Symbol(self.config, symbol_name)
+        return self.get_prototype(symbol_name).create_symbol()
+
+    def create_symbol_state_by_id(self, symbol_id: int) -> object:
+        """Create new symbol class instance from its compiled paytable symbol id."""
+        symbol = object.__new__(self.symbol_classes[symbol_id])
+        set_assigned_attributes(symbol, None)
+        return symbol
 
     def get_symbol(self, name: str) -> object:
         """Retrieve symbol class from name."""
         if name not in self.symbols:
-            self.symbols[name] = Symbol(self.config, name)
+            self.symbols[name] = Symbol(self.config, name, self.get_prototype(name))
         return self.symbols[name]
 
 
-class Symbol:
-    """Create symbol from name (string) and assign relevant attributes and special functions."""
+class SymbolPrototype:
+    """
+    Properties shared by every symbol of the same name, computed once from the config.
+    'symbol_class' is a Symbol subclass holding the name, special and the prototype as class attributes,
+    so symbols of one name share a single read-only prototype.
+    """
+
+    __slots__ = ("name", "flags", "special", "is_paying", "paytable", "symbol_class")
 
     def __init__(self, config: object, name: str) -> None:
         self.name = name
-        self.special_functions = []
-        self.special = False
-        is_special = False
+        self.flags = {}
         for special_property in config.special_symbols.keys():
             if name in config.special_symbols[special_property]:
-                setattr(self, special_property, True)
-                is_special = True
+                self.flags[special_property] = True
+        self.special = len(self.flags) > 0
+
+        paying_symbols = set()
+        pay_value = []
+        for tup, val in config.paytable.items():
+            assert isinstance(tup[1], str), "paytable expects string for symbol name, (kind, symbol): value"
+            paying_symbols.add(tup[1])
+            if name == tup[1]:
+                pay_value.append({str(tup[0]): val})
+        self.is_paying = name in paying_symbols
+        self.paytable = pay_value if self.is_paying else None
+        self.symbol_class = self.create_symbol_class()
+
+    def create_symbol_class(self) -> type:
+        """Slotted Symbol subclass with the static properties of this symbol name."""
+        attributes = {"__slots__": (), "name": self.name, "special": self.special, "_prototype": self}
+        return type(f"Symbol[{self.name}]", (Symbol,), attributes)
+
+    def create_symbol(self) -> object:
+        """New symbol of this name, with no attributes assigned yet."""
+        symbol = object.__new__(self.symbol_class)
+        set_assigned_attributes(symbol, None)
+        return symbol
+
+    def __getstate__(self):
+        return self.name, self.flags, self.special, self.is_paying, self.paytable
+
+    def __setstate__(self, state) -> None:
+        self.name, self.flags, self.special, self.is_paying, self.paytable = state
+        self.symbol_class = self.create_symbol_class()
+
+
+def restore_symbol(prototype: SymbolPrototype, overrides: dict, attrs: dict) -> object:
+    """Unpickle a symbol of a (dynamically created) prototype symbol class."""
+    symbol = prototype.create_symbol()
+    for attribute, value in overrides.items():
+        object.__setattr__(symbol, attribute, value)
+    set_assigned_attributes(symbol, attrs)
+    return symbol
 
-        if is_special:
-            setattr(self, "special", True)
 
-        self.assign_paying_bool(config)
+_MISSING = object()
+PROTOTYPE_PROPERTIES = ("is_paying", "paytable", "special_functions")
+SYMBOL_PROPERTIES = frozenset(("name", "special") + PROTOTYPE_PROPERTIES)
+
+
+class Symbol:
+    """
+    Create symbol from name (string) and assign relevant attributes and special functions.
+    Symbols are instances of their name's SymbolPrototype.symbol_class, which holds the name and special.
+    is_paying, paytable and special_functions are slots read from the prototype until assigned. Attributes assigned
+    after creation (i.e multiplier, prize, explode) are stored per-instance, shadowing the prototype's special flags,
+    in an attribute dict which is only created on first write.
+    """
+
+    __slots__ = PROTOTYPE_PROPERTIES + ("_attrs",)
+    name = None
+    special = False
+    _prototype = None
+
+    def __new__(cls, config: object = None, name: str = None, prototype: SymbolPrototype = None):
+        if prototype is None:
+            prototype = SymbolPrototype(config, name)
+        return prototype.create_symbol()
+
+    def __init__(self, config: object = None, name: str = None, prototype: SymbolPrototype = None) -> None:
+        pass
+
+    def __getattr__(self, attribute: str):
+        """Resolve assigned attributes, then special flags and unassigned properties from the prototype."""
+        attrs = self._attrs
+        if attrs is not None and attribute in attrs:
+            return attrs[attribute]
+        prototype = self._prototype
+        if attribute in prototype.flags:
+            return prototype.flags[attribute]
+        if attribute == "special_functions":
+            return ()
+        if attribute in PROTOTYPE_PROPERTIES:
+            return getattr(prototype, attribute)
+        raise AttributeError(f"'Symbol' object has no attribute '{attribute}'")
+
+    def __setattr__(self, attribute: str, value) -> None:
+        if attribute in Symbol.__slots__:
+            object.__setattr__(self, attribute, value)
+        elif attribute in SYMBOL_PROPERTIES:
+            raise AttributeError(f"'{attribute}' is shared by every '{self.name}' symbol and can not be assigned")
+        else:
+            attrs = self._attrs
+            if attrs is None:
+                attrs = {}
+                set_assigned_attributes(self, attrs)
+            attrs[attribute] = value
+
+    def __reduce__(self):
+        overrides = {}
+        for attribute in PROTOTYPE_PROPERTIES:
+            try:
+                overrides[attribute] = object.__getattribute__(self, attribute)
+            except AttributeError:
+                pass
+        return restore_symbol, (self._prototype, overrides, self._attrs)
 
     def register_special_function(self, special_function: callable) -> None:
         """Assign special symbol function."""
-        self.special_functions.append(special_function)
+        self.special_functions = list(self.special_functions) + [special_function]
 
     def apply_special_function(self) -> callable:
         """Apply registered symbol function."""
@@ -52,28 +173,33 @@ class Symbol:
 
     def assign_paying_bool(self, config) -> None:
         """Extract paytable from a given symbol."""
-        paying_symbols = set()
-        pay_value = []
-        for tup, val in config.paytable.items():
-            assert isinstance(tup[1], str), "paytable expects string for symbol name, (kind, symbol): value"
-            paying_symbols.add(tup[1])
-            if self.name == tup[1]:
-                pay_value.append({str(tup[0]): val})
-        if self.name not in list(paying_symbols):
-            self.is_paying = False
-            self.paytable = None
-        else:
-            self.is_paying = True
-            self.paytable = pay_value
+        self.is_paying = self._prototype.is_paying
+        self.paytable = self._prototype.paytable
 
     def is_special(self) -> bool:
         """Boolean if symbol has any special properties."""
         return self.special
 
+    def get_active_attribute(self, attribute: str, default=None):
+        """
+        Single-lookup equivalent of check_attribute() followed by get_attribute().
+        Returns the attribute value, or 'default' if the attribute is missing or False.
+        """
+        attrs = self._attrs
+        if attrs is not None and attribute in attrs:
+            value = attrs[attribute]
+        elif attribute in SYMBOL_PROPERTIES:
+            value = getattr(self, attribute)
+        else:
+            value = self._prototype.flags.get(attribute, _MISSING)
+        if value is _MISSING or value is False:
+            return default
+        return value
+
     def check_attribute(self, *args) -> bool:
         """Check if an attribute exists in a given list."""
         for arg in args:
-            if hasattr(self, arg) and (not (isinstance(getattr(self, arg), bool)) or getattr(self, arg) is True):
+            if self.get_active_attribute(arg, _MISSING) is not _MISSING:
                 return True
         return False
 
@@ -86,7 +212,22 @@ class Symbol:
         for prop, value in attribute_dict.items():
             setattr(self, prop, value)
 
+    def get_special_attributes(self) -> dict:
+        """Special flags and dynamically assigned attributes, in the order they were first set."""
+        attrs = self._attrs
+        flags = self._prototype.flags
+        if attrs is None:
+            return dict(flags)
+        special_attributes = {flag: attrs.get(flag, value) for flag, value in flags.items()}
+        for attribute, value in attrs.items():
+            if attribute not in special_attributes:
+                special_attributes[attribute] = value
+        return special_attributes
+
     def __eq__(self, name: str) -> bool:
         if self.name == name:
             return True
         return False
+
+
+set_assigned_attributes = Symbol._attrs.__set__
@@ -3,7 +3,9 @@
 from collections import defaultdict
 from src.calculations.symbol import Symbol
 from src.config.config import Config
+from src.config.paytable import get_compiled_paytable
 from src.wins.multiplier_strategy import apply_mult
+from src.state.phase_timer import detailed_phase
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -15,6 +17,7 @@ class Ways:
     """Collection of Ways-wins functions"""
 
     @staticmethod
+    @detailed_phase("get_ways_data")
     def get_ways_data(
         config: Config,
         board: list[list[Symbol]],
@@ -29,6 +32,8 @@ class Ways:
             "wins": [],
         }
         assert multiplier_strategy in ["symbol", "board", "global"]
+        paytable = get_compiled_paytable(config)
+        wild_names = paytable.get_special_names(wild_key)
         board_mult_count = 0
         potential_wins = defaultdict()
         wilds = [[] for _ in range(len(board))]
@@ -41,10 +46,11 @@ class Ways:
                 elif sym.name in potential_wins:
                     potential_wins[sym.name][reel].append({"reel": reel, "row": row})
 
-                if sym.name in config.special_symbols[wild_key]:
+                if sym.name in wild_names:
                     wilds[reel].append({"reel": reel, "row": row})
-                    if board[reel][row].check_attribute(multiplier_key):
-                        wilds[reel][-1][multiplier_key] = board[reel][row].get_attribute(multiplier_key)
+                    multiplier = sym.get_active_attribute(multiplier_key)
+                    if multiplier is not None:
+                        wilds[reel][-1][multiplier_key] = multiplier
 
         for symbol in potential_wins:
             kind, ways, cumulative_sym_mult = (0, 1, 0)
@@ -53,36 +59,28 @@ class Ways:
                     kind += 1
                     reel_sym_count = 0
                     # Note that here multipliers on subsequent reels multiply (not add, like in lines games)
-                    symbols_have_mult = False
-                    for s in potential_wins[symbol][reel]:
-                        if board[s["reel"]][s["row"]].check_attribute(multiplier_key):
-                            symbols_have_mult = True
+                    reel_multipliers = [
+                        board[s["reel"]][s["row"]].get_active_attribute(multiplier_key)
+                        for s in potential_wins[symbol][reel]
+                    ]
+                    symbols_have_mult = any(multiplier is not None for multiplier in reel_multipliers)
 
                     if symbols_have_mult is False:
                         reel_sym_count += len(potential_wins[symbol][reel])
                     else:
                         reel_sym_count = 0
-                        for s in potential_wins[symbol][reel]:
-                            if (
-                                board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                and multiplier_strategy == "symbol"
-                            ):
-                                reel_sym_count += board[s["reel"]][s["row"]].get_attribute(multiplier_key)
+                        for multiplier in reel_multipliers:
+                            if multiplier is not None and multiplier_strategy == "symbol":
+                                reel_sym_count += multiplier
                             else:
                                 reel_sym_count += 1
-                                if (
-                                    board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                    and multiplier_strategy == "board"
-                                ):
-                                    gm = board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                                    board_mult_count += gm * (gm > 1)
+                                if multiplier is not None and multiplier_strategy == "board":
+                                    board_mult_count += multiplier * (multiplier > 1)
 
                     if len(wilds[reel]) > 0:
                         for sym in wilds[reel]:
-                            if board[sym["reel"]][sym["row"]].check_attribute(
-                                multiplier_key
-                            ) and multiplier_strategy in ["board", "symbol"]:
-                                wild_mult_val = board[sym["reel"]][sym["row"]].get_attribute(multiplier_key)
+                            wild_mult_val = board[sym["reel"]][sym["row"]].get_active_attribute(multiplier_key)
+                            if wild_mult_val is not None and multiplier_strategy in ["board", "symbol"]:
                                 cumulative_sym_mult += wild_mult_val * (wild_mult_val > 1)
                                 if multiplier_strategy == "board":
                                     reel_sym_count += 1
@@ -105,7 +103,8 @@ class Ways:
                 case "symbol":
                     win_multiplier = 1
 
-            if (kind, symbol) in config.paytable:
+            pay = paytable.get_pay(kind, symbol)
+            if pay is not None:
                 positions = []
                 for reel in range(kind):
                     for pos in potential_wins[symbol][reel]:
@@ -113,7 +112,7 @@ class Ways:
                     for pos in wilds[reel]:
                         positions += [pos]
 
-                win = round(config.paytable[kind, symbol] * ways, 2)
+                win = round(pay * ways, 2)
                 win_amt, multiplier = apply_mult(
                     board=board,
                     strategy="global",
@@ -2,6 +2,8 @@
 
 from src.config.betmode import BetMode
 from src.config.paths import PATH_TO_GAMES
+from src.config.paytable import get_compiled_paytable
+from src.config.reelstrips import Reelstrip, load_reelstrip
 import os
 
 
@@ -49,6 +51,18 @@ class Config:
         self.padding_reels = {}  # symbol configuration displayed before the board reveal
 
         self.write_event_list = True
+        # if True, rejected repeat attempts skip event construction and the accepted attempt is simulated again to build
+        # its book. Only enable for games that keep no state between repeat attempts outside of reset_book()
+        self.defer_rejected_events = False
+        # generator used for every draw, see src/state/rng.py. "legacy" reproduces books of earlier releases exactly
+        self.rng_mode = "legacy"
+        # weighted draws (get_random_outcome): "compatible" keeps the draw sequence of published books, "alias" is O(1)
+        self.weighted_sampling = "compatible"
+        # criteria counts per bet mode: "legacy" reproduces allocations of earlier releases, "quota" rounds directly
+        self.criteria_splits = "legacy"
+        # "rejection" redraws boards until the scatter condition holds (reproduces earlier books), "conditioned" draws
+        # accepted boards directly in a single pass, see src/calculations/board_sampling.py
+        self.board_sampling = "rejection"
 
         self.bet_modes = []
         self.opt_params = {None: None}
@@ -104,12 +118,12 @@ class Config:
             self.paying_symbol_names.add(tup[1])
         self.payingSymbolnames = list(self.paying_symbol_names)
 
-    def validate_reel_symbols(self, reel_strip: str) -> None:
-        """Verify that all symbols on the reelstrip are valid."""
-        uniqueSymbols = set()
-        for reel in reel_strip:
-            for row in reel:
-                uniqueSymbols.add(row)
+    def validate_reel_symbols(self, reel_strip: list) -> None:
+        """Verify that all symbols on the reelstrip are valid (compiled reelstrips check their symbol table only)."""
+        if isinstance(reel_strip, Reelstrip):
+            uniqueSymbols = set(reel_strip.symbols)
+        else:
+            uniqueSymbols = {row for reel in reel_strip for row in reel}
 
         isSubset = uniqueSymbols.issubset(set(self.all_valid_sym_names))
         if not isSubset:
@@ -119,25 +133,25 @@ class Config:
                 f"Detected Symbols: {list(uniqueSymbols)}"
             )
 
-    def read_reels_csv(self, file_path):
-        """Read csv from reelstrip path."""
-        reelstrips = []
-        count = 0
-        with open(os.path.abspath(file_path), "r", encoding="UTF-8") as file:
-            for line in file:
-                split_line = line.strip().split(",")
-                for reelIndex in range(len(split_line)):
-                    if count == 0:
-                        reelstrips.append(["".join([ch for ch in split_line[reelIndex] if ch.strip().isalnum()])])
-                    else:
-                        reelstrips[reelIndex].append(
-                            "".join([ch for ch in split_line[reelIndex] if ch.strip().isalnum() and len(ch) > 0])
-                        )
-
-                    assert len(reelstrips[reelIndex][-1]) > 0, "Symbol is empty."
-                count += 1
-
-        return reelstrips
+    def read_reels_csv(self, file_path) -> Reelstrip:
+        """Read csv from reelstrip path, compiled and cached on disk (see src/config/reelstrips.py)."""
+        return load_reelstrip(file_path)
+
+    def compile_reels(self, valid_symbols: list = None) -> None:
+        """
+        Compile reelstrips which were not read with read_reels_csv(), validate every reelstrip once against
+        'valid_symbols' (the symbols of the gamestate's symbol storage) and bind them to the symbol ids of the
+        compiled paytable, which boards are drawn from.
+        """
+        if valid_symbols is not None:
+            self.all_valid_sym_names = valid_symbols
+        symbol_ids = get_compiled_paytable(self).symbol_ids
+        window = max(getattr(self, "num_rows", []), default=0) + 1
+        for reelstrip_id, reelstrip in self.reels.items():
+            if not isinstance(reelstrip, Reelstrip):
+                reelstrip = self.reels[reelstrip_id] = Reelstrip(reelstrip)
+            self.validate_reel_symbols(reelstrip)
+            reelstrip.bind_symbol_ids(symbol_ids, window)
 
     def construct_paths(self) -> None:
         """Assign all output file paths"""
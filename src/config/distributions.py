@@ -17,6 +17,8 @@ class Distribution:
             "reel_weights",
         ],
         default_distribution_conditions: dict = {"force_wincap": False, "force_freegame": False},
+        abort_conditions: list = None,
+        seed_search: bool = False,
     ):
 
         assert quota > 0, "non-zero quota value must be assigned"
@@ -27,6 +29,8 @@ class Distribution:
         self._default_distribution_conditions = default_distribution_conditions
         self._win_criteria = win_criteria
         self.verify_and_set_conditions(conditions)
+        self.set_abort_conditions(abort_conditions)
+        self._seed_search = seed_search
 
     def verify_and_set_conditions(self, conditions):
         """Enforce required conditions for distribution setup."""
@@ -40,6 +44,31 @@ class Distribution:
 
         self._conditions = conditions
 
+    def set_abort_conditions(self, abort_conditions):
+        """
+        Early-termination predicates, either the name of a gamestate method or a callable taking the gamestate.
+        A predicate returning True means the current attempt can no longer satisfy this distribution.
+        """
+        abort_conditions = [] if abort_conditions is None else list(abort_conditions)
+        for condition in abort_conditions:
+            assert isinstance(condition, str) or callable(
+                condition
+            ), "abort conditions must be gamestate method names or callables"
+        self._abort_conditions = abort_conditions
+        self._has_abort_conditions = len(abort_conditions) > 0
+
+    def get_abort_conditions(self):
+        """Return early-termination predicates evaluated at tumble and free-spin boundaries."""
+        return self._abort_conditions
+
+    def has_abort_conditions(self):
+        """Return True if any early-termination predicate is defined."""
+        return self._has_abort_conditions
+
+    def get_seed_search(self):
+        """Return True if accepting attempts are searched for in parallel before simulations are run."""
+        return self._seed_search
+
     def get_criteria(self):
         """Return distribution criteria value."""
         return self._criteria
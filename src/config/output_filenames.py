@@ -119,30 +119,30 @@ class OutputFiles:
                 },
             }
 
-    def get_temp_multi_thread_name(self, betmode: str, thread_index: int, repeat_count: int, compress: bool):
+    def get_temp_multi_thread_name(self, betmode: str, chunk_index: int, compress: bool):
         """Naming convention for temp book files."""
         if compress:
-            filename = f"books_{betmode}_{thread_index}_{repeat_count}.jsonl.zst"
+            filename = f"books_{betmode}_{chunk_index}.jsonl.zst"
         elif not (compress) and self.game_config.output_regular_json:
-            filename = f"books_{betmode}_{thread_index}_{repeat_count}.json"
+            filename = f"books_{betmode}_{chunk_index}.json"
         elif not (compress) and not (self.game_config.output_regular_json):
-            filename = f"books_{betmode}_{thread_index}_{repeat_count}.jsonl"
+            filename = f"books_{betmode}_{chunk_index}.jsonl"
         else:
             raise RuntimeError("Error in logic generating book name")
 
         return os.path.join(self.temp_path, filename)
 
-    def get_temp_lookup_name(self, betmode: str, thread_index: int, repeat_count: int):
+    def get_temp_lookup_name(self, betmode: str, chunk_index: int):
         """Naming convention for temp lookup files."""
-        return os.path.join(self.temp_path, f"lookUpTable_{betmode}_{thread_index}_{repeat_count}")
+        return os.path.join(self.temp_path, f"lookUpTable_{betmode}_{chunk_index}")
 
-    def get_temp_segmented_name(self, betmode: str, thread_index: int, repeat_count: int):
+    def get_temp_segmented_name(self, betmode: str, chunk_index: int):
         """Naming convention for temp segmented lookup files."""
-        return os.path.join(self.temp_path, f"lookUpTableSegmented_{betmode}_{thread_index}_{repeat_count}")
+        return os.path.join(self.temp_path, f"lookUpTableSegmented_{betmode}_{chunk_index}")
 
-    def get_temp_force_name(self, betmode: str, thread_index: int, repeat_count: int):
+    def get_temp_force_name(self, betmode: str, chunk_index: int):
         """Naming convention for temp force files."""
-        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.json")
+        return os.path.join(self.temp_path, f"force_{betmode}_{chunk_index}.bin")
 
     def get_final_book_name(self, betmode: str, compress: bool):
         """Returns final simulation books output name."""
@@ -164,6 +164,26 @@ class OutputFiles:
         """Optimized lookup table"""
         return os.path.join(self.publish_path, f"lookUpTable_{betmode}_0.csv")
 
+    def get_telemetry_name(self):
+        """Per-betmode and criteria simulation telemetry, written alongside stats_summary.json."""
+        return os.path.join(self.library_path, "simulation_telemetry.json")
+
+    def get_temp_allocation_name(self, betmode: str):
+        """Criteria indices of every simulation, memory-mapped by the workers."""
+        return os.path.join(self.temp_path, f"criteria_{betmode}.bin")
+
+    def get_temp_profile_prefix(self, betmode: str):
+        """Prefix of the per-task profiles written by each worker while profiling."""
+        return os.path.join(self.temp_path, f"profile_{betmode}")
+
+    def get_profile_name(self, betmode: str):
+        """Merged pstats profile of all simulation processes."""
+        return os.path.join(self.library_path, f"simulationProfile_{betmode}.prof")
+
+    def get_profile_summary_name(self, betmode: str):
+        """Hot-function summary of the merged profile."""
+        return os.path.join(self.library_path, f"simulationProfile_{betmode}.json")
+
     def get_final_segmented_name(self, betmode: str):
         """Final csv segmented wins lookup table name."""
         return os.path.join(self.lookup_path, f"lookUpTableSegmented_{betmode}.csv")
@@ -0,0 +1,66 @@
+"""Compiled paytable lookups shared by all win evaluators."""
+
+
+class CompiledPaytable:
+    """
+    Dense, read-only view of config.paytable and config.special_symbols.
+    Symbols are assigned integer ids, each id maps to a per-kind list of pays (None where no pay is defined),
+    and special-symbol flags (wild, scatter, multiplier...) are precomputed per id and per name.
+    """
+
+    def __init__(self, config: object):
+        self.source = config.paytable
+        self.num_entries = len(config.paytable)
+        names = []
+        for _, name in config.paytable:
+            assert isinstance(name, str), "paytable expects string for symbol name, (kind, symbol): value"
+            if name not in names:
+                names.append(name)
+        for special_names in config.special_symbols.values():
+            for name in special_names:
+                if name not in names:
+                    names.append(name)
+
+        self.symbol_names = names
+        self.symbol_ids = {name: idx for idx, name in enumerate(names)}
+        self.max_kind = max([kind for kind, _ in config.paytable], default=0)
+        self.pays = [None] * len(names)
+        for (kind, name), pay in config.paytable.items():
+            symbol_id = self.symbol_ids[name]
+            if self.pays[symbol_id] is None:
+                self.pays[symbol_id] = [None] * (self.max_kind + 1)
+            self.pays[symbol_id][kind] = pay
+        self.pays_by_name = {name: self.pays[idx] for idx, name in enumerate(names) if self.pays[idx] is not None}
+
+        self.special_names = {
+            key: frozenset(special_names) for key, special_names in config.special_symbols.items() if key is not None
+        }
+        self.symbol_flags = [
+            frozenset(key for key, special_names in self.special_names.items() if name in special_names)
+            for name in names
+        ]
+
+    def get_pay(self, kind: int, name: str):
+        """Pay for a (kind, symbol) combination, None if the combination does not pay."""
+        row = self.pays_by_name.get(name)
+        if row is None or kind < 0 or kind > self.max_kind:
+            return None
+        return row[kind]
+
+    def get_special_names(self, key: str) -> frozenset:
+        """All symbol names carrying a special property (i.e 'wild')."""
+        return self.special_names.get(key, frozenset())
+
+    def has_flag(self, name: str, key: str) -> bool:
+        """Boolean if symbol name is listed under a special property in the config."""
+        symbol_id = self.symbol_ids.get(name)
+        return symbol_id is not None and key in self.symbol_flags[symbol_id]
+
+
+def get_compiled_paytable(config: object) -> CompiledPaytable:
+    """Return the compiled paytable cached on the config, rebuilding it if the paytable has been replaced."""
+    compiled = getattr(config, "_compiled_paytable", None)
+    if compiled is None or compiled.source is not config.paytable or compiled.num_entries != len(config.paytable):
+        compiled = CompiledPaytable(config)
+        config._compiled_paytable = compiled
+    return compiled
@@ -0,0 +1,117 @@
+"""
+Compiled reelstrips: reels read from csv files are stored as integer symbol ids, cached on disk next to the csv
+(in __reelcache__/) under the hash of the csv content, and bound to the symbol ids of the compiled paytable.
+"""
+
+import io
+import os
+import re
+import pickle
+import hashlib
+from array import array
+from typing import List
+
+REEL_CACHE_DIR = "__reelcache__"
+REEL_CACHE_VERSION = 1
+
+
+def parse_reels_csv(text: str) -> List[List[str]]:
+    """
+    Reels (csv columns) of a reelstrip csv. Only alphanumeric characters of each symbol are kept,
+    the first line sets the number of reels.
+    """
+    reelstrips = []
+    for count, line in enumerate(io.StringIO(text, newline=None)):
+        for reel_index, cell in enumerate(line.strip().split(",")):
+            symbol = cell if cell.isalnum() else "".join(filter(str.isalnum, cell))
+            if count == 0:
+                reelstrips.append([symbol])
+            else:
+                reelstrips[reel_index].append(symbol)
+            assert len(symbol) > 0, "Symbol is empty."
+    return reelstrips
+
+
+class Reelstrip(list):
+    """
+    Reelstrip as a list of reels (lists of symbol names), compiled once when read.
+    'ids' holds the symbol id of every stop of each reel, indexing the reelstrip's own symbol table 'symbols'
+    (the compact form stored in the reel cache). bind_symbol_ids() maps the reels to the symbol ids of the compiled
+    paytable, which the symbol storage shares, as 'window_ids': each reel followed by a wrapped copy, so the window
+    revealed by stop position p (0 <= p < length) is the contiguous slice window_ids[reel][p : p + rows] and the
+    symbol above it window_ids[reel][p - 1]. Reels are read-only once compiled.
+    """
+
+    def __init__(self, reels: List[List[str]], symbols: List[str] = None, ids: List[array] = None):
+        super().__init__(reels)
+        if symbols is None:
+            symbols = list(dict.fromkeys(name for reel in self for name in reel))
+            symbol_ids = {name: symbol_id for symbol_id, name in enumerate(symbols)}
+            ids = [array("H", [symbol_ids[name] for name in reel]) for reel in self]
+        self.symbols = symbols
+        self.ids = ids
+        self.window_ids = None
+
+    @classmethod
+    def from_ids(cls, symbols: List[str], ids: List[array]) -> "Reelstrip":
+        """Reelstrip of a symbol table and per-reel symbol ids (as stored in the reel cache)."""
+        return cls([list(map(symbols.__getitem__, reel)) for reel in ids], symbols, ids)
+
+    def bind_symbol_ids(self, symbol_ids: dict, window: int) -> None:
+        """
+        Build 'window_ids' from the shared {name: symbol id} map, padded so that windows of up to 'window' stops
+        (rows and the padding symbol below them) are a single slice. Every symbol must be in 'symbol_ids'.
+        """
+        shared_ids = [symbol_ids[name] for name in self.symbols]
+        self.window_ids = []
+        for reel in self.ids:
+            reel_ids = array("H", [shared_ids[symbol_id] for symbol_id in reel])
+            self.window_ids.append(reel_ids * (window // max(len(reel_ids), 1) + 2))
+
+
+def get_csv_stem(file_path: str) -> str:
+    """Csv file name without its extension, which names its cache files."""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def get_reel_cache_name(file_path: str, content_hash: str) -> str:
+    """Cache file of a reelstrip csv, named after the csv and the hash of its content."""
+    directory = os.path.join(os.path.dirname(os.path.abspath(file_path)), REEL_CACHE_DIR)
+    return os.path.join(directory, f"{get_csv_stem(file_path)}.{content_hash[:16]}.pickle")
+
+
+def write_reel_cache(cache_name: str, csv_stem: str, reelstrip: Reelstrip) -> None:
+    """Atomically write a compiled reelstrip and remove caches of earlier versions of the same csv."""
+    directory, filename = os.path.split(cache_name)
+    stale_pattern = re.compile(re.escape(csv_stem) + r"\.[0-9a-f]{16}\.pickle")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        temp_name = f"{cache_name}.{os.getpid()}.tmp"
+        with open(temp_name, "wb") as f:
+            pickle.dump((reelstrip.symbols, reelstrip.ids), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_name, cache_name)
+        for stale in os.listdir(directory):
+            if stale != filename and stale_pattern.fullmatch(stale):
+                os.remove(os.path.join(directory, stale))
+    except OSError:
+        pass  # read-only game directories are read from the csv every time
+
+
+def load_reelstrip(file_path: str, use_cache: bool = True) -> Reelstrip:
+    """Compiled reelstrip of a csv file, read from the reel cache when the csv content is unchanged."""
+    with open(os.path.abspath(file_path), "rb") as f:
+        content = f.read()
+    content_hash = hashlib.sha256(content + f"v{REEL_CACHE_VERSION}".encode()).hexdigest()
+    cache_name = get_reel_cache_name(file_path, content_hash)
+    if use_cache and os.path.isfile(cache_name):
+        try:
+            with open(cache_name, "rb") as f:
+                symbols, ids = pickle.load(f)
+            return Reelstrip.from_ids(symbols, ids)
+        except (OSError, EOFError, ValueError, TypeError, IndexError, pickle.UnpicklingError):
+            pass  # unreadable caches are rebuilt from the csv
+
+    reelstrip = Reelstrip(parse_reels_csv(content.decode("UTF-8")))
+    if use_cache:
+        write_reel_cache(cache_name, get_csv_stem(file_path), reelstrip)
+    return reelstrip
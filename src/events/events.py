@@ -1,22 +1,25 @@
 """Defines reusable events"""
 
-from copy import deepcopy
 from src.events.event_constants import EventConstants
+from src.state.books import copy_json
+from src.state.phase_timer import detailed_phase
 
 
 def json_ready_sym(symbol: object, special_attributes: list = None):
     """Converts a symbol to dictionary/JSON format."""
     assert special_attributes is not None
     print_sym = {"name": symbol.name}
-    attrs = vars(symbol)
-    for key, val in attrs.items():
-        if key in special_attributes and symbol.get_attribute(key) != False:
-            print_sym[key] = val
+    for key, val in symbol.get_special_attributes().items():
+        if key in special_attributes and val != False:
+            print_sym[key] = copy_json(val)
     return print_sym
 
 
+@detailed_phase("events")
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
+    if not gamestate.book.record_events:
+        return
     board_client = []
     special_attributes = list(gamestate.config.special_symbols.keys())
     for reel, _ in enumerate(gamestate.board):
@@ -35,13 +38,14 @@ def reveal_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": gamestate.gametype,
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def fs_trigger_event(
     gamestate,
     include_padding_index=True,
@@ -57,6 +61,7 @@ def fs_trigger_event(
     if include_padding_index:
         for pos in scatter_positions:
             pos["row"] += 1
+    scatter_positions = [dict(pos) for pos in scatter_positions]
 
     if basegame_trigger:
         event = {
@@ -74,9 +79,10 @@ def fs_trigger_event(
         }
 
     assert gamestate.tot_fs > 0, "total freegame (gamestate.tot_fs) must be >0"
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def set_win_event(gamestate, winlevel_key: str = "standard"):
     """Used for updating cumulative win ticker (for a single outcome)."""
     if not gamestate.wincap_triggered:
@@ -91,9 +97,10 @@ def set_win_event(gamestate, winlevel_key: str = "standard"):
             ),
             "winLevel": gamestate.config.get_win_level(gamestate.win_manager.spin_win, winlevel_key),
         }
-        gamestate.book.add_event(event)
+        gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def set_total_event(gamestate):
     """Updates win amount for a betting round (including cumulative wins across multiple freespin wins)."""
     event = {
@@ -106,9 +113,10 @@ def set_total_event(gamestate):
             )
         ),
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def set_tumble_event(gamestate):
     """Update banner indicating wins from successive tumbles."""
     event = {
@@ -116,9 +124,10 @@ def set_tumble_event(gamestate):
         "type": EventConstants.SET_TUMBLE_WIN.value,
         "amount": int(round(min(gamestate.tumble_win, gamestate.config.wincap) * 100)),
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def wincap_event(gamestate):
     """Emit to indicate end of spin actions."""
     event = {
@@ -131,48 +140,52 @@ def wincap_event(gamestate):
             )
         ),
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def win_info_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
     """
-    win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
-    for idx, w in enumerate(win_data_copy["wins"]):
-        if include_padding_index:
-            new_positions = []
-            for p in w["positions"]:
-                new_positions.append({"reel": p["reel"], "row": p["row"] + 1})
-        else:
-            new_positions = w["positions"]
-
-        win_data_copy["wins"][idx]["win"] = int(
-            round(min(win_data_copy["wins"][idx]["win"], gamestate.config.wincap) * 100, 0)
-        )
-        win_data_copy["wins"][idx]["positions"] = new_positions
-        if "meta" in win_data_copy["wins"][idx]:
-            win_data_copy["wins"][idx]["meta"]["winWithoutMult"] = int(
+    if not gamestate.book.record_events:
+        return
+    wins = []
+    for w in gamestate.win_data["wins"]:
+        win = {}
+        for key, val in w.items():
+            if key == "positions":
+                if include_padding_index:
+                    win[key] = [{"reel": p["reel"], "row": p["row"] + 1} for p in val]
+                else:
+                    win[key] = [dict(p) for p in val]
+            else:
+                win[key] = copy_json(val)
+
+        win["win"] = int(round(min(win["win"], gamestate.config.wincap) * 100, 0))
+        if "meta" in win:
+            win["meta"]["winWithoutMult"] = int(
                 int(
                     min(
-                        win_data_copy["wins"][idx]["meta"]["winWithoutMult"] * 100,
+                        win["meta"]["winWithoutMult"] * 100,
                         gamestate.config.wincap * 100,
                     ),
                 )
             )
-            if "overlay" in win_data_copy["wins"][idx]["meta"] and include_padding_index:
-                win_data_copy["wins"][idx]["meta"]["overlay"]["row"] += 1
+            if "overlay" in win["meta"] and include_padding_index:
+                win["meta"]["overlay"]["row"] += 1
+        wins.append(win)
 
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.WIN_DATA.value,
         "totalWin": int(round(min(gamestate.win_data["totalWin"], gamestate.config.wincap) * 100, 0)),
-        "wins": win_data_copy["wins"],
+        "wins": wins,
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def update_tumble_win_event(gamestate):
     """Update a banner to record successive tumble wins."""
     event = {
@@ -180,9 +193,10 @@ def update_tumble_win_event(gamestate):
         "type": EventConstants.UPDATE_TUMBLE_WIN.value,
         "amount": int(round(min(gamestate.win_manager.spin_win, gamestate.config.wincap) * 100, 0)),
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def update_freespin_event(gamestate):
     """Update the current spin number and total freegame"""
     event = {
@@ -191,9 +205,10 @@ def update_freespin_event(gamestate):
         "amount": int(gamestate.fs),
         "total": int(gamestate.tot_fs),
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def freespin_end_event(gamestate, winlevel_key="endFeature"):
     """End of feature trigger."""
     event = {
@@ -202,9 +217,10 @@ def freespin_end_event(gamestate, winlevel_key="endFeature"):
         "amount": int(min(gamestate.win_manager.freegame_wins, gamestate.config.wincap) * 100),
         "winLevel": gamestate.config.get_win_level(gamestate.win_manager.freegame_wins, winlevel_key),
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def final_win_event(gamestate):
     """Assigns final payout multiplier for a simulation."""
     event = {
@@ -212,9 +228,10 @@ def final_win_event(gamestate):
         "type": EventConstants.FINAL_WIN.value,
         "amount": int(round(min(gamestate.final_win, gamestate.config.wincap) * 100, 0)),
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def update_global_mult_event(gamestate):
     """Increment global multiplier value."""
     event = {
@@ -223,11 +240,14 @@ def update_global_mult_event(gamestate):
         "globalMult": int(gamestate.global_multiplier),
     }
 
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def tumble_board_event(gamestate):
     """States the symbol positions removed from a board during tumble, and which new symbols should take their place."""
+    if not gamestate.book.record_events:
+        return
     special_attributes = list(gamestate.config.special_symbols.keys())
 
     exploding = []
@@ -251,9 +271,10 @@ def tumble_board_event(gamestate):
         "newSymbols": new_symbols,
         "explodingSymbols": exploding,
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
 
 
+@detailed_phase("events")
 def enter_bonus_event(gamestate) -> None:
     "Indicate feature game entry explicitly."
     event = {
@@ -261,4 +282,4 @@ def enter_bonus_event(gamestate) -> None:
         "type": EventConstants.ENTER_BONUS.value,
         "reason": gamestate.bonus_type,
     }
-    gamestate.book.add_event(event)
+    gamestate.book.add_event(event, detached=True)
@@ -22,6 +22,7 @@ class Executables(Conditions, Tumble):
 
     def tumble_game_board(self):
         "Remove winning symbols from active board and replace."
+        self.check_abort_conditions()
         self.tumble_board()
         tumble_board_event(self)
 
@@ -85,6 +86,7 @@ class Executables(Conditions, Tumble):
 
     def update_freespin(self) -> None:
         """Called before a new reveal during freegame."""
+        self.check_abort_conditions()
         update_freespin_event(self)
         self.fs += 1
         self.win_manager.reset_spin_win()
@@ -2,30 +2,71 @@
 
 from copy import deepcopy
 
+IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def copy_json(value):
+    "Copy JSON-like data (dicts, lists and scalars), falling back to deepcopy for any other type."
+    value_type = type(value)
+    if value_type in IMMUTABLE_TYPES:
+        return value
+    if value_type is dict:
+        return {key: copy_json(val) for key, val in value.items()}
+    if value_type is list:
+        return [copy_json(val) for val in value]
+    return deepcopy(value)
+
 
 class Book:
     "Stores simulation information."
 
-    def __init__(self, book_id: int, criteria: str):
+    # When enabled, detached events are snapshotted and verified unchanged when the book is output.
+    check_detached_events = False
+
+    def __init__(self, book_id: int, criteria: str, record_events: bool = True):
         "Initialize simulation book"
         self.id = book_id
+        self.record_events = record_events
         self.payout_multiplier = 0.0
         self.events = []
         self.criteria = criteria
         self.basegame_wins = 0.0
         self.freegame_wins = 0.0
+        self.detached_snapshots = {}
 
-    def add_event(self, event: dict):
-        "Append event to book."
-        self.events.append(deepcopy(event))
+    def add_event(self, event: dict, detached: bool = False):
+        """
+        Append event to book. Events are copied so later changes to gamestate objects do not alter the book.
+        detached=True skips the copy, the emitter guarantees the event only holds newly created objects which
+        are not modified after being added. Events are discarded if the book is not recording events.
+        """
+        if not self.record_events:
+            return
+        if not detached:
+            event = copy_json(event)
+        elif self.check_detached_events:
+            self.detached_snapshots[len(self.events)] = copy_json(event)
+        self.events.append(event)
 
     def append_book_items(self, event_id: int, appended_info: dict):
         "Modify an existing book event at position 'event_id'"
         for k, v in appended_info.items():
             self.events[event_id][k] = v
+            if event_id in self.detached_snapshots:
+                self.detached_snapshots[event_id][k] = copy_json(v)
+
+    def verify_detached_events(self):
+        "Raise if any detached event was modified after being added to the book."
+        for event_id, snapshot in self.detached_snapshots.items():
+            if self.events[event_id] != snapshot:
+                raise RuntimeError(
+                    f"Event {event_id} ('{snapshot.get('type')}') was modified after being added to book {self.id}."
+                )
 
     def to_json(self):
         "Return JSON-ready object."
+        if self.check_detached_events:
+            self.verify_detached_events()
         json_book = {
             "id": self.id,
             "payoutMultiplier": int(round(self.payout_multiplier * 100, 0)),
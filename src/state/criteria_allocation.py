@@ -0,0 +1,106 @@
+"""Compact criteria allocation of a bet mode's simulations, shared with workers through a memory-mapped file."""
+
+import mmap
+import random
+from array import array
+
+
+def get_index_typecode(num_criteria: int) -> str:
+    """Smallest unsigned array typecode holding every criteria index."""
+    return "B" if num_criteria <= 1 << 8 else "H"
+
+
+class CriteriaAllocation:
+    """
+    Criteria of every simulation, stored as an array of indices into 'criteria' (one byte per simulation for up to
+    256 criteria) instead of a {sim: criteria} dict. allocation[sim] returns the criteria of a simulation.
+    Once shared (see share()), chunks handed to workers only reference the mapped file instead of carrying criteria.
+    """
+
+    def __init__(self, criteria: list, indices: array):
+        self.criteria = criteria
+        self.indices = indices
+        self.filename = None
+
+    @classmethod
+    def from_counts(cls, num_sims_criteria: dict, sims: int) -> "CriteriaAllocation":
+        """
+        Shuffled allocation of num_sims_criteria {criteria: count}, truncated to 'sims'.
+        Shuffles the indices with the module-level generator, which gives the same permutation as shuffling the
+        list of criteria strings, so allocations (and books) are unchanged from the previous dict allocation.
+        """
+        criteria = list(num_sims_criteria)
+        indices = array(get_index_typecode(len(criteria)))
+        for index, count in enumerate(num_sims_criteria.values()):
+            indices.extend(array(indices.typecode, [index]) * count)
+        random.shuffle(indices)
+        del indices[sims:]
+        return cls(criteria, indices)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, sim: int) -> str:
+        return self.criteria[self.indices[sim]]
+
+    def items(self):
+        """Iterate (sim, criteria) pairs, as with the dict allocation."""
+        criteria = self.criteria
+        for sim, index in enumerate(self.indices):
+            yield sim, criteria[index]
+
+    def count_criteria(self) -> dict:
+        """Number of simulations allocated to each criteria."""
+        return {criteria: self.indices.count(index) for index, criteria in enumerate(self.criteria)}
+
+    def share(self, filename: str) -> None:
+        """Write the indices to 'filename', chunks returned by get_chunk() then read them from the mapped file."""
+        with open(filename, "wb") as f:
+            self.indices.tofile(f)
+        self.filename = filename
+
+    def get_chunk(self, start: int, stop: int):
+        """Criteria of simulations [start, stop), as a list or a reference into the shared file."""
+        if self.filename is None:
+            criteria = self.criteria
+            return [criteria[index] for index in self.indices[start:stop]]
+        return SharedCriteriaChunk(self.filename, self.criteria, self.indices.typecode, start, stop)
+
+
+class SharedCriteriaChunk:
+    """
+    Sequence of the criteria of simulations [start, stop) of a shared allocation.
+    Pickles to the filename and bounds only, the indices of the chunk are read from a read-only mapping of the file
+    when first accessed (so workers read the shared page cache instead of receiving the indices through the pool).
+    """
+
+    def __init__(self, filename: str, criteria: list, typecode: str, start: int, stop: int):
+        self.filename = filename
+        self.criteria = criteria
+        self.typecode = typecode
+        self.start = start
+        self.stop = stop
+        self.indices = None
+
+    def __reduce__(self):
+        return self.__class__, (self.filename, self.criteria, self.typecode, self.start, self.stop)
+
+    def get_indices(self) -> array:
+        """Indices of this chunk, copied out of the mapped file (which is closed again) on first access."""
+        if self.indices is None:
+            with open(self.filename, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    itemsize = array(self.typecode).itemsize
+                    self.indices = array(self.typecode, mapped[self.start * itemsize : self.stop * itemsize])
+        return self.indices
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, offset: int) -> str:
+        return self.criteria[self.get_indices()[offset]]
+
+    def __iter__(self):
+        criteria = self.criteria
+        for index in self.get_indices():
+            yield criteria[index]
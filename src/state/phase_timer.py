@@ -0,0 +1,87 @@
+"""
+Counter-based timers for the phases of the spin lifecycle.
+Coarse phases (simulations, imprint_wins, book/lookup writes and merges) are always timed. Per-call timers of
+board draws, win evaluation, tumbles and event emitters are only installed when the environment variable
+PHASE_TIMERS is set to "detailed" when src is imported (and inherited by worker processes).
+"""
+
+import os
+from functools import wraps
+from time import perf_counter
+
+PHASE_TIMER_MODES = ["coarse", "detailed"]
+PHASE_TIMERS = os.environ.get("PHASE_TIMERS", "coarse")
+if PHASE_TIMERS not in PHASE_TIMER_MODES:
+    raise RuntimeError(f"PHASE_TIMERS must be one of {PHASE_TIMER_MODES}, got '{PHASE_TIMERS}'.")
+
+_phase_totals = {}
+_nested_seconds = [0.0]
+
+
+def timed_phase(phase: str) -> callable:
+    """
+    Decorator accumulating the call count and exclusive time of a function under 'phase'.
+    Time spent in nested timed phases is attributed to the inner phase only, so phase times add up
+    to the total timed time without double counting. Counters are process-local, see take_phase_times().
+    """
+    totals = _phase_totals.setdefault(phase, [0, 0.0])
+
+    def decorator(function: callable) -> callable:
+        @wraps(function)
+        def timed(*args, **kwargs):
+            _nested_seconds.append(0.0)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                nested = _nested_seconds.pop()
+                _nested_seconds[-1] += elapsed
+                totals[0] += 1
+                totals[1] += elapsed - nested
+
+        return timed
+
+    return decorator
+
+
+def detailed_phase(phase: str) -> callable:
+    """
+    timed_phase() for functions called many times per simulation (board draws, win evaluation, events).
+    Unless PHASE_TIMERS is "detailed" the function is returned undecorated, so these calls carry no timer overhead.
+    """
+    if PHASE_TIMERS != "detailed":
+        return lambda function: function
+    return timed_phase(phase)
+
+
+def take_phase_times() -> dict:
+    """Return {phase: {"calls", "seconds"}} for all phases called since the last take, and reset the counters."""
+    phase_times = {}
+    for phase, totals in _phase_totals.items():
+        if totals[0] > 0:
+            phase_times[phase] = {"calls": totals[0], "seconds": totals[1]}
+        totals[0], totals[1] = 0, 0.0
+    return phase_times
+
+
+def merge_phase_times(target: dict, source: dict) -> dict:
+    """Add phase times from 'source' (another worker or task) into 'target'."""
+    for phase, times in source.items():
+        merged = target.setdefault(phase, {"calls": 0, "seconds": 0.0})
+        merged["calls"] += times["calls"]
+        merged["seconds"] += times["seconds"]
+    return target
+
+
+def summarise_phase_times(phase_times: dict) -> dict:
+    """JSON-ready breakdown ordered by time spent, with each phase's share of the total timed time."""
+    total_seconds = sum(times["seconds"] for times in phase_times.values())
+    summary = {}
+    for phase, times in sorted(phase_times.items(), key=lambda item: item[1]["seconds"], reverse=True):
+        summary[phase] = {
+            "calls": times["calls"],
+            "seconds": round(times["seconds"], 4),
+            "share": round(times["seconds"] / total_seconds, 4) if total_seconds > 0 else 0.0,
+        }
+    return summary
@@ -0,0 +1,87 @@
+"""Per-task cProfile capture and merged pstats output for multi-process simulations."""
+
+import os
+import glob
+import json
+import pstats
+import cProfile
+
+PROFILE_SUMMARY_TOP_N = 40
+
+
+def run_profiled(profile_file: str, function: callable, *args, **kwargs):
+    """Call function, writing a cProfile of the call to profile_file (no profiling if profile_file is None)."""
+    if profile_file is None:
+        return function(*args, **kwargs)
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(function, *args, **kwargs)
+    finally:
+        profile.dump_stats(profile_file)
+
+
+def get_task_profile_name(profile_prefix: str, method: str, task_id: int) -> str:
+    """Profile filename of a single scheduled task, None if profiling is disabled."""
+    if profile_prefix is None:
+        return None
+    return f"{profile_prefix}_{method}_{task_id}.prof"
+
+
+def merge_profiles(profile_prefix: str, output_file: str) -> pstats.Stats:
+    """
+    Merge all .prof files written under profile_prefix (every worker task and the parent process)
+    into a single pstats file. Returns the merged stats, or None if nothing was profiled.
+    """
+    profile_files = sorted(glob.glob(f"{profile_prefix}_*.prof"))
+    if len(profile_files) == 0:
+        return None
+    stats = pstats.Stats(profile_files[0])
+    for profile_file in profile_files[1:]:
+        stats.add(profile_file)
+    stats.dump_stats(output_file)
+    for profile_file in profile_files:
+        os.remove(profile_file)
+    return stats
+
+
+def format_function(function_key: tuple) -> str:
+    """pstats function key (filename, line, name) as 'filename:line(name)'."""
+    filename, line, name = function_key
+    if filename == "~":
+        return name
+    return f"{filename}:{line}({name})"
+
+
+def summarise_profile(stats: pstats.Stats, top_n: int = PROFILE_SUMMARY_TOP_N) -> dict:
+    """Top-n functions by cumulative and by internal time, summed over all profiled processes."""
+
+    def top_functions(sort_index: int) -> list:
+        ranked = sorted(stats.stats.items(), key=lambda item: item[1][sort_index], reverse=True)[:top_n]
+        return [
+            {
+                "function": format_function(function_key),
+                "calls": total_calls,
+                "primitive_calls": primitive_calls,
+                "internal_seconds": round(internal_time, 6),
+                "cumulative_seconds": round(cumulative_time, 6),
+            }
+            for function_key, (primitive_calls, total_calls, internal_time, cumulative_time, _) in ranked
+        ]
+
+    return {
+        "profiles_merged": len(stats.files),
+        "total_seconds": round(stats.total_tt, 6),
+        "by_cumulative_time": top_functions(3),
+        "by_internal_time": top_functions(2),
+    }
+
+
+def write_profile_outputs(gamestate: object, betmode: str) -> None:
+    """Write the merged .prof file and a json hot-function summary of a betmode to the library folder."""
+    output_files = gamestate.output_files
+    stats = merge_profiles(output_files.get_temp_profile_prefix(betmode), output_files.get_profile_name(betmode))
+    if stats is None:
+        return
+    with open(output_files.get_profile_summary_name(betmode), "w", encoding="UTF-8") as f:
+        f.write(json.dumps(summarise_profile(stats), indent=4))
+    print("Profile written to", output_files.get_profile_name(betmode))
@@ -0,0 +1,140 @@
+"""Random number generators used for all gamestate draws, keyed by simulation (and repeat attempt)."""
+
+import random
+
+ATTEMPT_SEED_STRIDE = 1 << 32
+_MASK_64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_TO_UNIT_FLOAT = 2.0**-53
+
+
+class LegacyRNG:
+    """
+    The process-global Mersenne Twister, reseeded with random.seed(sim + 1) for every simulation.
+    Reproduces the books of earlier releases exactly.
+    Draws made directly through the 'random' module are part of the same stream.
+    """
+
+    name = "legacy"
+    alias_sampling = False
+    randrange = staticmethod(random.randrange)
+    randint = staticmethod(random.randint)
+    choice = staticmethod(random.choice)
+    choices = staticmethod(random.choices)
+    uniform = staticmethod(random.uniform)
+    shuffle = staticmethod(random.shuffle)
+    sample = staticmethod(random.sample)
+    getstate = staticmethod(random.getstate)
+    setstate = staticmethod(random.setstate)
+    random = staticmethod(random.random)
+
+    def seed_sim(self, sim: int) -> None:
+        """Start the stream of a simulation."""
+        random.seed(sim + 1)
+
+    def seed_attempt(self, sim: int, attempt: int) -> None:
+        """Start the stream of a single repeat attempt of a simulation."""
+        random.seed((sim + 1) * ATTEMPT_SEED_STRIDE + attempt)
+
+
+def mix64(value: int) -> int:
+    """SplitMix64 finaliser, a bijective 64-bit mix."""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+class CounterRNG(random.Random):
+    """
+    Counter-based generator: the n-th draw of a stream is mix64(key + n * gamma), i.e SplitMix64 started from a
+    mixed key. Seeding and state snapshots are O(1) and every gamestate owns its stream, unlike LegacyRNG where
+    each reseed rebuilds the 624-word Mersenne Twister state of the process. Books differ from legacy books.
+    All random.Random methods (randrange, choices, uniform, ...) draw from random() and getrandbits().
+    """
+
+    name = "counter"
+    alias_sampling = False
+
+    def __reduce__(self):
+        return self.__class__, (), (self.getstate(), self.alias_sampling)
+
+    def __setstate__(self, state: tuple) -> None:
+        self.setstate(state[0])
+        self.alias_sampling = state[1]
+
+    def seed(self, a=None, version=2) -> None:
+        """Start the stream keyed by integer 'a'."""
+        self._key = mix64((a or 0) & _MASK_64)
+        self._counter = 0
+        self.gauss_next = None
+
+    def seed_sim(self, sim: int) -> None:
+        """Start the stream of a simulation."""
+        self.seed(sim + 1)
+
+    def seed_attempt(self, sim: int, attempt: int) -> None:
+        """Start the stream of a single repeat attempt of a simulation."""
+        self.seed((sim + 1) * ATTEMPT_SEED_STRIDE + attempt)
+
+    def getstate(self) -> tuple:
+        return self._key, self._counter
+
+    def setstate(self, state: tuple) -> None:
+        self._key, self._counter = state
+        self.gauss_next = None
+
+    def next64(self) -> int:
+        """Next 64 random bits of the stream (mix64 inlined, this is called for every draw)."""
+        self._counter += 1
+        value = (self._key + self._counter * _GOLDEN_GAMMA) & _MASK_64
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+        return value ^ (value >> 31)
+
+    def random(self) -> float:
+        return (self.next64() >> 11) * _TO_UNIT_FLOAT
+
+    def _randbelow(self, n: int) -> int:
+        """Uniform integer in [0, n) by rejection sampling the top bits of a 64-bit draw (n < 2**64)."""
+        if n > _MASK_64:
+            return self._randbelow_with_getrandbits(n)
+        shift = 64 - n.bit_length()
+        value = self.next64() >> shift
+        while value >= n:
+            value = self.next64() >> shift
+        return value
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        if k <= 64:
+            return self.next64() >> (64 - k)
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self.next64() << shift
+        return bits & ((1 << k) - 1)
+
+
+RNG_MODES = {
+    LegacyRNG.name: LegacyRNG,
+    CounterRNG.name: CounterRNG,
+}
+
+
+WEIGHTED_SAMPLING_MODES = ("compatible", "alias")
+
+
+def get_rng(mode: str, weighted_sampling: str = "compatible") -> object:
+    """
+    Create the generator for config.rng_mode. The generator also carries config.weighted_sampling, read by
+    get_random_outcome(): "compatible" keeps the draw sequence of the cumulative walk, "alias" uses alias tables.
+    """
+    if mode not in RNG_MODES:
+        raise RuntimeError(f"Unknown rng_mode '{mode}', expected one of {list(RNG_MODES)}")
+    if weighted_sampling not in WEIGHTED_SAMPLING_MODES:
+        raise RuntimeError(
+            f"Unknown weighted_sampling '{weighted_sampling}', expected one of {list(WEIGHTED_SAMPLING_MODES)}"
+        )
+    rng = RNG_MODES[mode]()
+    rng.alias_sampling = weighted_sampling == "alias"
+    return rng
@@ -1,13 +1,24 @@
 import time
 import random
-from multiprocessing import Process, Manager
-import cProfile
 from warnings import warn
 import shutil
-import asyncio
+from contextlib import nullcontext
 from typing import Dict
 
-from src.write_data.write_data import output_lookup_and_force_files
+from src.state.criteria_allocation import CriteriaAllocation
+from src.state.phase_timer import merge_phase_times, summarise_phase_times, take_phase_times
+from src.state.profiling import get_task_profile_name, run_profiled, write_profile_outputs
+from src.state.scheduler import ChunkScheduler
+from src.state.seed_bank import SeedSearchScheduler, get_seed_search_sims
+from src.state.telemetry import merge_telemetry, summarise_telemetry
+from src.state.worker_pool import WorkerPool
+from src.write_data.write_data import (
+    output_lookup_and_force_files,
+    write_library_events,
+    write_simulation_telemetry,
+)
+
+CRITERIA_SPLITS = ["legacy", "quota"]
 
 
 def create_books(
@@ -21,56 +32,96 @@ def create_books(
 ):
     """Main run-function for simulating game outcomes and outputting all files."""
     for key, ns in num_sim_args.items():
-        if all([ns > 0, ns > batch_size * batch_size]):
-            assert (
-                ns % (threads * batch_size) == 0
-            ), "mode-sims/(batch * threads) must be divisible with no remainder"
         num_sim_args[key] = int(ns)
 
     if not compress and sum(num_sim_args.values()) > 1e4:
         warn("Generating large number of uncompressed books!")
 
-    if profiling and threads > 1:
-        raise RuntimeError("Multithread profiling not supported, threads must = 1 with profiling enabled")
-
     startTime = time.time()
+    take_phase_times()
     print("\nCreating books...")
-    for betmode_name in num_sim_args:
-        if num_sim_args[betmode_name] > 0:
-            gamestate.betmode = betmode_name
-            run_multi_process_sims(
-                threads,
-                batch_size,
-                config.game_id,
-                betmode_name,
-                gamestate,
-                num_sims=num_sim_args[betmode_name],
-                compress=compress,
-                write_event_list=config.write_event_list,
-                profiling=profiling,
-            )
-            output_lookup_and_force_files(
-                threads,
-                batch_size,
-                config.game_id,
-                betmode_name,
-                gamestate,
-                num_sims=num_sim_args[betmode_name],
-                compress=compress,
-            )  # , write_event_list=config.write_event_list)
+    with WorkerPool(gamestate, threads) if threads > 1 else nullcontext() as pool:
+        for betmode_name in num_sim_args:
+            if num_sim_args[betmode_name] > 0:
+                gamestate.betmode = betmode_name
+                chunk_results = run_multi_process_sims(
+                    threads,
+                    batch_size,
+                    config.game_id,
+                    betmode_name,
+                    gamestate,
+                    num_sims=num_sim_args[betmode_name],
+                    compress=compress,
+                    write_event_list=config.write_event_list,
+                    profiling=profiling,
+                    pool=pool,
+                )
+                profile_prefix = gamestate.output_files.get_temp_profile_prefix(betmode_name) if profiling else None
+                run_profiled(
+                    get_task_profile_name(profile_prefix, "output_files", 0),
+                    output_lookup_and_force_files,
+                    chunk_results,
+                    config.game_id,
+                    betmode_name,
+                    gamestate,
+                    compress=compress,
+                )  # , write_event_list=config.write_event_list)
+                mode_telemetry = gamestate.simulation_telemetry[betmode_name]
+                phase_times = merge_phase_times(mode_telemetry["phases"], take_phase_times())
+                mode_telemetry["phases"] = summarise_phase_times(phase_times)
+                write_simulation_telemetry(gamestate)
+                if profiling:
+                    write_profile_outputs(gamestate, betmode_name)
     shutil.rmtree(gamestate.output_files.temp_path)
     print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
 
 
+def get_quota_splits(quotas: Dict[str, float], num_sims: int) -> Dict[str, int]:
+    """
+    Largest-remainder rounding of num_sims * quota (quotas are normalised), with at least one simulation per
+    criteria. Leftover simulations go to the largest remainders, excess simulations are removed from the criteria
+    allocated furthest above their exact share.
+    """
+    total_quota = sum(quotas.values())
+    exact = {criteria: num_sims * quota / total_quota for criteria, quota in quotas.items()}
+    num_sims_criteria = {criteria: max(int(share), 1) for criteria, share in exact.items()}
+    difference = num_sims - sum(num_sims_criteria.values())
+    if difference > 0:
+        order = sorted(exact, key=lambda c: num_sims_criteria[c] - exact[c])
+        for position in range(difference):
+            num_sims_criteria[order[position % len(order)]] += 1
+    while difference < 0:
+        order = sorted(exact, key=lambda c: exact[c] - num_sims_criteria[c])
+        reducible = [criteria for criteria in order if num_sims_criteria[criteria] > 1]
+        if len(reducible) == 0:
+            raise RuntimeError(f"Cannot allocate {num_sims} simulations to {len(quotas)} criteria.")
+        for criteria in reducible[:-difference]:
+            num_sims_criteria[criteria] -= 1
+        difference = num_sims - sum(num_sims_criteria.values())
+    return num_sims_criteria
+
+
 def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[str, int]:
-    """Ensure assignment of criteria to all simulations numbers."""
+    """
+    Ensure assignment of criteria to all simulations numbers.
+    With config.criteria_splits = "quota" the counts are rounded directly (see get_quota_splits()), "legacy"
+    adjusts the rounded counts one randomly chosen criteria at a time, reproducing allocations of earlier releases.
+    Leaves the module-level generator seeded for the shuffle in assign_sim_criteria().
+    """
     betmode_distributions = gamestate.get_betmode(betmode_name).get_distributions()
+    if gamestate.config.criteria_splits not in CRITERIA_SPLITS:
+        raise RuntimeError(
+            f"Unknown criteria_splits '{gamestate.config.criteria_splits}', expected one of {CRITERIA_SPLITS}"
+        )
+    random.seed(0)
+    if gamestate.config.criteria_splits == "quota":
+        return get_quota_splits({d._criteria: d._quota for d in betmode_distributions}, num_sims)
+
     num_sims_criteria = {d._criteria: max(int(num_sims * d._quota), 1) for d in betmode_distributions}
     total_sims = sum(num_sims_criteria.values())
     reduce_sims = total_sims > num_sims
     listedCriteria = [d._criteria for d in betmode_distributions]
     criteria_weights = [d._quota for d in betmode_distributions]
-    random.seed(0)
     while sum(num_sims_criteria.values()) != num_sims:
         c = random.choices(listedCriteria, criteria_weights)[0]
         if reduce_sims and num_sims_criteria[c] > 1:
@@ -81,35 +132,46 @@ def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[
     return num_sims_criteria
 
 
-def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> Dict[int, str]:
+def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> CriteriaAllocation:
     """Assign criteria randomly to simulations based on quota defined in config."""
-    simAllocation = [criteria for criteria, count in num_sims_criteria.items() for _ in range(count)]
-    random.shuffle(simAllocation)
-    return {i: simAllocation[i] for i in range(min(sims, len(simAllocation)))}
-
-
-async def profile_and_visualize(
-    game_id,
-    gamestate,
-    all_betmode_configs,
-    betmode,
-    sim_allocation,
-    threads,
-    num_repeats,
-    sims_per_thread,
-    repeat,
-    compress,
-    write_event_list,
+    return CriteriaAllocation.from_counts(num_sims_criteria, sims)
+
+
+def run_scheduled_in_process(gamestate: object, scheduler: ChunkScheduler, profile_prefix: str = None) -> list:
+    """Run all scheduled tasks sequentially on the parent gamestate, profiling each task if profile_prefix is given."""
+    task = scheduler.next_task()
+    while task is not None:
+        task_index, task_args = task
+        profile_file = get_task_profile_name(profile_prefix, scheduler.method, task_index)
+        scheduler.complete(task_index, run_profiled(profile_file, getattr(gamestate, scheduler.method), **task_args))
+        task = scheduler.next_task()
+    return scheduler.get_results()
+
+
+def build_seed_bank(
+    gamestate: object,
+    betmode: str,
+    sim_allocation: CriteriaAllocation,
+    threads: int,
+    pool: WorkerPool,
+    profile_prefix: str = None,
 ):
-    """Create flame-graph, automatically opens output on localhost."""
-    output_string = f"games/{game_id}/simulationProfile_{betmode}.prof"
-    cProfile.runctx(
-        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list)",
-        globals(),
-        locals(),
-        output_string,
-    )
-    await asyncio.create_subprocess_exec("snakeviz", output_string)
+    """
+    Search the first accepting attempt of every seed-search simulation, spread over all workers.
+    Attempts of these criteria are seeded from (sim, attempt), so the bank is deterministic and
+    replaying a banked attempt reproduces the book a sequential run would have accepted.
+    Returns the seed bank {sim: attempt}, the search telemetry and the search phase times.
+    """
+    sim_criteria = get_seed_search_sims(gamestate, betmode, sim_allocation)
+    if len(sim_criteria) == 0:
+        return {}, {}, {}
+    print("Searching accepting attempts for", len(sim_criteria), "simulations in", betmode)
+    scheduler = SeedSearchScheduler(betmode, sim_criteria, threads)
+    if pool is None:
+        seed_bank = run_scheduled_in_process(gamestate, scheduler, profile_prefix)
+    else:
+        seed_bank = pool.run_scheduled(scheduler, profile_prefix)
+    return seed_bank, scheduler.get_telemetry(), scheduler.get_phase_times()
 
 
 def run_multi_process_sims(
@@ -122,70 +184,56 @@ def run_multi_process_sims(
     compress: bool = True,
     write_event_list: bool = False,
     profiling: bool = False,
-):
-    """Setup multiprocessing manager for running all game-mode simulations."""
+    pool: WorkerPool = None,
+) -> list:
+    """
+    Hand out chunks of sim-indices to the persistent worker pool for all game-mode simulations.
+    Chunks hold at most 'batching_size' simulations and are sized from observed per-criteria cost.
+    Accepting attempts of seed-search criteria are found first, in parallel (see build_seed_bank()).
+    With profiling enabled every task is profiled by the worker running it, see write_profile_outputs().
+    Returns the result of each chunk written to the temp directory, in simulation order.
+    """
     print("\nCreating books for", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    sims_per_thread = int(num_sims / threads / num_repeats)
     num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode)
     sim_allocation = assign_sim_criteria(num_sims_criteria, num_sims)
-    for repeat in range(num_repeats):
-        print("Batch", repeat + 1, "of", num_repeats)
-        processes = []
-        manager = Manager()
-        all_betmode_configs = manager.list()
-        if profiling:
-            asyncio.run(
-                profile_and_visualize(
-                    game_id=game_id,
-                    gamestate=gamestate,
-                    all_betmode_configs=all_betmode_configs,
-                    betmode=betmode,
-                    sim_allocation=sim_allocation,
-                    threads=threads,
-                    num_repeats=num_repeats,
-                    sims_per_thread=sims_per_thread,
-                    repeat=repeat,
-                    compress=compress,
-                    write_event_list=write_event_list,
-                )
-            )
-        elif threads == 1:
-            gamestate.run_sims(
-                betmode_copy_list=all_betmode_configs,
-                betmode=betmode,
-                sim_to_criteria=sim_allocation,
-                total_threads=threads,
-                total_repeats=num_repeats,
-                num_sims=sims_per_thread,
-                thread_index=0,
-                repeat_count=repeat,
-                compress=compress,
-                write_event_list=write_event_list,
-            )
-        else:
-            for thread in range(threads):
-                process = Process(
-                    target=gamestate.run_sims,
-                    args=(
-                        all_betmode_configs,
-                        betmode,
-                        sim_allocation,
-                        threads,
-                        num_repeats,
-                        sims_per_thread,
-                        thread,
-                        repeat,
-                        compress,
-                        write_event_list,
-                    ),
-                )
-                print("Started thread", thread)
-                process.start()
-                processes += [process]
-            print("All threads are online.")
-            for process in processes:
-                process.join()
-            print("Finished joining threads.")
-            gamestate.combine(all_betmode_configs, betmode)
-            gamestate.get_betmode(betmode).lock_force_keys()
+    if pool is not None:
+        sim_allocation.share(gamestate.output_files.get_temp_allocation_name(betmode))
+    profile_prefix = gamestate.output_files.get_temp_profile_prefix(betmode) if profiling else None
+    seed_bank, search_telemetry, phase_times = build_seed_bank(
+        gamestate, betmode, sim_allocation, threads, pool, profile_prefix
+    )
+    scheduler = ChunkScheduler(
+        sim_allocation,
+        num_sims,
+        threads,
+        batching_size,
+        {"betmode": betmode, "compress": compress, "write_event_list": write_event_list},
+        seed_bank,
+    )
+
+    if pool is None:
+        worker_results = run_scheduled_in_process(gamestate, scheduler, profile_prefix)
+    else:
+        worker_results = pool.run_scheduled(scheduler, profile_prefix)
+        print("Finished", len(worker_results), "chunks on all workers.")
+
+    if pool is not None:
+        gamestate.combine(worker_results, betmode)
+        gamestate.get_betmode(betmode).lock_force_keys()
+
+    telemetry = {}
+    for result in worker_results:
+        merge_telemetry(telemetry, result["telemetry"])
+        merge_phase_times(phase_times, result["phase_times"])
+    gamestate.simulation_telemetry[betmode] = {"criteria": summarise_telemetry(telemetry), "phases": phase_times}
+    if len(search_telemetry) > 0:
+        gamestate.simulation_telemetry[betmode]["seed_search"] = summarise_telemetry(search_telemetry)
+
+    if write_event_list:
+        event_items = {}
+        for result in worker_results:
+            for event_type, details in result["event_items"].items():
+                event_items.setdefault(event_type, details)
+        write_library_events(gamestate, event_items, betmode)
+
+    return worker_results
@@ -0,0 +1,100 @@
+"""Cost-weighted dynamic scheduling of simulation chunks."""
+
+from collections import defaultdict
+
+from src.state.criteria_allocation import CriteriaAllocation
+
+CHUNKS_PER_WORKER = 4
+
+
+class ChunkScheduler:
+    """
+    Split a bet mode's simulations into contiguous chunks which are handed out on demand.
+    Chunk sizes are chosen from the observed per-criteria simulation cost, so criteria which
+    repeat many times (i.e wincap/freegame) are dispatched in small chunks while cheap criteria
+    are grouped together. Chunk indices follow simulation order, so merged outputs are independent
+    of which worker ran a given chunk.
+    """
+
+    method = "run_sims"
+
+    def __init__(
+        self,
+        sim_allocation: CriteriaAllocation,
+        num_sims: int,
+        threads: int,
+        max_chunk_size: int,
+        task_args: dict,
+        seed_bank: dict = None,
+    ):
+        self.sim_allocation = sim_allocation
+        self.num_sims = num_sims
+        self.threads = threads
+        self.max_chunk_size = max(int(max_chunk_size), 1)
+        self.task_args = task_args
+        self.seed_bank = seed_bank
+
+        self.position = 0
+        self.chunks = []
+        self.results = {}
+        self.criteria_sims = defaultdict(int)
+        self.criteria_seconds = defaultdict(float)
+        self.remaining_sims = defaultdict(int, sim_allocation.count_criteria())
+
+    def get_sim_cost(self, criteria: str) -> float:
+        """Average seconds per simulation, unobserved criteria assume the most expensive observed cost."""
+        if self.criteria_sims[criteria] > 0:
+            return self.criteria_seconds[criteria] / self.criteria_sims[criteria]
+        observed = [
+            self.criteria_seconds[c] / self.criteria_sims[c] for c in self.criteria_sims if self.criteria_sims[c] > 0
+        ]
+        return max(observed) if len(observed) > 0 else 1.0
+
+    def get_remaining_cost(self) -> float:
+        """Estimated cost of all simulations which have not been dispatched."""
+        return sum(count * self.get_sim_cost(criteria) for criteria, count in self.remaining_sims.items())
+
+    def next_task(self):
+        """Return (chunk_index, run_sims keyword arguments) for the next chunk, or None once exhausted."""
+        if self.position >= self.num_sims:
+            return None
+
+        criteria_names = self.sim_allocation.criteria
+        sim_costs = [self.get_sim_cost(criteria) for criteria in criteria_names]
+        indices = self.sim_allocation.indices
+        if self.threads > 1:
+            target_cost = self.get_remaining_cost() / (CHUNKS_PER_WORKER * self.threads)
+        else:
+            target_cost = float("inf")
+        first_sim = self.position
+        chunk_cost = 0.0
+        last_sim = min(self.num_sims, first_sim + self.max_chunk_size)
+        while self.position < last_sim:
+            index = indices[self.position]
+            if self.position > first_sim and chunk_cost + sim_costs[index] > target_cost:
+                break
+            chunk_cost += sim_costs[index]
+            self.remaining_sims[criteria_names[index]] -= 1
+            self.position += 1
+        sim_criteria = self.sim_allocation.get_chunk(first_sim, self.position)
+
+        chunk_index = len(self.chunks)
+        self.chunks.append((first_sim, self.position - first_sim))
+        task_args = dict(self.task_args)
+        task_args.update({"sim_criteria": sim_criteria, "first_sim": first_sim, "chunk_index": chunk_index})
+        if self.seed_bank:
+            task_args["seed_bank"] = {
+                sim: self.seed_bank[sim] for sim in range(first_sim, self.position) if sim in self.seed_bank
+            }
+        return chunk_index, task_args
+
+    def complete(self, chunk_index: int, result: dict) -> None:
+        """Store a finished chunk and update observed per-criteria costs."""
+        self.results[chunk_index] = result
+        for criteria, (sims, seconds) in result["criteria_time"].items():
+            self.criteria_sims[criteria] += sims
+            self.criteria_seconds[criteria] += seconds
+
+    def get_results(self) -> list:
+        """Worker results in chunk (simulation) order."""
+        return [self.results[idx] for idx in range(len(self.chunks))]
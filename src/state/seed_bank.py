@@ -0,0 +1,71 @@
+"""Parallel search of accepting attempts for rare criteria (the seed bank)."""
+
+from src.state.criteria_allocation import CriteriaAllocation
+from src.state.phase_timer import merge_phase_times
+from src.state.telemetry import merge_telemetry
+
+SEARCH_TASKS_PER_WORKER = 8
+
+
+class SeedSearchScheduler:
+    """
+    Hands out groups of rare-criteria simulations to search_accepting_attempts().
+    Every simulation is searched independently, so tasks can run in any order on any worker.
+    Exposes the same next_task()/complete()/get_results() interface as ChunkScheduler.
+    """
+
+    method = "search_accepting_attempts"
+
+    def __init__(self, betmode: str, sim_criteria: dict, threads: int):
+        self.betmode = betmode
+        sims = sorted(sim_criteria)
+        group_size = max(len(sims) // max(SEARCH_TASKS_PER_WORKER * threads, 1), 1)
+        self.tasks = [
+            {sim: sim_criteria[sim] for sim in sims[start : start + group_size]}
+            for start in range(0, len(sims), group_size)
+        ]
+        self.position = 0
+        self.results = {}
+
+    def next_task(self):
+        """Return (task_index, search_accepting_attempts keyword arguments), or None once exhausted."""
+        if self.position >= len(self.tasks):
+            return None
+        task_index = self.position
+        self.position += 1
+        return task_index, {"betmode": self.betmode, "sim_criteria": self.tasks[task_index]}
+
+    def complete(self, task_index: int, result: dict) -> None:
+        """Store the accepting attempts found by a task."""
+        self.results[task_index] = result
+
+    def get_results(self) -> dict:
+        """Combined seed bank {sim: accepting attempt}."""
+        seed_bank = {}
+        for result in self.results.values():
+            seed_bank.update(result["seed_bank"])
+        return seed_bank
+
+    def get_telemetry(self) -> dict:
+        """Combined per-criteria attempt telemetry of the search."""
+        telemetry = {}
+        for result in self.results.values():
+            merge_telemetry(telemetry, result["telemetry"])
+        return telemetry
+
+    def get_phase_times(self) -> dict:
+        """Combined phase times of the search."""
+        phase_times = {}
+        for result in self.results.values():
+            merge_phase_times(phase_times, result["phase_times"])
+        return phase_times
+
+
+def get_seed_search_sims(gamestate: object, betmode: str, sim_allocation: CriteriaAllocation) -> dict:
+    """Simulations {sim: criteria} whose distribution requests a seed search."""
+    search_criteria = {
+        d.get_criteria() for d in gamestate.get_betmode(betmode).get_distributions() if d.get_seed_search()
+    }
+    if len(search_criteria) == 0:
+        return {}
+    return {sim: criteria for sim, criteria in sim_allocation.items() if criteria in search_criteria}
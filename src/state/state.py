@@ -1,34 +1,61 @@
-from copy import copy
 from abc import ABC, abstractmethod
 from warnings import warn
-import random
+from time import perf_counter
+from array import array
 
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
 from src.calculations.symbol import SymbolStorage
 from src.config.output_filenames import OutputFiles
 from src.state.books import Book
+from src.state.rng import ATTEMPT_SEED_STRIDE, LegacyRNG, get_rng
+from src.state.phase_timer import take_phase_times, timed_phase
+from src.state.telemetry import new_criteria_telemetry, get_repeat_bucket
+from src.write_data.book_writer import BookWriter
 from src.write_data.write_data import (
     print_recorded_wins,
     make_lookup_tables,
-    write_json,
     make_lookup_pay_split,
-    write_library_events,
 )
 
 
+class AbortAttempt(Exception):
+    """Raised when an abort condition shows the current attempt can no longer satisfy its distribution."""
+
+
 class GeneralGameState(ABC):
     """Master gamestate which other classes inherit from."""
 
+    _betmode = None
+    _criteria = None
+    _betmode_lookup = None
+    _betmode_source = None
+    _current_betmode = None
+    _current_distribution = None
+    _attempt_rng_state = None
+    _replay_rng_state = None
+    _replaying = False
+    _resume_attempt = None
+    _first_attempt = 0
+    _searching = False
+    _telemetry = None
+    _attempt_started = None
+    attempt = 0
+    rng = LegacyRNG()
+
     def __init__(self, config):
         self.config = config
+        self.rng = get_rng(self.config.rng_mode, self.config.weighted_sampling)
         self.output_files = OutputFiles(self.config)
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
         self.library = {}
+        self.book_writer = None
         self.recorded_events = {}
+        self.simulation_telemetry = {}
         self.special_symbol_functions = {}
         self.temp_wins = []
         self.create_symbol_map()
+        self.config.compile_reels(list(self.symbol_storage.symbols))
         self.assign_special_sym_function()
         self.sim = 0
         self.criteria = ""
@@ -62,13 +89,30 @@ class GeneralGameState(ABC):
         warn("No special symbol functions are defined")
 
     def reset_book(self) -> None:
-        """Reset global simulation variables."""
+        """
+        Reset global simulation variables.
+        With config.defer_rejected_events, repeat attempts only store the rng state they start from instead of
+        building events, the book of an accepted repeat attempt is rebuilt by replay_accepted_attempt().
+        """
+        if not self._replaying and self.betmode is not None and self.has_seeded_attempts():
+            self.rng.seed_attempt(self.sim, self.attempt)
+        if self._searching:
+            record_events = False
+        else:
+            record_events = (
+                self._replaying or self.attempt == self._first_attempt or not self.config.defer_rejected_events
+            )
+        if self._telemetry is not None and not self._replaying:
+            self.start_attempt_telemetry()
+        self._replaying = False
+        self.attempt += 1
+        self._attempt_rng_state = None if record_events or self._searching else self.rng.getstate()
         self.temp_wins = []
         self.board = [[[] for _ in range(self.config.num_rows[x])] for x in range(self.config.num_reels)]
         self.top_symbols = None
         self.bottom_symbols = None
         self.book_id = self.sim + 1
-        self.book = Book(self.book_id, self.criteria)
+        self.book = Book(self.book_id, self.criteria, record_events)
         self.win_data = {
             "totalWin": 0,
             "wins": [],
@@ -85,10 +129,23 @@ class GeneralGameState(ABC):
         self.anticipation = [0] * self.config.num_reels
 
     def reset_seed(self, sim: int = 0) -> None:
-        """Reset rng seed to simulation number for reproducibility."""
-        random.seed(sim + 1)
+        """
+        Reset rng seed to simulation number for reproducibility.
+        When replaying an accepted attempt, the rng state that attempt started from is restored instead.
+        When resuming after an aborted attempt, attempt and repeat counts continue from the aborted attempt.
+        """
+        if self._replay_rng_state is not None:
+            self.rng.setstate(self._replay_rng_state)
+            self._replay_rng_state = None
+            self._replaying = True
+        else:
+            self.rng.seed_sim(sim)
         self.sim = sim
         self.repeat_count = 0
+        self.attempt = 0
+        if self._resume_attempt is not None:
+            self.attempt, self.repeat_count = self._resume_attempt
+            self._resume_attempt = None
 
     def reset_fs_spin(self) -> None:
         """Use if using repeat during freespin games."""
@@ -97,33 +154,102 @@ class GeneralGameState(ABC):
         self.gametype = self.config.freegame_type
         self.win_manager.reset_spin_win()
 
+    @property
+    def betmode(self) -> str:
+        """Name of the active betmode."""
+        return self._betmode
+
+    @betmode.setter
+    def betmode(self, betmode_name: str) -> None:
+        self._betmode = betmode_name
+        self._betmode_lookup = None
+        self._current_betmode = None
+        self._current_distribution = None
+
+    @property
+    def criteria(self) -> str:
+        """Criteria assigned to the current simulation."""
+        return self._criteria
+
+    @criteria.setter
+    def criteria(self, criteria: str) -> None:
+        self._criteria = criteria
+        self._current_distribution = None
+
+    def get_betmode_lookup(self) -> dict:
+        """Bet modes of the config by name, built once per change of betmode or replacement of config.bet_modes."""
+        if self._betmode_lookup is None or self._betmode_source is not self.config.bet_modes:
+            self._betmode_source = self.config.bet_modes
+            self._betmode_lookup = {betmode.get_name(): betmode for betmode in self._betmode_source}
+        return self._betmode_lookup
+
     def get_betmode(self, mode_name) -> object:
         """Return all current betmode information."""
-        for betmode in self.config.bet_modes:
-            if betmode.get_name() == mode_name:
-                return betmode
-        print("\nWarning: betmode couldn't be retrieved\n")
+        betmode = self.get_betmode_lookup().get(mode_name)
+        if betmode is None:
+            print("\nWarning: betmode couldn't be retrieved\n")
+        return betmode
 
     def get_current_betmode(self) -> object:
-        """Get current betmode information."""
-        for betmode in self.config.bet_modes:
-            if betmode.get_name() == self.betmode:
-                return betmode
+        """Get current betmode information, resolved once per change of betmode."""
+        if self._current_betmode is None:
+            self._current_betmode = self.get_betmode_lookup().get(self.betmode)
+        return self._current_betmode
 
     def get_current_betmode_distributions(self) -> object:
-        """Return current betmode criteria information."""
-        dist = self.get_current_betmode().get_distributions()
-        for c in dist:
-            if c._criteria == self.criteria:
-                return c
-        raise RuntimeError("Could not locate criteria distribution.")
+        """Return current betmode criteria information, resolved once per change of betmode/criteria."""
+        if self._current_distribution is None:
+            for c in self.get_current_betmode().get_distributions():
+                if c._criteria == self.criteria:
+                    self._current_distribution = c
+                    break
+            else:
+                raise RuntimeError("Could not locate criteria distribution.")
+        return self._current_distribution
 
     def get_current_distribution_conditions(self) -> dict:
         """Return requirements for criteria setup/acceptance."""
-        for d in self.get_betmode(self.betmode).get_distributions():
-            if d._criteria == self.criteria:
-                return d._conditions
-        return RuntimeError("Could not locate betmode conditions")
+        if self._current_distribution is None:
+            try:
+                self.get_current_betmode_distributions()
+            except RuntimeError:
+                raise RuntimeError("Could not locate betmode conditions")
+        return self._current_distribution._conditions
+
+    def has_seeded_attempts(self) -> bool:
+        """
+        Boolean if the current distribution defines abort conditions or is pre-searched for accepting attempts.
+        Attempts of such distributions are seeded individually (from the simulation number and attempt number),
+        so any attempt can be run without running the attempts before it.
+        """
+        distribution = self.get_current_betmode_distributions()
+        return distribution.has_abort_conditions() or distribution.get_seed_search()
+
+    def get_criteria_telemetry(self) -> dict:
+        """Telemetry of the current criteria within the active run_sims() call."""
+        stats = self._telemetry.get(self.criteria)
+        if stats is None:
+            stats = new_criteria_telemetry()
+            self._telemetry[self.criteria] = stats
+        return stats
+
+    def start_attempt_telemetry(self) -> None:
+        """Count a new attempt, the previous attempt of the same simulation (if any) was rejected or aborted."""
+        now = perf_counter()
+        stats = self.get_criteria_telemetry()
+        if self._attempt_started is not None:
+            stats["rejected_seconds"] += now - self._attempt_started
+        stats["attempts"] += 1
+        self._attempt_started = now
+
+    def accept_attempt_telemetry(self) -> None:
+        """Count the accepted attempt and the number of repeats it needed."""
+        stats = self.get_criteria_telemetry()
+        stats["accepted"] += 1
+        stats["accepted_seconds"] += perf_counter() - self._attempt_started
+        bucket = get_repeat_bucket(self.attempt - 1)
+        stats["repeat_histogram"][bucket] = stats["repeat_histogram"].get(bucket, 0) + 1
+        self._attempt_started = None
 
     def check_current_repeat_count(self, warn_after_count: int = 1000):
         """Alert user to high repeat count."""
@@ -151,35 +277,65 @@ class GeneralGameState(ABC):
             if keyValue[0] not in current_mode_force_keys:
                 self.get_current_betmode().add_force_key(keyValue[0])  # type:ignore
 
-    def combine(self, modes, betmode_name) -> None:
-        """Retrieve unique force record keys."""
-        for modeConfig in modes:
-            for betmode in modeConfig:
-                if betmode.get_name() == betmode_name:
-                    break
-            force_keys = betmode.get_force_keys()  # type:ignore
-            for key in force_keys:
-                if key not in self.get_betmode(betmode_name).get_force_keys():  # type:ignore
-                    self.get_betmode(betmode_name).add_force_key(key)  # type:ignore
+    def combine(self, worker_results, betmode_name) -> None:
+        """Retrieve unique force record keys returned from each simulation worker."""
+        betmode = self.get_betmode(betmode_name)
+        for result in worker_results:
+            for key in result["force_keys"]:
+                if key not in betmode.get_force_keys():  # type:ignore
+                    betmode.add_force_key(key)  # type:ignore
+
+    @timed_phase("replay_accepted")
+    def replay_accepted_attempt(self) -> None:
+        """
+        Re-run an accepted attempt whose events were not recorded, starting from the rng state stored by reset_book().
+        The replay is the first attempt of the re-run spin, so its events are recorded and imprinted as normal.
+        The replay must end with the payout and final board of the accepted attempt.
+        """
+        outcome, attempt, repeat_count = self.get_attempt_outcome(), self.attempt, self.repeat_count
+        self._replay_rng_state = self._attempt_rng_state
+        self.run_spin(self.sim)
+        if self.get_attempt_outcome() != outcome:
+            raise RuntimeError(
+                f"Replay of simulation {self.sim} ended with {self.get_attempt_outcome()}, expected {outcome}. "
+                "Game properties persisting between repeat attempts must be reset in reset_book()."
+            )
+        self.attempt, self.repeat_count = attempt, repeat_count
+
+    def get_attempt_outcome(self) -> tuple:
+        """Payout (total, basegame and freegame wins) and final board symbol names of the current attempt."""
+        board = [[getattr(symbol, "name", None) for symbol in reel] for reel in self.board]
+        return self.final_win, self.win_manager.basegame_wins, self.win_manager.freegame_wins, board
 
+    @timed_phase("imprint_wins")
     def imprint_wins(self) -> None:
-        """Record all events to library if criteria conditions are satisfied."""
+        """Record accepted simulation to the active book stream, keeping only lookup values in the library."""
+        if self._searching:
+            return
+        if not self.book.record_events:
+            self.replay_accepted_attempt()
+            return
         for temp_win_index in range(int(len(self.temp_wins) / 2)):
             description = tuple(sorted(self.temp_wins[2 * temp_win_index].items()))
             book_id = self.temp_wins[2 * temp_win_index + 1]
-            if description in self.recorded_events and (
-                book_id not in self.recorded_events[description]["bookIds"]
-            ):
-                self.recorded_events[description]["timesTriggered"] += 1
-                self.recorded_events[description]["bookIds"] += [book_id]
-            elif description not in self.recorded_events:
+            recorded = self.recorded_events.get(description)
+            if recorded is None:
                 self.check_force_keys(description)
                 self.recorded_events[description] = {
                     "timesTriggered": 1,
-                    "bookIds": [book_id],
+                    "bookIds": array("I", [book_id]),
                 }
+            elif book_id > recorded["bookIds"][-1] or (
+                book_id < recorded["bookIds"][-1] and book_id not in recorded["bookIds"]
+            ):
+                # ids arrive in increasing order, a full membership scan is only needed for out-of-order ids
+                recorded["timesTriggered"] += 1
+                recorded["bookIds"].append(book_id)
         self.temp_wins = []
-        self.library[self.sim + 1] = copy(self.book.to_json())
+        book = self.book.to_json()
+        self.library[self.sim + 1] = {key: val for key, val in book.items() if key != "events"}
+        if self.book_writer is not None:
+            self.book_writer.write_book(book)
         self.win_manager.update_end_round_wins()
 
     def update_final_win(self) -> None:
@@ -219,6 +375,52 @@ class GeneralGameState(ABC):
         self.repeat_count += 1
         self.check_current_repeat_count()
 
+    @timed_phase("spin_logic")
+    def run_sim(self, sim: int, first_attempt: int = 0) -> None:
+        """
+        Run a simulation until an attempt is accepted, restarting run_spin() after any aborted attempt.
+        'first_attempt' skips directly to an accepting attempt found by search_accepting_attempts().
+        """
+        self._first_attempt = first_attempt
+        if first_attempt > 0:
+            self._resume_attempt = (first_attempt, first_attempt)
+        while True:
+            try:
+                self.run_spin(sim)
+                break
+            except AbortAttempt:
+                self.repeat_count += 1
+                self.check_current_repeat_count()
+                self._resume_attempt = (self.attempt, self.repeat_count)
+        self._first_attempt = 0
+        if self._telemetry is not None:
+            self.accept_attempt_telemetry()
+        if self.attempt - 1 != first_attempt and first_attempt > 0:
+            raise RuntimeError(
+                f"Simulation {sim} accepted attempt {self.attempt - 1}, the seed search found attempt {first_attempt}."
+            )
+
+    def search_accepting_attempts(self, betmode: str, sim_criteria: dict) -> dict:
+        """
+        Find the first accepting attempt of each simulation {sim: criteria} without building or writing books.
+        Returns the attempt indices (the seed bank) which run_sims() uses to replay accepted attempts directly.
+        """
+        self.betmode = betmode
+        self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
+        seed_bank = {}
+        self._searching = True
+        self._telemetry = {}
+        try:
+            for sim, criteria in sim_criteria.items():
+                self.criteria = criteria
+                self.run_sim(sim)
+                seed_bank[sim] = self.attempt - 1
+            telemetry = self._telemetry
+        finally:
+            self._searching = False
+            self._telemetry = None
+        return {"seed_bank": seed_bank, "telemetry": telemetry, "phase_times": take_phase_times()}
+
     @abstractmethod
     def run_spin(self, sim):
         """run_spin should be defined in gamestate."""
@@ -231,32 +433,47 @@ class GeneralGameState(ABC):
 
     def run_sims(
         self,
-        betmode_copy_list,
         betmode,
-        sim_to_criteria,
-        total_threads,
-        total_repeats,
-        num_sims,
-        thread_index,
-        repeat_count,
+        sim_criteria,
+        first_sim,
+        chunk_index,
         compress=True,
         write_event_list=True,
-    ) -> None:
-        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished."""
+        seed_bank=None,
+    ) -> dict:
+        """Assigns criteria and runs a contiguous chunk of simulations starting at 'first_sim'.
+        Results are stored in temporary files to be combined (in chunk order) when all chunks are finished.
+        Simulations found in 'seed_bank' start directly from their pre-searched accepting attempt.
+        Returns the force-keys, example events, per-criteria run-time, attempt telemetry and phase times of this chunk."""
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
         self.library = {}
+        self.recorded_events = {}
+        self.temp_wins = []
         self.betmode = betmode
-        self.num_sims = num_sims
-        for sim in range(
-            thread_index * num_sims + (total_threads * num_sims) * repeat_count,
-            (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
-        ):
-            self.criteria = sim_to_criteria[sim]
-            self.run_spin(sim)
+        self.num_sims = len(sim_criteria)
+        self.book_writer = BookWriter(
+            self.output_files.get_temp_multi_thread_name(
+                betmode, chunk_index, (compress) * True + (not compress) * False
+            ),
+            output_regular_json=self.config.output_regular_json,
+            collect_event_types=write_event_list,
+        )
+        self._telemetry = {}
+        criteria_time = {}
+        for sim_offset, criteria in enumerate(sim_criteria):
+            self.criteria = criteria
+            sim_start = perf_counter()
+            sim = first_sim + sim_offset
+            self.run_sim(sim, seed_bank.get(sim, 0) if seed_bank is not None else 0)
+            sims, seconds = criteria_time.get(criteria, (0, 0.0))
+            criteria_time[criteria] = (sims + 1, seconds + perf_counter() - sim_start)
+        self.book_writer.close()
         mode_cost = self.get_current_betmode().get_cost()
+        num_sims = max(self.num_sims, 1)
 
         print(
-            "Thread " + str(thread_index),
+            "Chunk " + str(chunk_index),
+            f"(sims {first_sim + 1}-{first_sim + len(sim_criteria)})",
             "finished with",
             round(self.win_manager.total_cumulative_wins / (num_sims * mode_cost), 3),
             "RTP.",
@@ -264,16 +481,19 @@ class GeneralGameState(ABC):
             flush=True,
         )
 
-        write_json(
-            self,
-            self.output_files.get_temp_multi_thread_name(
-                betmode, thread_index, repeat_count, (compress) * True + (not compress) * False
-            ),
-        )
-        print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, thread_index, repeat_count))
-        make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count))
-        make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count))
-
-        if write_event_list:
-            write_library_events(self, list(self.library.values()), betmode)
-        betmode_copy_list.append(self.config.bet_modes)
+        print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, chunk_index))
+        make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, chunk_index))
+        make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, chunk_index))
+
+        event_items = self.book_writer.event_items
+        book_bytes = self.book_writer.num_bytes
+        self.book_writer = None
+        telemetry, self._telemetry = self._telemetry, None
+        return {
+            "force_keys": list(self.get_betmode(betmode).get_force_keys()),  # type:ignore
+            "event_items": event_items,
+            "book_bytes": book_bytes,
+            "criteria_time": criteria_time,
+            "telemetry": telemetry,
+            "phase_times": take_phase_times(),
+        }
@@ -1,4 +1,4 @@
-from src.state.state import GeneralGameState
+from src.state.state import GeneralGameState, AbortAttempt
 
 
 class Conditions(GeneralGameState):
@@ -36,3 +36,19 @@ class Conditions(GeneralGameState):
         if self.wincap_triggered:
             return True
         return False
+
+    def exceeds_win_criteria(self) -> bool:
+        """Check if wins already exceed the (fixed) win criteria, which can then no longer be met."""
+        win_criteria = self.get_current_betmode_distributions().get_win_criteria()
+        if win_criteria is None:
+            return False
+        return round(min(self.win_manager.running_bet_win, self.config.wincap), 2) > win_criteria
+
+    def check_abort_conditions(self) -> None:
+        """Abandon the current attempt if any abort condition of the active distribution is met."""
+        distribution = self.get_current_betmode_distributions()
+        if not distribution.has_abort_conditions():
+            return
+        for condition in distribution.get_abort_conditions():
+            if getattr(self, condition)() if isinstance(condition, str) else condition(self):
+                raise AbortAttempt(condition)
@@ -0,0 +1,47 @@
+"""Per-criteria attempt and acceptance telemetry collected by simulation workers."""
+
+TELEMETRY_COUNTS = ("attempts", "accepted", "accepted_seconds", "rejected_seconds")
+
+
+def new_criteria_telemetry() -> dict:
+    """Empty telemetry for a single criteria."""
+    return {"attempts": 0, "accepted": 0, "accepted_seconds": 0.0, "rejected_seconds": 0.0, "repeat_histogram": {}}
+
+
+def get_repeat_bucket(repeats: int) -> str:
+    """Power-of-two histogram bucket for a repeat count, i.e '0', '1', '2-3', '4-7'."""
+    if repeats < 2:
+        return str(repeats)
+    lower = 1 << (repeats.bit_length() - 1)
+    return f"{lower}-{2 * lower - 1}"
+
+
+def merge_telemetry(target: dict, source: dict) -> dict:
+    """Add {criteria: telemetry} from 'source' into 'target'."""
+    for criteria, stats in source.items():
+        merged = target.setdefault(criteria, new_criteria_telemetry())
+        for key in TELEMETRY_COUNTS:
+            merged[key] += stats[key]
+        for bucket, count in stats["repeat_histogram"].items():
+            merged["repeat_histogram"][bucket] = merged["repeat_histogram"].get(bucket, 0) + count
+    return target
+
+
+def summarise_telemetry(telemetry: dict) -> dict:
+    """JSON-ready report including rejected attempts, attempts per accepted simulation and the rejected time share."""
+    summary = {}
+    for criteria, stats in telemetry.items():
+        total_seconds = stats["accepted_seconds"] + stats["rejected_seconds"]
+        summary[criteria] = {
+            "attempts": stats["attempts"],
+            "accepted": stats["accepted"],
+            "rejected": stats["attempts"] - stats["accepted"],
+            "attempts_per_accepted": round(stats["attempts"] / max(stats["accepted"], 1), 3),
+            "accepted_seconds": round(stats["accepted_seconds"], 4),
+            "rejected_seconds": round(stats["rejected_seconds"], 4),
+            "rejected_time_share": round(stats["rejected_seconds"] / total_seconds, 4) if total_seconds > 0 else 0.0,
+            "repeat_histogram": dict(
+                sorted(stats["repeat_histogram"].items(), key=lambda item: int(item[0].split("-")[0]))
+            ),
+        }
+    return summary
@@ -0,0 +1,104 @@
+"""Persistent simulation worker processes."""
+
+import traceback
+from multiprocessing import Process, Queue
+
+from src.state.profiling import get_task_profile_name, run_profiled
+
+PREFETCH_PER_WORKER = 2
+
+
+def simulation_worker(gamestate: object, task_queue: Queue, result_queue: Queue) -> None:
+    """
+    Run gamestate tasks (run_sims or search_accepting_attempts) on a warm gamestate until a stop signal (None) is received.
+    Tasks carrying a profile filename are profiled individually by the worker.
+    """
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        task_id, method, task_args, profile_file = task
+        try:
+            result_queue.put((task_id, run_profiled(profile_file, getattr(gamestate, method), **task_args), None))
+        except Exception:  # pylint: disable=broad-except
+            result_queue.put((task_id, None, traceback.format_exc()))
+
+
+class WorkerPool:
+    """
+    Long-lived pool of simulation processes, started once per create_books() call.
+    The gamestate is transferred to each worker a single time; afterwards only small task
+    descriptions (sim-index chunks and their criteria) are sent, and force-keys are returned
+    over a result queue.
+    """
+
+    def __init__(self, gamestate: object, threads: int):
+        self.threads = threads
+        self.task_queue = Queue()
+        self.result_queue = Queue()
+        self.workers = [
+            Process(target=simulation_worker, args=(gamestate, self.task_queue, self.result_queue), daemon=True)
+            for _ in range(threads)
+        ]
+        for worker in self.workers:
+            worker.start()
+        print("Started", threads, "simulation workers.")
+
+    def submit_next(self, scheduler: object, profile_prefix: str = None) -> bool:
+        """Queue the scheduler's next task, returns False once all tasks have been handed out."""
+        task = scheduler.next_task()
+        if task is None:
+            return False
+        task_id, task_args = task
+        profile_file = get_task_profile_name(profile_prefix, scheduler.method, task_id)
+        self.task_queue.put((task_id, scheduler.method, task_args, profile_file))
+        return True
+
+    def run_scheduled(self, scheduler: object, profile_prefix: str = None) -> list:
+        """
+        Keep all workers busy with tasks drawn on demand from a scheduler (see ChunkScheduler).
+        A small number of tasks are queued ahead of each worker, so an idle worker never waits
+        on the parent process. Results are returned in task order.
+        If profile_prefix is given, every task is profiled and written to '<profile_prefix>_<method>_<task>.prof'.
+        """
+        in_flight = 0
+        for _ in range(PREFETCH_PER_WORKER * self.threads):
+            if not self.submit_next(scheduler, profile_prefix):
+                break
+            in_flight += 1
+
+        while in_flight > 0:
+            task_id, result, error = self.result_queue.get()
+            in_flight -= 1
+            if error is not None:
+                self.terminate()
+                raise RuntimeError(f"Simulation worker failed on task {task_id}:\n{error}")
+            scheduler.complete(task_id, result)
+            if self.submit_next(scheduler, profile_prefix):
+                in_flight += 1
+
+        return scheduler.get_results()
+
+    def close(self) -> None:
+        """Stop and join all worker processes."""
+        for _ in self.workers:
+            self.task_queue.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+
+    def terminate(self) -> None:
+        """Stop all worker processes without waiting for queued tasks."""
+        for worker in self.workers:
+            worker.terminate()
+            worker.join()
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type is not None:
+            self.terminate()
+        elif self.workers:
+            self.close()
@@ -13,15 +13,15 @@ def apply_mult(
     positions: list = [],
     multiplier_key: str = "multiplier",
 ):
-    """Apply multiplier method to win_amount and winning symbol positions."""
+    """Apply multiplier method to win_amount and winning symbol positions, only the requested strategy is evaluated."""
     strat = {
-        "global": apply_global_mult(win_amount, global_multiplier),
-        "symbol": apply_added_symbol_mult(board, win_amount, positions, multiplier_key=multiplier_key),
-        "combined": apply_combined_mult(
+        "global": lambda: apply_global_mult(win_amount, global_multiplier),
+        "symbol": lambda: apply_added_symbol_mult(board, win_amount, positions, multiplier_key=multiplier_key),
+        "combined": lambda: apply_combined_mult(
             board, win_amount, global_multiplier, positions, multiplier_key=multiplier_key
         ),
     }
-    return strat[strategy]
+    return strat[strategy]()
 
 
 def apply_global_mult(win_amount: float, global_multiplier: int) -> tuple:
@@ -33,11 +33,9 @@ def apply_added_symbol_mult(board: Board, win_amount: float, positions: List[Dic
     """Get multiplier attribute from all winning positions"""
     symbol_multiplier = 0
     for pos in positions:
-        if (
-            board[pos["reel"]][pos["row"]].check_attribute(multiplier_key)
-            and board[pos["reel"]][pos["row"]].get_attribute(multiplier_key) > 1
-        ):
-            symbol_multiplier += board[pos["reel"]][pos["row"]].get_attribute(multiplier_key)
+        multiplier = board[pos["reel"]][pos["row"]].get_active_attribute(multiplier_key)
+        if multiplier is not None and multiplier > 1:
+            symbol_multiplier += multiplier
     return (round(win_amount * max(symbol_multiplier, 1), 2), max(symbol_multiplier, 1))
 
 
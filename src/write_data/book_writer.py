@@ -0,0 +1,64 @@
+"""Stream simulation books to disk as they are imprinted."""
+
+import json
+import zstandard as zstd
+
+from src.state.phase_timer import timed_phase
+
+
+class BookWriter:
+    """
+    Incremental sink for finished books.
+    Each book is serialised as soon as it is imprinted and fed through a zstd stream compressor
+    (for '.zst' files), so only a single book is held in memory regardless of the batch size.
+    """
+
+    def __init__(self, filename: str, output_regular_json: bool = False, collect_event_types: bool = True):
+        self.filename = filename
+        self.compress = filename.endswith(".zst")
+        self.output_regular_json = output_regular_json and not (self.compress)
+        self.collect_event_types = collect_event_types
+        self.event_items = {}
+        self.num_books = 0
+        self.num_bytes = 0
+
+        self._file = open(filename, "wb")
+        if self.compress:
+            self._stream = zstd.ZstdCompressor().stream_writer(self._file)
+        else:
+            self._stream = self._file
+        if self.output_regular_json:
+            self.write_bytes(b"[")
+
+    def write_bytes(self, data: bytes) -> None:
+        """Write raw (uncompressed) bytes to the output stream."""
+        self._stream.write(data)
+        self.num_bytes += len(data)
+
+    @timed_phase("write_books")
+    def write_book(self, book: dict) -> None:
+        """Serialise a single JSON-ready book to the output stream."""
+        if self.output_regular_json:
+            separator = ", " if self.num_books > 0 else ""
+            self.write_bytes((separator + json.dumps(book)).encode("UTF-8"))
+        else:
+            self.write_bytes((json.dumps(book) + "\n").encode("UTF-8"))
+        self.num_books += 1
+
+        if self.collect_event_types:
+            self.update_event_types(book)
+
+    def update_event_types(self, book: dict) -> None:
+        """Keep the first example of every unique event type seen within the batch."""
+        for instance in book["events"]:
+            lib_event = instance["type"]
+            if lib_event not in self.event_items:
+                self.event_items[lib_event] = {key: val for key, val in instance.items() if key != "index"}
+
+    def close(self) -> None:
+        """Finalise the output file."""
+        if self.output_regular_json:
+            self.write_bytes(b"]")
+        self._stream.close()
+        if not (self._file.closed):
+            self._file.close()
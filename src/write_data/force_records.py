@@ -0,0 +1,152 @@
+"""Compact, mergeable temporary storage for recorded force events."""
+
+import heapq
+import json
+import struct
+from array import array
+from itertools import accumulate
+
+FORCE_FILE_MAGIC = b"FRC1"
+HEADER = struct.Struct("<4sI")
+TABLE_ENTRY = struct.Struct("<IIIQIc")
+ID_WRITE_BATCH = 4096
+
+
+def encode_description(description: tuple) -> bytes:
+    """Serialise a sorted description tuple, i.e (('kind', '3'), ('symbol', 'H1'))."""
+    return json.dumps(description, separators=(",", ":")).encode("UTF-8")
+
+
+def decode_description(encoded: bytes) -> tuple:
+    """Inverse of encode_description()."""
+    return tuple(tuple(pair) for pair in json.loads(encoded))
+
+
+def encode_book_ids(book_ids) -> array:
+    """
+    Delta-encode book-ids using the smallest array type fitting every delta.
+    Ids are normally ascending (unsigned deltas), signed types are used if ids were recorded out of order.
+    """
+    deltas = [book_ids[0]] + [book_ids[idx] - book_ids[idx - 1] for idx in range(1, len(book_ids))]
+    smallest, largest = min(deltas), max(deltas)
+    typecodes = ("B", "H", "I", "Q") if smallest >= 0 else ("b", "h", "i", "q")
+    for typecode in typecodes:
+        bits = 8 * array(typecode).itemsize
+        if smallest >= 0 and largest < 1 << bits:
+            return array(typecode, deltas)
+        if smallest < 0 and -(1 << (bits - 1)) <= smallest and largest < 1 << (bits - 1):
+            return array(typecode, deltas)
+    raise ValueError("Book-id delta does not fit in a 64-bit integer.")
+
+
+def write_force_chunk(recorded_events: dict, filename: str) -> None:
+    """
+    Write a chunk's recorded events as a description table, sorted by encoded description, followed by
+    delta-encoded book-id arrays. Each table entry keeps the description's first-appearance index within the
+    chunk so merged outputs retain simulation order.
+    """
+    entries = []
+    id_blobs = []
+    id_offset = 0
+    for first_index, (description, details) in enumerate(recorded_events.items()):
+        deltas = encode_book_ids(details["bookIds"])
+        blob = deltas.tobytes()
+        entries.append(
+            (
+                encode_description(description),
+                first_index,
+                len(details["bookIds"]),
+                id_offset,
+                len(blob),
+                deltas.typecode,
+            )
+        )
+        id_blobs.append(blob)
+        id_offset += len(blob)
+
+    entries.sort()
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(FORCE_FILE_MAGIC, len(entries)))
+        for encoded, first_index, count, offset, nbytes, typecode in entries:
+            f.write(TABLE_ENTRY.pack(len(encoded), first_index, count, offset, nbytes, typecode.encode("ascii")))
+            f.write(encoded)
+        for blob in id_blobs:
+            f.write(blob)
+
+
+def read_force_table(filename: str) -> list:
+    """Return the sorted table [(encoded description, first index, count, absolute offset, nbytes, typecode)]."""
+    table = []
+    with open(filename, "rb") as f:
+        magic, num_entries = HEADER.unpack(f.read(HEADER.size))
+        if magic != FORCE_FILE_MAGIC:
+            raise RuntimeError(f"Unrecognised force-record file: {filename}")
+        for _ in range(num_entries):
+            desc_len, first_index, count, offset, nbytes, typecode = TABLE_ENTRY.unpack(f.read(TABLE_ENTRY.size))
+            table.append((f.read(desc_len), first_index, count, offset, nbytes, typecode.decode("ascii")))
+        blob_start = f.tell()
+    return [
+        (encoded, first_index, count, blob_start + offset, nbytes, typecode)
+        for encoded, first_index, count, offset, nbytes, typecode in table
+    ]
+
+
+def read_book_ids(filename: str, offset: int, nbytes: int, typecode: str) -> array:
+    """Decode a single description's book-ids from a chunk file."""
+    deltas = array(typecode)
+    with open(filename, "rb") as f:
+        f.seek(offset)
+        deltas.frombytes(f.read(nbytes))
+    return array("q", accumulate(deltas))
+
+
+def merge_force_tables(file_list: list) -> list:
+    """
+    K-way merge of the sorted description tables of all chunk files (ordered by simulation).
+    Returns [(description, timesTriggered, [(filename, offset, nbytes, typecode), ...])] ordered by
+    first appearance, without reading any book-ids.
+    """
+
+    def table_with_chunk(chunk_index, filename):
+        for entry in read_force_table(filename):
+            yield (entry[0], chunk_index) + entry[1:]
+
+    tables = [table_with_chunk(chunk_index, filename) for chunk_index, filename in enumerate(file_list)]
+    merged = []
+    current = None
+    for encoded, chunk_index, first_index, count, offset, nbytes, typecode in heapq.merge(*tables):
+        if current is None or current[0] != encoded:
+            current = [encoded, (chunk_index, first_index), 0, []]
+            merged.append(current)
+        current[2] += count
+        current[3].append((file_list[chunk_index], offset, nbytes, typecode))
+
+    merged.sort(key=lambda entry: entry[1])
+    return [(decode_description(encoded), count, sources) for encoded, _, count, sources in merged]
+
+
+def write_force_record(merged: list, filename: str) -> None:
+    """
+    Stream force_record_<mode>.json, matching json.dumps(..., indent=4) of the
+    [{"search": [...], "timesTriggered": int, "bookIds": [...]}] structure.
+    """
+    with open(filename, "w", encoding="UTF-8") as f:
+        if len(merged) == 0:
+            f.write("[]")
+            return
+        f.write("[\n")
+        for entry_index, (description, times_triggered, sources) in enumerate(merged):
+            search = [{"name": str(key), "value": str(val)} for key, val in description]
+            head = json.dumps({"search": search, "timesTriggered": times_triggered}, indent=4)
+            f.write(("    " if entry_index == 0 else ",\n    ") + head[:-2].replace("\n", "\n    "))
+            f.write(',\n        "bookIds": [\n            ')
+            first_id = True
+            for filename_src, offset, nbytes, typecode in sources:
+                book_ids = read_book_ids(filename_src, offset, nbytes, typecode)
+                for start in range(0, len(book_ids), ID_WRITE_BATCH):
+                    id_batch = ",\n            ".join(map(str, book_ids[start : start + ID_WRITE_BATCH]))
+                    f.write(id_batch if first_id else ",\n            " + id_batch)
+                    first_id = False
+            f.write("\n        ]\n    }")
+        f.write("\n]")
+
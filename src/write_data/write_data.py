@@ -6,9 +6,13 @@ import shutil
 import os
 import hashlib
 import json
-import ast
 import zstandard as zstd
 
+from src.write_data.force_records import merge_force_tables, write_force_chunk, write_force_record
+from src.state.phase_timer import timed_phase
+
+COPY_BUFFER_SIZE = 1 << 20
+
 
 def get_sha_256(file_to_hash: str):
     """Get human readable hash of file."""
@@ -65,15 +69,16 @@ def make_force_json(gamestate: object):
         json.dump(force_data, force_file, indent=4)
 
 
-def get_force_options(force_results: dict):
-    """Return JSON ready force keys."""
+def get_force_options(force_results):
+    """Return JSON ready force keys from an iterable of force descriptions."""
     force_keys = defaultdict(set)
-    for force in force_results.keys():
+    for force in force_results:
         for key, val in force:
             force_keys[str(key)].add(val)
     return {key: list(val) for key, val in force_keys.items()}
 
 
+@timed_phase("write_lookups")
 def make_lookup_tables(gamestate: object, name: str):
     """Write lookup tables for all simulations."""
     file = open(name, "w", encoding="UTF-8")
@@ -84,6 +89,7 @@ def make_lookup_tables(gamestate: object, name: str):
     file.close()
 
 
+@timed_phase("write_lookups")
 def make_lookup_pay_split(gamestate: object, name: str):
     """Record win values from basegame and freegame types."""
     file = open(name, "w", encoding="UTF-8")
@@ -103,18 +109,8 @@ def make_lookup_pay_split(gamestate: object, name: str):
     file.close()
 
 
-def write_library_events(gamestate: object, library: list, gametype: str):
+def write_library_events(gamestate: object, event_items: dict, gametype: str):
     """Write all unique events within a given mode - with one example application."""
-    unique_event = []
-    event_items = {}
-    for event in library:
-        for instance in event["events"]:
-            lib_event = instance["type"]
-            if lib_event not in unique_event:
-                unique_event.append(lib_event)
-                item_keys = instance.keys()
-                dict_details = {key: instance[key] for key in item_keys if key != "index"}
-                event_items[lib_event] = dict_details
     json_object = json.dumps(event_items, indent=4)
     with open(
         os.path.join(gamestate.output_files.config_path, f"event_config_{gametype}.json"),
@@ -124,95 +120,88 @@ def write_library_events(gamestate: object, library: list, gametype: str):
         f.write(json_object)
 
 
+def write_simulation_telemetry(gamestate: object) -> None:
+    """Write the attempt/acceptance telemetry of all simulated betmodes."""
+    with open(gamestate.output_files.get_telemetry_name(), "w", encoding="UTF-8") as f:
+        f.write(json.dumps(gamestate.simulation_telemetry, indent=4))
+
+
+def copy_file_bytes(infile, outfile, num_bytes: int) -> None:
+    """Buffered copy of a fixed number of bytes between open binary files."""
+    while num_bytes > 0:
+        buffer = infile.read(min(COPY_BUFFER_SIZE, num_bytes))
+        if not buffer:
+            break
+        outfile.write(buffer)
+        num_bytes -= len(buffer)
+
+
+def merge_text_files(file_list: list, output_path: str) -> None:
+    """Concatenate files into a single output using buffered streaming copies."""
+    with open(output_path, "wb") as outfile:
+        for filename in file_list:
+            with open(filename, "rb") as infile:
+                shutil.copyfileobj(infile, outfile, COPY_BUFFER_SIZE)
+
+
+def merge_compressed_books(file_list: list, output_path: str, content_size: int = -1) -> None:
+    """
+    Stream-decompress temp .zst book files directly into a multi-threaded zstd compressor.
+    Memory usage is constant, and the output remains a single frame (recording 'content_size' when known).
+    """
+    compressor = zstd.ZstdCompressor(threads=-1)
+    with open(output_path, "wb") as outfile:
+        with compressor.stream_writer(outfile, size=content_size, closefd=False) as writer:
+            for filename in file_list:
+                with open(filename, "rb") as infile:
+                    with zstd.ZstdDecompressor().stream_reader(infile, read_across_frames=True) as reader:
+                        shutil.copyfileobj(reader, writer, COPY_BUFFER_SIZE)
+
+
+def merge_regular_json_books(file_list: list, output_path: str) -> None:
+    """Join temp JSON-array book files into a single array, without loading files into memory."""
+    with open(output_path, "wb") as outfile:
+        outfile.write(b"[")
+        for idx, filename in enumerate(file_list):
+            if idx > 0:
+                outfile.write(b",")
+            with open(filename, "rb") as infile:
+                infile.seek(1)  # skip opening '['
+                copy_file_bytes(infile, outfile, os.path.getsize(filename) - 2)  # skip closing ']'
+        outfile.write(b"]")
+
+
+@timed_phase("merge_output")
 def output_lookup_and_force_files(
-    threads: int,
-    batching_size: int,
+    chunk_results: list,
     game_id: str,
     betmode: str,
     gamestate: object,
-    num_sims: int = 1000000,
     compress: bool = True,
 ):
-    """Combine temporary lookup tables and force files into a single output."""
+    """Combine temporary lookup tables and force files, in simulation-chunk order, into a single output."""
     print("Saving books for ", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            )
+    num_chunks = len(chunk_results)
+    file_list = [
+        gamestate.output_files.get_temp_multi_thread_name(betmode, chunk_index, compress)
+        for chunk_index in range(num_chunks)
+    ]
 
+    final_out = gamestate.output_files.get_final_book_name(betmode, compress)
     if compress:
-        temp_book_output_path = os.path.join(gamestate.output_files.book_path, "temp_book_output.json")
-        with open(temp_book_output_path, "w", encoding="UTF-8") as outfile:
-            for fname in file_list:
-                with open(fname, "rb") as infile:
-                    decompressed = zstd.ZstdDecompressor().decompress(infile.read())
-                    outfile.write(decompressed.decode("UTF-8"))
-
-        final_out = gamestate.output_files.get_final_book_name(betmode, True)
-        with open(temp_book_output_path, "rb") as f_in, open(final_out, "wb") as f_out:
-            f_out.write(zstd.ZstdCompressor().compress(f_in.read()))
-
-        os.remove(temp_book_output_path)
+        merge_compressed_books(file_list, final_out, sum(result["book_bytes"] for result in chunk_results))
+    elif gamestate.config.output_regular_json:
+        merge_regular_json_books(file_list, final_out)
     else:
-        with open(
-            gamestate.output_files.get_final_book_name(betmode, False),
-            "w",
-            encoding="UTF-8",
-        ) as outfile:
-            for id, filename in enumerate(file_list):
-                with open(filename, "r", encoding="UTF-8") as infile:
-                    file_data = infile.read()
-                    if filename.endswith(".jsonl"):
-                        outfile.write(file_data)
-                    elif filename.endswith(".json"):
-                        if id == 0 and len(file_list) == 1:
-                            outfile.write(file_data)
-                        elif id == 0 and len(file_list) > 1:
-                            outfile.write(file_data[:-1])  # don't write final ']'
-                        elif id != len(file_list) - 1:
-                            outfile.write("," + file_data[1:-1])  # don't write first or last '[/]'
-                        else:
-                            outfile.write("," + file_data[1::])  # dont write first '[', write last ']'
+        merge_text_files(file_list, final_out)
 
     print("Saving force files for", game_id, "in", betmode)
-    force_results_dict = {}
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
-            )
-
-    for filename in file_list:
-        force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
-        for key in force_chunk:
-            if force_results_dict.get(key) is not None:
-                force_results_dict[key]["timesTriggered"] += force_chunk[key]["timesTriggered"]
-                force_results_dict[key]["bookIds"] += force_chunk[key]["bookIds"]
-            else:
-                force_results_dict[key] = force_chunk[key]
-
-    force_results_dict_just_for_rob = []
-    for force_combination in force_results_dict:
-        search_dict = []
-        for key in force_combination:
-            search_dict.append({"name": str(key[0]), "value": str(key[1])})
-        force_dict = {
-            "search": search_dict,
-            "timesTriggered": force_results_dict[force_combination]["timesTriggered"],
-            "bookIds": force_results_dict[force_combination]["bookIds"],
-        }
-        force_results_dict_just_for_rob.append(force_dict)
-
-    json_object_for_rob = json.dumps(force_results_dict_just_for_rob, indent=4)
+    file_list = [gamestate.output_files.get_temp_force_name(betmode, chunk_index) for chunk_index in range(num_chunks)]
+    merged_force_records = merge_force_tables(file_list)
     force_record_path = os.path.join(gamestate.output_files.force_path, f"force_record_{betmode}.json")
-    with open(force_record_path, "w", encoding="UTF-8") as file:
-        file.write(json_object_for_rob)
+    write_force_record(merged_force_records, force_record_path)
 
-    forceResultKeys = get_force_options(force_results_dict)
+    forceResultKeys = get_force_options(description for description, _, _ in merged_force_records)
     json_file_path = os.path.join(gamestate.output_files.force_path, "force.json")
     try:
         with open(json_file_path, "r", encoding="UTF-8") as file:
@@ -224,26 +213,15 @@ def output_lookup_and_force_files(
     with open(json_file_path, "w", encoding="UTF-8") as file:
         file.write(json_object)
 
-    weights_plus_wins_file_list = []
-    segmented_lut_file_list = []
     print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
+    weights_plus_wins_file_list = [
+        gamestate.output_files.get_temp_lookup_name(betmode, chunk_index) for chunk_index in range(num_chunks)
+    ]
+    segmented_lut_file_list = [
+        gamestate.output_files.get_temp_segmented_name(betmode, chunk_index) for chunk_index in range(num_chunks)
+    ]
 
-    with open(
-        gamestate.output_files.get_final_lookup_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
-        for filename in weights_plus_wins_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
-                outfile.write(infile.read())
+    merge_text_files(weights_plus_wins_file_list, gamestate.output_files.get_final_lookup_name(betmode))
 
     # Write _0 file if it does not exist
     if not (os.path.exists(gamestate.output_files.get_optimized_lookup_name(betmode))):
@@ -251,38 +229,10 @@ def output_lookup_and_force_files(
             gamestate.output_files.get_final_lookup_name(betmode),
             gamestate.output_files.get_optimized_lookup_name(betmode),
         )
-    with open(
-        gamestate.output_files.get_final_segmented_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
-        for filename in segmented_lut_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
-                outfile.write(infile.read())
-
-
-def write_json(gamestate, filename: str):
-    """Convert the list of dictionaries to a JSON-encoded string and compress it in chunks."""
-    json_objects = [json.dumps(item) for item in gamestate.library.values()]
-    combined_data = "\n".join(json_objects) + "\n"
-
-    if filename.endswith(".zst"):
-        compressor = zstd.ZstdCompressor()
-        compressed_data = compressor.compress(combined_data.encode("UTF-8"))
-        with open(filename, "wb") as f:
-            f.write(compressed_data)
-    else:
-        with open(filename, "w", encoding="UTF-8") as f:
-            if not (gamestate.config.output_regular_json):
-                f.write(combined_data)
-            else:
-                j_regular = [item for item in gamestate.library.values()]
-                f.write(json.dumps(j_regular))
+    merge_text_files(segmented_lut_file_list, gamestate.output_files.get_final_segmented_name(betmode))
 
 
+@timed_phase("write_force_records")
 def print_recorded_wins(gamestate: object, name: str = ""):
-    """Temporary file generation for wins/recorded results."""
-    json_object = json.dumps(str(gamestate.recorded_events), indent=4)
-    file = open(name, "w", encoding="UTF-8")
-    file.write(json_object)
-    file.close()
+    """Temporary (binary) file generation for wins/recorded results, see force_records.py."""
+    write_force_chunk(gamestate.recorded_events, name)
@@ -0,0 +1,111 @@
+"""Test that conditioned board sampling matches the boards accepted by the rejection loops."""
+
+from itertools import permutations, product
+
+from src.calculations.board_sampling import ReelstripIndex
+from src.state.rng import CounterRNG
+
+NUM_ROWS = [2, 2, 2]
+REELSTRIPS = {
+    "BR0": [["S", "A", "B", "S", "C"], ["A", "S", "B", "C"], ["S", "S", "A", "B"]],
+    "BR1": [["A", "B", "C", "S"], ["S", "A", "B", "C", "D"], ["A", "B", "S"]],
+}
+REEL_WEIGHTS = {"BR0": 3, "BR1": 1}
+NUM_DRAWS = 20000
+
+
+def count_scatters(reelstrip, positions):
+    return sum(
+        reel[(position + row) % len(reel)] == "S"
+        for reel, position, rows in zip(reelstrip, positions, NUM_ROWS)
+        for row in range(rows)
+    )
+
+
+def normalise(outcomes):
+    total = sum(outcomes.values())
+    return {outcome: probability / total for outcome, probability in outcomes.items()}
+
+
+def rejection_below(limit):
+    """Exact distribution of boards accepted by redrawing reelstrip and uniform stops (Board.draw_board)."""
+    outcomes = {}
+    for reelstrip_id, weight in REEL_WEIGHTS.items():
+        reelstrip = REELSTRIPS[reelstrip_id]
+        for positions in product(*(range(len(reel)) for reel in reelstrip)):
+            if count_scatters(reelstrip, positions) < limit:
+                probability = weight
+                for reel in reelstrip:
+                    probability /= len(reel)
+                outcomes[(reelstrip_id, positions)] = probability
+    return normalise(outcomes)
+
+
+def rejection_forced(num_forced):
+    """Exact distribution of boards accepted by Board.force_special_board(), enumerating every random choice."""
+    outcomes = {}
+    for reelstrip_id, weight in REEL_WEIGHTS.items():
+        reelstrip = REELSTRIPS[reelstrip_id]
+        stops = [[position for position, name in enumerate(reel) if name == "S"] for reel in reelstrip]
+        densities = [len(reel_stops) / len(reel) for reel_stops, reel in zip(stops, reelstrip)]
+        for order in permutations(range(len(reelstrip)), num_forced):
+            order_probability = weight
+            remaining = list(densities)
+            for reel in order:
+                order_probability *= remaining[reel] / sum(remaining)
+                remaining[reel] = 0
+            choices = []
+            for reel, rows in enumerate(NUM_ROWS):
+                if reel in order:
+                    forced_probability = 1 / (len(stops[reel]) * rows)
+                    forced_positions = [stop - offset for stop in stops[reel] for offset in range(rows)]
+                    choices.append([(position, forced_probability) for position in forced_positions])
+                else:
+                    choices.append([(position, 1 / len(reelstrip[reel])) for position in range(len(reelstrip[reel]))])
+            for combination in product(*choices):
+                positions = tuple(position for position, _ in combination)
+                if count_scatters(reelstrip, positions) == num_forced:
+                    probability = order_probability
+                    for _, choice_probability in combination:
+                        probability *= choice_probability
+                    key = (reelstrip_id, positions)
+                    outcomes[key] = outcomes.get(key, 0.0) + probability
+    return normalise(outcomes)
+
+
+def sample(draw_positions, get_probability):
+    rng = CounterRNG()
+    rng.seed_sim(0)
+    indexes = {strip_id: ReelstripIndex(strip, NUM_ROWS, {"S"}, {"S"}) for strip_id, strip in REELSTRIPS.items()}
+    strip_ids = list(REEL_WEIGHTS)
+    strip_weights = [REEL_WEIGHTS[reelstrip_id] * get_probability(indexes[reelstrip_id]) for reelstrip_id in strip_ids]
+    counts = {}
+    for _ in range(NUM_DRAWS):
+        reelstrip_id = rng.choices(strip_ids, strip_weights)[0]
+        key = (reelstrip_id, tuple(draw_positions(indexes[reelstrip_id], rng)))
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def assert_matches(counts, expected):
+    assert set(counts) <= set(expected)
+    chi_square = sum((counts.get(key, 0) - NUM_DRAWS * p) ** 2 / (NUM_DRAWS * p) for key, p in expected.items())
+    degrees_of_freedom = len(expected) - 1
+    assert chi_square < degrees_of_freedom + 5 * (2 * degrees_of_freedom) ** 0.5
+
+
+def test_below_matches_rejection():
+    limit = 2
+    counts = sample(
+        lambda index, rng: index.sample_below(limit, rng), lambda index: index.get_below_probability(limit)
+    )
+    assert_matches(counts, rejection_below(limit))
+
+
+def test_forced_matches_rejection():
+    for num_forced in (2, 3):
+        counts = sample(
+            lambda index, rng: index.sample_forced(num_forced, rng),
+            lambda index: index.get_forced_probability(num_forced),
+        )
+        assert_matches(counts, rejection_forced(num_forced))
@@ -0,0 +1,32 @@
+"""Test compiled paytable lookups against the config dictionaries."""
+
+from src.config.paytable import get_compiled_paytable
+
+
+class PaytableConfig:
+    def __init__(self):
+        self.paytable = {(3, "H1"): 5, (5, "H1"): 20, (3, "W"): 10}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"], None: ["X"]}
+
+
+def test_pay_lookup_matches_paytable():
+    config = PaytableConfig()
+    paytable = get_compiled_paytable(config)
+    for kind in range(0, 8):
+        for name in ["H1", "W", "S", "L1"]:
+            assert paytable.get_pay(kind, name) == config.paytable.get((kind, name))
+
+
+def test_special_names_and_flags():
+    paytable = get_compiled_paytable(PaytableConfig())
+    assert paytable.get_special_names("wild") == {"W"}
+    assert paytable.get_special_names("multiplier") == frozenset()
+    assert paytable.has_flag("S", "scatter") and not paytable.has_flag("H1", "wild")
+
+
+def test_compiled_paytable_cached_and_rebuilt():
+    config = PaytableConfig()
+    compiled = get_compiled_paytable(config)
+    assert get_compiled_paytable(config) is compiled
+    config.paytable = {(3, "H1"): 1}
+    assert get_compiled_paytable(config).get_pay(3, "H1") == 1
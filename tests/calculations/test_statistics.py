@@ -0,0 +1,106 @@
+"""Test cached weighted samplers against the linear cumulative walk."""
+
+import pickle
+import random
+
+import pytest
+
+from src.calculations import statistics
+from src.calculations.statistics import (
+    WeightedSampler,
+    clear_sampler_cache,
+    get_random_outcome,
+    get_weighted_sampler,
+)
+from src.state.rng import get_rng
+
+DISTRIBUTIONS = [
+    {"BR0": 1, "FR0": 3},
+    {2: 100, 3: 80, 4: 50, 5: 20, 10: 10, 20: 5, 50: 1},
+    {1: 0.25, 2: 0.0, 3: 0.1, 4: 0.65},
+    {0: 0, 1: 5, 2: 0},
+]
+
+
+def linear_walk(distribution: dict, rng) -> object:
+    roll = rng.uniform(0, sum(distribution.values()))
+    cumulative = 0.0
+    for value, weight in distribution.items():
+        cumulative += weight
+        if cumulative >= roll:
+            return value
+
+
+def linear_randint_walk(distribution: dict, rng) -> object:
+    roll = rng.randint(1, sum(distribution.values()))
+    cumulative = 0
+    for value, weight in distribution.items():
+        cumulative += weight
+        if roll <= cumulative:
+            return value
+
+
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+def test_compatible_draws_match_linear_walk(distribution):
+    for mode in ("legacy", "counter"):
+        rng = get_rng(mode)
+        rng.seed_sim(11)
+        draws = [get_random_outcome(distribution, rng=rng) for _ in range(2000)]
+        rng.seed_sim(11)
+        assert draws == [linear_walk(distribution, rng) for _ in range(2000)]
+
+
+def test_randint_draws_match_integer_walk():
+    distribution = DISTRIBUTIONS[1]
+    sampler = WeightedSampler(distribution)
+    random.seed(5)
+    draws = [sampler.draw_randint() for _ in range(2000)]
+    random.seed(5)
+    assert draws == [linear_randint_walk(distribution, random) for _ in range(2000)]
+
+
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+def test_alias_draw_frequencies(distribution):
+    rng = get_rng("counter", "alias")
+    rng.seed_sim(0)
+    num_draws = 100000
+    counts = dict.fromkeys(distribution, 0)
+    for _ in range(num_draws):
+        counts[get_random_outcome(distribution, rng=rng)] += 1
+    total = sum(distribution.values())
+    for value, weight in distribution.items():
+        if weight == 0:
+            assert counts[value] == 0
+        else:
+            assert counts[value] / num_draws == pytest.approx(weight / total, abs=0.01)
+
+
+def test_sampler_cache_is_keyed_by_distribution():
+    distribution = {1: 1, 2: 1}
+    sampler = get_weighted_sampler(distribution)
+    assert get_weighted_sampler(distribution) is sampler
+    assert get_weighted_sampler({1: 1, 2: 1}) is not sampler
+    distribution[3] = 1
+    assert get_weighted_sampler(distribution).values == [1, 2, 3]
+
+
+def test_weighted_sampling_mode():
+    assert not get_rng("legacy").alias_sampling
+    assert get_rng("legacy", "alias").alias_sampling
+    rng = pickle.loads(pickle.dumps(get_rng("counter", "alias")))
+    assert rng.alias_sampling
+    with pytest.raises(RuntimeError):
+        get_rng("legacy", "walker")
+
+
+def test_sampler_cache_keeps_recently_drawn_distributions(monkeypatch):
+    monkeypatch.setattr(statistics, "MAX_CACHED_SAMPLERS", 4)
+    clear_sampler_cache()
+    reel_weights = {"BR0": 1, "FR0": 2}
+    sampler = get_weighted_sampler(reel_weights)
+    short_lived = [{value: 1} for value in range(10)]
+    for distribution in short_lived:
+        get_weighted_sampler(distribution)
+        assert get_weighted_sampler(reel_weights) is sampler
+    assert len(statistics._sampler_cache) == 4
+    clear_sampler_cache()
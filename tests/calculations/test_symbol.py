@@ -0,0 +1,85 @@
+"""Test shared symbol prototypes and per-instance attributes."""
+
+import pickle
+
+import pytest
+
+from src.calculations.symbol import SymbolStorage
+from src.events.events import json_ready_sym
+
+
+class SymbolConfig:
+    def __init__(self):
+        self.paytable = {(3, "H1"): 5, (4, "H1"): 10, (3, "W"): 20}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"], "multiplier": ["W"]}
+
+
+def test_prototype_shared_between_instances():
+    storage = SymbolStorage(SymbolConfig(), ["H1", "W", "S"])
+    first, second = storage.create_symbol_state("H1"), storage.create_symbol_state("H1")
+    assert first is not second
+    assert first.paytable is second.paytable
+    assert first.is_paying and first.paytable == [{"3": 5}, {"4": 10}]
+    assert not storage.create_symbol_state("S").is_paying
+    assert storage.create_symbol_state("S").paytable is None
+
+
+def test_dynamic_attributes_are_per_instance():
+    storage = SymbolStorage(SymbolConfig(), ["H1", "W", "S"])
+    wild, other_wild = storage.create_symbol_state("W"), storage.create_symbol_state("W")
+    wild.assign_attribute({"multiplier": 3})
+    wild.explode = True
+    assert wild.check_attribute("wild") and wild.get_attribute("multiplier") == 3 and wild.explode
+    assert other_wild.multiplier is True
+    assert not other_wild.check_attribute("explode")
+    assert not hasattr(other_wild, "prize")
+    assert type(wild) is type(other_wild) and other_wild._attrs is None
+    assert not hasattr(wild, "__dict__")
+
+
+def test_prototype_properties_are_slots():
+    storage = SymbolStorage(SymbolConfig(), ["H1", "W", "S"])
+    scatter = storage.create_symbol_state("S")
+    scatter.is_paying, scatter.paytable = True, [{"3": 1}]
+    assert scatter.is_paying and scatter.get_special_attributes() == {"scatter": True}
+    scatter.assign_paying_bool(SymbolConfig())
+    assert not scatter.is_paying and scatter.paytable is None
+    scatter.register_special_function(lambda symbol: symbol.assign_attribute({"prize": 2}))
+    scatter.apply_special_function()
+    assert scatter.prize == 2 and storage.create_symbol_state("S").special_functions == ()
+    with pytest.raises(AttributeError):
+        scatter.name = "H1"
+
+
+def test_attribute_set_to_none_counts_as_set():
+    storage = SymbolStorage(SymbolConfig(), ["H1", "W", "S"])
+    symbol = storage.create_symbol_state("H1")
+    symbol.assign_attribute({"prize": None, "explode": False})
+    assert symbol.check_attribute("prize")
+    assert not symbol.check_attribute("explode", "wild")
+    assert symbol.get_active_attribute("prize", 1) is None
+    assert symbol.get_active_attribute("explode", 1) == 1
+
+
+def test_json_ready_symbol_order():
+    storage = SymbolStorage(SymbolConfig(), ["H1", "W", "S"])
+    wild = storage.create_symbol_state("W")
+    wild.assign_attribute({"prize": 2, "multiplier": 5})
+    special_attributes = ["wild", "scatter", "multiplier", "prize"]
+    assert list(json_ready_sym(wild, special_attributes).items()) == [
+        ("name", "W"),
+        ("wild", True),
+        ("multiplier", 5),
+        ("prize", 2),
+    ]
+    assert json_ready_sym(storage.create_symbol_state("H1"), special_attributes) == {"name": "H1"}
+
+
+def test_symbol_pickle_round_trip():
+    storage = SymbolStorage(SymbolConfig(), ["H1", "W", "S"])
+    wild = storage.create_symbol_state("W")
+    wild.assign_attribute({"multiplier": 4})
+    wild.is_paying = False
+    restored = pickle.loads(pickle.dumps(wild))
+    assert restored.name == "W" and restored.multiplier == 4 and restored.wild
+    assert not restored.is_paying and restored.paytable == [{"3": 20}]
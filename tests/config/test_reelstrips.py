@@ -0,0 +1,86 @@
+"""Test compiled reelstrips and the reel cache."""
+
+import os
+
+import pytest
+
+from src.config.config import Config
+from src.config.reelstrips import REEL_CACHE_DIR, Reelstrip, load_reelstrip, parse_reels_csv
+
+CSV = "L1,H1 ,S\r\nL2, W,L1\nS,L2,H1*\nH1,L1,L2\n"
+REELS = [["L1", "L2", "S", "H1"], ["H1", "W", "L2", "L1"], ["S", "L1", "H1", "L2"]]
+
+
+def test_parse_reels_csv():
+    assert parse_reels_csv(CSV) == REELS
+    with pytest.raises(AssertionError):
+        parse_reels_csv("L1,L2\nL1, \n")
+
+
+def make_config() -> Config:
+    config = Config()
+    config.num_rows = [3, 3, 3]
+    config.paytable = {(3, "H1"): 5, (3, "L1"): 2, (3, "L2"): 1}
+    config.special_symbols = {"wild": ["W"], "scatter": ["S"]}
+    return config
+
+
+def test_window_ids_match_wrapped_reads():
+    symbol_ids = {"H1": 0, "L1": 1, "L2": 2, "W": 3, "S": 4}
+    reelstrip = Reelstrip(REELS)
+    reelstrip.bind_symbol_ids(symbol_ids, 6)
+    for reel, strip in enumerate(reelstrip):
+        assert [reelstrip.symbols[symbol_id] for symbol_id in reelstrip.ids[reel]] == strip
+        ids = [symbol_ids[name] for name in strip]
+        for position in range(-len(strip), 2 * len(strip)):
+            start = position % len(strip)
+            window = [ids[(position + row) % len(strip)] for row in range(5)]
+            assert list(reelstrip.window_ids[reel][start : start + 5]) == window
+            assert reelstrip.window_ids[reel][start - 1] == ids[(position - 1) % len(strip)]
+
+
+def test_from_ids_keeps_cached_arrays():
+    reelstrip = Reelstrip(REELS)
+    loaded = Reelstrip.from_ids(reelstrip.symbols, reelstrip.ids)
+    assert loaded == REELS
+    assert loaded.symbols is reelstrip.symbols and loaded.ids is reelstrip.ids
+
+
+def test_reel_cache(tmp_path):
+    file_path = os.path.join(tmp_path, "BR0.csv")
+    with open(file_path, "w", encoding="UTF-8") as f:
+        f.write(CSV)
+    assert load_reelstrip(file_path) == REELS
+    cache_files = os.listdir(os.path.join(tmp_path, REEL_CACHE_DIR))
+    assert len(cache_files) == 1
+    assert load_reelstrip(file_path) == REELS
+
+    with open(file_path, "a", encoding="UTF-8") as f:
+        f.write("W,W,W\n")
+    assert [reel[-1] for reel in load_reelstrip(file_path)] == ["W", "W", "W"]
+    assert os.listdir(os.path.join(tmp_path, REEL_CACHE_DIR)) != cache_files
+    assert len(os.listdir(os.path.join(tmp_path, REEL_CACHE_DIR))) == 1
+
+
+def test_reel_cache_keeps_caches_of_other_csv_files(tmp_path):
+    for name in ("BR0.csv", "BR0.v2.csv"):
+        with open(os.path.join(tmp_path, name), "w", encoding="UTF-8") as f:
+            f.write(CSV)
+        load_reelstrip(os.path.join(tmp_path, name))
+    with open(os.path.join(tmp_path, "BR0.csv"), "a", encoding="UTF-8") as f:
+        f.write("W,W,W\n")
+    load_reelstrip(os.path.join(tmp_path, "BR0.csv"))
+    cache_files = sorted(os.listdir(os.path.join(tmp_path, REEL_CACHE_DIR)))
+    assert len(cache_files) == 2
+    assert cache_files[0].startswith("BR0.") and cache_files[1].startswith("BR0.v2.")
+
+
+def test_compile_reels_validates_symbols():
+    config = make_config()
+    config.reels = {"BR0": REELS}
+    config.compile_reels(["L1", "L2", "H1", "S", "W"])
+    assert isinstance(config.reels["BR0"], Reelstrip)
+    symbol_ids = config._compiled_paytable.symbol_ids
+    assert list(config.reels["BR0"].window_ids[1][:4]) == [symbol_ids[name] for name in REELS[1]]
+    with pytest.raises(RuntimeError):
+        config.compile_reels(["L1", "L2", "H1", "S"])
@@ -0,0 +1,11 @@
+"""Shared test setup."""
+
+import pytest
+
+from src.state.books import Book
+
+
+@pytest.fixture(autouse=True)
+def check_detached_events(monkeypatch):
+    """Verify in every test that events recorded without a copy are not modified before the book is written."""
+    monkeypatch.setattr(Book, "check_detached_events", True)
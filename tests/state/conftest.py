@@ -0,0 +1,85 @@
+"""Shared board-less gamestate for tests of repeat attempts (deferred events, abort conditions, seed search)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.config.distributions import Distribution
+from src.state.state_conditions import Conditions
+from src.wins.win_manager import WinManager
+
+
+class RepeatGamestate(Conditions):
+    """
+    Gamestate of a single 'base' bet mode, with one distribution per criteria {criteria: Distribution kwargs}.
+    Each attempt calls play_attempt(gamestate), which records the attempt's events and wins and returns True
+    if the attempt is rejected. Counts every attempt and the attempts which built their events.
+    """
+
+    def __init__(self, play_attempt, criteria: dict, defer_rejected_events: bool):
+        distributions = [
+            Distribution(criteria=name, quota=1, conditions={"reel_weights": {}}, **kwargs)
+            for name, kwargs in criteria.items()
+        ]
+        betmode = SimpleNamespace(get_name=lambda: "base", get_distributions=lambda: distributions)
+        self.config = SimpleNamespace(
+            num_reels=1,
+            num_rows=[1],
+            basegame_type="basegame",
+            freegame_type="freegame",
+            wincap=5000,
+            defer_rejected_events=defer_rejected_events,
+            bet_modes=[betmode],
+        )
+        self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
+        self.library = {}
+        self.book_writer = None
+        self.recorded_events = {}
+        self.betmode = "base"
+        self.criteria = distributions[0].get_criteria()
+        self.play_attempt = play_attempt
+        self.attempts = 0
+        self.events_built = 0
+
+    def assign_special_sym_function(self):
+        pass
+
+    def run_spin(self, sim):
+        self.reset_seed(sim)
+        self.repeat = True
+        while self.repeat:
+            self.reset_book()
+            self.attempts += 1
+            if self.book.record_events:
+                self.events_built += 1
+            self.repeat = self.play_attempt(self)
+            self.repeat_count += 1
+        self.imprint_wins()
+
+    def run_freespin(self):
+        pass
+
+
+@pytest.fixture
+def make_gamestate():
+    """Factory of RepeatGamestate(play_attempt, criteria={"basegame": {}}, defer_rejected_events=True)."""
+
+    def make(play_attempt, criteria: dict = None, defer_rejected_events: bool = True) -> RepeatGamestate:
+        return RepeatGamestate(play_attempt, criteria or {"basegame": {}}, defer_rejected_events)
+
+    return make
+
+
+@pytest.fixture
+def run_books():
+    """Run simulations {sim: criteria} (from their seed bank attempt, if given) and return their books."""
+
+    def run(gamestate: RepeatGamestate, sim_criteria: dict, seed_bank: dict = None) -> list:
+        books = []
+        for sim, criteria in sim_criteria.items():
+            gamestate.criteria = criteria
+            gamestate.run_sim(sim, (seed_bank or {}).get(sim, 0))
+            books.append(gamestate.book.to_json())
+        return books
+
+    return run
@@ -0,0 +1,47 @@
+"""Test that aborting attempts early accepts the same books as running every attempt to completion."""
+
+import random
+import pytest
+
+from src.config.distributions import Distribution
+
+SIM_CRITERIA = dict.fromkeys(range(20), "0")
+
+
+def tumble_attempt(gamestate):
+    """Five 'tumbles', each winning with probability 1/4, the attempt is accepted without any win."""
+    for _ in range(5):
+        gamestate.check_abort_conditions()
+        gamestate.tumbles += 1
+        win = random.choice([0, 0, 0, 1])
+        gamestate.win_manager.update_spinwin(win)
+        gamestate.book.add_event({"index": len(gamestate.book.events), "type": "tumble", "win": win})
+    gamestate.final_win = gamestate.win_manager.running_bet_win
+    return gamestate.final_win != 0
+
+
+def run_tumbles(make_gamestate, run_books, abort_conditions, defer_rejected_events):
+    criteria = {"0": {"win_criteria": 0.0, "abort_conditions": abort_conditions}}
+    gamestate = make_gamestate(tumble_attempt, criteria, defer_rejected_events)
+    gamestate.tumbles = 0
+    return gamestate, run_books(gamestate, SIM_CRITERIA)
+
+
+@pytest.mark.parametrize("defer_rejected_events", [False, True])
+def test_aborted_attempts_accept_identical_books(make_gamestate, run_books, defer_rejected_events):
+    full, full_books = run_tumbles(make_gamestate, run_books, [lambda gamestate: False], defer_rejected_events)
+    aborted, aborted_books = run_tumbles(make_gamestate, run_books, ["exceeds_win_criteria"], defer_rejected_events)
+    assert aborted_books == full_books
+    assert aborted.tumbles < full.tumbles
+
+
+def test_invalid_abort_condition():
+    with pytest.raises(AssertionError):
+        Distribution(criteria="0", quota=1, conditions={"reel_weights": {}}, abort_conditions=[1])
+
+
+def test_distribution_without_abort_conditions_skips_the_check():
+    distribution = Distribution(criteria="0", quota=1, conditions={"reel_weights": {}})
+    assert not distribution.has_abort_conditions()
+    distribution.set_abort_conditions(["exceeds_win_criteria"])
+    assert distribution.has_abort_conditions()
@@ -0,0 +1,24 @@
+"""Test that bet mode lookups follow changes of betmode and of config.bet_modes."""
+
+from types import SimpleNamespace
+
+
+def make_betmode(name: str) -> SimpleNamespace:
+    return SimpleNamespace(get_name=lambda: name, get_distributions=lambda: [])
+
+
+def test_betmode_lookups_share_one_table(make_gamestate):
+    gamestate = make_gamestate(lambda gamestate: False)
+    assert gamestate.get_current_betmode() is gamestate.get_betmode("base")
+
+    bonus = make_betmode("bonus")
+    gamestate.config.bet_modes = gamestate.config.bet_modes + [bonus]
+    assert gamestate.get_betmode("bonus") is bonus
+    gamestate.betmode = "bonus"
+    assert gamestate.get_current_betmode() is bonus
+
+    replaced = make_betmode("bonus")
+    gamestate.config.bet_modes.append(replaced)
+    gamestate.config.bet_modes.remove(bonus)
+    gamestate.betmode = "bonus"
+    assert gamestate.get_current_betmode() is replaced and gamestate.get_betmode("bonus") is replaced
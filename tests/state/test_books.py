@@ -0,0 +1,54 @@
+"""Test event copying and detached event recording in Book."""
+
+import pytest
+from src.state.books import Book
+
+
+def test_add_event_copies_gamestate_objects():
+    book = Book(1, "basegame")
+    positions = [{"reel": 0, "row": 1}]
+    book.add_event({"index": 0, "type": "test", "positions": positions})
+    positions[0]["row"] = 5
+    positions.append({"reel": 1, "row": 1})
+    assert book.events[0]["positions"] == [{"reel": 0, "row": 1}]
+
+
+def test_detached_event_is_not_copied():
+    book = Book(1, "basegame")
+    event = {"index": 0, "type": "test", "amount": 10}
+    book.add_event(event, detached=True)
+    assert book.events[0] is event
+
+
+def test_detached_event_mutation_guard():
+    assert Book.check_detached_events
+    book = Book(1, "basegame")
+    board = [[{"name": "H1"}]]
+    book.add_event({"index": 0, "type": "reveal", "board": board}, detached=True)
+    book.append_book_items(0, {"gameType": "basegame"})
+    assert book.to_json()["events"][0]["gameType"] == "basegame"
+    board[0][0]["name"] = "W"
+    with pytest.raises(RuntimeError):
+        book.to_json()
+
+
+def test_appended_items_are_part_of_detached_snapshot():
+    book = Book(1, "basegame")
+    event = {"index": 0, "type": "reveal", "board": [[{"name": "H1"}]]}
+    book.add_event(event, detached=True)
+    padding = {"top": ["L1"]}
+    book.append_book_items(0, {"paddingPositions": padding})
+    assert book.to_json()["events"][0] is event
+    padding["top"].append("L2")
+    with pytest.raises(RuntimeError):
+        book.to_json()
+
+
+def test_detached_events_unchecked_when_guard_disabled(monkeypatch):
+    monkeypatch.setattr(Book, "check_detached_events", False)
+    book = Book(1, "basegame")
+    board = [[{"name": "H1"}]]
+    book.add_event({"index": 0, "type": "reveal", "board": board}, detached=True)
+    board[0][0]["name"] = "W"
+    assert not book.detached_snapshots
+    assert book.to_json()["events"][0]["board"] == [[{"name": "W"}]]
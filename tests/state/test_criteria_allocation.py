@@ -0,0 +1,50 @@
+"""Test compact criteria allocations and quota splits."""
+
+import pickle
+import random
+
+import pytest
+
+from src.state.criteria_allocation import CriteriaAllocation
+from src.state.run_sims import get_quota_splits
+
+
+def test_allocation_matches_shuffled_list():
+    num_sims_criteria = {"0": 700, "basegame": 250, "freegame": 45, "wincap": 5}
+    random.seed(0)
+    allocation = CriteriaAllocation.from_counts(num_sims_criteria, 990)
+    random.seed(0)
+    expected = [criteria for criteria, count in num_sims_criteria.items() for _ in range(count)]
+    random.shuffle(expected)
+    assert len(allocation) == 990
+    assert [allocation[sim] for sim in range(990)] == expected[:990]
+    assert dict(allocation.items()) == dict(enumerate(expected[:990]))
+    assert allocation.count_criteria() == {c: expected[:990].count(c) for c in num_sims_criteria}
+
+
+def test_shared_chunks_read_the_mapped_file(tmp_path):
+    random.seed(1)
+    allocation = CriteriaAllocation.from_counts({"basegame": 900, "wincap": 100}, 1000)
+    assert allocation.get_chunk(100, 200) == [allocation[sim] for sim in range(100, 200)]
+
+    allocation.share(str(tmp_path / "criteria_base.bin"))
+    chunk = pickle.loads(pickle.dumps(allocation.get_chunk(100, 200)))
+    assert len(pickle.dumps(chunk)) < 200
+    assert len(chunk) == 100
+    assert list(chunk) == [allocation[sim] for sim in range(100, 200)]
+    assert chunk[5] == allocation[105]
+    assert chunk.get_indices() == allocation.indices[100:200]
+
+
+def test_quota_splits():
+    quotas = {"0": 0.4, "basegame": 0.5, "freegame": 0.099, "wincap": 0.001}
+    for num_sims in (7, 100, 999, 10001):
+        splits = get_quota_splits(quotas, num_sims)
+        assert sum(splits.values()) == num_sims
+        assert min(splits.values()) >= 1
+        if num_sims >= 1000:
+            for criteria, quota in quotas.items():
+                assert abs(splits[criteria] - num_sims * quota) < 1
+    assert get_quota_splits({"a": 1, "b": 1, "c": 1}, 10) == {"a": 4, "b": 3, "c": 3}
+    with pytest.raises(RuntimeError):
+        get_quota_splits(quotas, 3)
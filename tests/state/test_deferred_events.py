@@ -0,0 +1,40 @@
+"""Test that deferring events of rejected repeat attempts reproduces the recorded books."""
+
+import random
+
+import pytest
+
+from src.config.config import Config
+
+SIM_CRITERIA = dict.fromkeys(range(20), "basegame")
+
+
+def draw_attempt(gamestate):
+    """Record three draws, accepting the attempt when the last draw exceeds 0.9."""
+    draws = [random.random() for _ in range(3)]
+    gamestate.book.add_event({"index": len(gamestate.book.events), "type": "draw", "values": draws})
+    gamestate.final_win = round(draws[-1], 2)
+    return draws[-1] < 0.9
+
+
+def test_deferred_books_match_recorded_books(make_gamestate, run_books):
+    recorded = make_gamestate(draw_attempt, defer_rejected_events=False)
+    deferred = make_gamestate(draw_attempt, defer_rejected_events=True)
+    assert run_books(deferred, SIM_CRITERIA) == run_books(recorded, SIM_CRITERIA)
+    assert recorded.events_built == recorded.attempts
+    assert deferred.events_built < recorded.events_built
+
+
+def counting_attempt(gamestate):
+    """Pay the number of attempts so far, state which persists between attempts outside of reset_book()."""
+    gamestate.final_win = gamestate.attempts
+    return random.random() < 0.9
+
+
+def test_replay_of_persistent_state_raises(make_gamestate, run_books):
+    with pytest.raises(RuntimeError):
+        run_books(make_gamestate(counting_attempt), SIM_CRITERIA)
+
+
+def test_deferred_events_are_opt_in():
+    assert not Config().defer_rejected_events
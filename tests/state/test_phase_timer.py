@@ -0,0 +1,62 @@
+"""Test counter-based phase timers."""
+
+import pytest
+
+from src.state.phase_timer import (
+    PHASE_TIMERS,
+    detailed_phase,
+    merge_phase_times,
+    summarise_phase_times,
+    take_phase_times,
+    timed_phase,
+)
+
+
+@timed_phase("test_inner")
+def inner(value: int) -> int:
+    return value + 1
+
+
+@timed_phase("test_outer")
+def outer(value: int) -> int:
+    return inner(value) + inner(value)
+
+
+@timed_phase("test_failing")
+def failing() -> None:
+    raise ValueError("failed phase")
+
+
+def test_nested_phases_are_exclusive():
+    take_phase_times()
+    assert outer(1) == 4
+    phase_times = take_phase_times()
+    assert phase_times["test_outer"]["calls"] == 1
+    assert phase_times["test_inner"]["calls"] == 2
+    assert phase_times["test_outer"]["seconds"] >= 0.0
+    assert take_phase_times() == {}
+
+
+def test_phase_recorded_on_exception():
+    take_phase_times()
+    with pytest.raises(ValueError):
+        failing()
+    inner(0)
+    phase_times = take_phase_times()
+    assert phase_times["test_failing"]["calls"] == 1
+    assert phase_times["test_inner"]["calls"] == 1
+
+
+def test_merge_and_summarise():
+    merged = merge_phase_times({}, {"tumble_board": {"calls": 2, "seconds": 3.0}})
+    merge_phase_times(merged, {"tumble_board": {"calls": 1, "seconds": 1.0}, "events": {"calls": 4, "seconds": 1.0}})
+    summary = summarise_phase_times(merged)
+    assert list(summary) == ["tumble_board", "events"]
+    assert summary["tumble_board"] == {"calls": 3, "seconds": 4.0, "share": 0.8}
+
+
+def test_detailed_phases_are_only_wrapped_when_enabled():
+    def emitter():
+        return 1
+
+    assert (detailed_phase("events")(emitter) is emitter) == (PHASE_TIMERS == "coarse")
@@ -0,0 +1,36 @@
+"""Test per-task profiling and merged profile summaries."""
+
+import json
+import os
+
+from src.state.profiling import get_task_profile_name, merge_profiles, run_profiled, summarise_profile
+
+
+def busy_sum(count: int) -> int:
+    return sum(i * i for i in range(count))
+
+
+def test_unprofiled_call_writes_nothing(tmp_path):
+    assert get_task_profile_name(None, "run_sims", 0) is None
+    assert run_profiled(None, busy_sum, 10) == 285
+    assert os.listdir(tmp_path) == []
+
+
+def test_merge_task_profiles(tmp_path):
+    prefix = str(tmp_path / "profile_base")
+    for task_id in range(3):
+        assert run_profiled(get_task_profile_name(prefix, "run_sims", task_id), busy_sum, 1000) == busy_sum(1000)
+    merged_file = str(tmp_path / "merged.prof")
+    stats = merge_profiles(prefix, merged_file)
+    assert os.listdir(tmp_path) == ["merged.prof"]
+
+    summary = summarise_profile(stats, top_n=5)
+    assert summary["profiles_merged"] == 3
+    assert len(summary["by_cumulative_time"]) <= 5
+    busy = [entry for entry in summary["by_cumulative_time"] if entry["function"].endswith("(busy_sum)")]
+    assert busy[0]["calls"] == 3
+    json.dumps(summary)
+
+
+def test_merge_without_profiles(tmp_path):
+    assert merge_profiles(str(tmp_path / "profile_base"), str(tmp_path / "merged.prof")) is None
@@ -0,0 +1,65 @@
+"""Test legacy and counter-based simulation generators."""
+
+import pickle
+import random
+
+import pytest
+
+from src.calculations.statistics import get_random_outcome
+from src.state.rng import ATTEMPT_SEED_STRIDE, CounterRNG, LegacyRNG, get_rng
+
+
+def test_legacy_matches_global_reseeding():
+    rng = LegacyRNG()
+    rng.seed_sim(41)
+    draws = [rng.randrange(0, 100) for _ in range(10)] + [get_random_outcome({1: 1, 2: 3}, rng=rng)]
+    random.seed(42)
+    expected = [random.randrange(0, 100) for _ in range(10)] + [get_random_outcome({1: 1, 2: 3})]
+    assert draws == expected
+
+    rng.seed_attempt(41, 3)
+    draw = rng.random()
+    random.seed(42 * ATTEMPT_SEED_STRIDE + 3)
+    assert draw == random.random()
+
+
+def test_counter_streams_are_keyed():
+    first, second = CounterRNG(), CounterRNG()
+    first.seed_sim(7)
+    draws = [first.randrange(0, 1000) for _ in range(20)]
+    second.seed_sim(8)
+    second.seed_sim(7)
+    assert [second.randrange(0, 1000) for _ in range(20)] == draws
+
+    second.seed_sim(8)
+    assert [second.randrange(0, 1000) for _ in range(20)] != draws
+    second.seed_attempt(7, 1)
+    assert [second.randrange(0, 1000) for _ in range(20)] != draws
+
+
+def test_counter_state_and_pickle():
+    rng = CounterRNG()
+    rng.seed_attempt(3, 2)
+    rng.random()
+    state = rng.getstate()
+    draws = [rng.choice("abcdef"), rng.uniform(0, 5), rng.randint(1, 6), rng.choices([1, 2], [1, 1])[0]]
+    rng.setstate(state)
+    assert [rng.choice("abcdef"), rng.uniform(0, 5), rng.randint(1, 6), rng.choices([1, 2], [1, 1])[0]] == draws
+    restored = pickle.loads(pickle.dumps(rng))
+    assert restored.getstate() == rng.getstate()
+
+
+def test_counter_ranges():
+    rng = CounterRNG()
+    rng.seed_sim(0)
+    assert {rng.randrange(0, 3) for _ in range(200)} == {0, 1, 2}
+    assert all(0.0 <= rng.random() < 1.0 for _ in range(200))
+    assert rng.getrandbits(0) == 0
+    assert 0 <= rng.getrandbits(100) < 1 << 100
+    assert 0 <= rng.randrange(1 << 80) < 1 << 80
+
+
+def test_unknown_mode():
+    assert isinstance(get_rng("legacy"), LegacyRNG)
+    with pytest.raises(RuntimeError):
+        get_rng("philox")
@@ -0,0 +1,49 @@
+"""Test cost-weighted chunk scheduling."""
+
+from array import array
+
+from src.state.criteria_allocation import CriteriaAllocation
+from src.state.scheduler import ChunkScheduler
+
+
+def make_scheduler(num_sims, threads, max_chunk_size):
+    indices = array("B", (1 if 500 <= sim < 600 else 0 for sim in range(num_sims)))
+    sim_allocation = CriteriaAllocation(["basegame", "wincap"], indices)
+    return ChunkScheduler(sim_allocation, num_sims, threads, max_chunk_size, {"betmode": "base"})
+
+
+def drain(scheduler, criteria_cost):
+    tasks = []
+    task = scheduler.next_task()
+    while task is not None:
+        chunk_index, task_args = task
+        criteria_time = {}
+        for criteria in task_args["sim_criteria"]:
+            sims, seconds = criteria_time.get(criteria, (0, 0.0))
+            criteria_time[criteria] = (sims + 1, seconds + criteria_cost[criteria])
+        scheduler.complete(chunk_index, {"criteria_time": criteria_time})
+        tasks.append(task_args)
+        task = scheduler.next_task()
+    return tasks
+
+
+def test_chunks_cover_all_sims_in_order():
+    scheduler = make_scheduler(1003, 4, 50)
+    tasks = drain(scheduler, {"basegame": 1.0, "wincap": 1.0})
+
+    next_sim = 0
+    for chunk_index, task_args in enumerate(tasks):
+        assert task_args["chunk_index"] == chunk_index
+        assert task_args["first_sim"] == next_sim
+        assert 0 < len(task_args["sim_criteria"]) <= 50
+        assert task_args["betmode"] == "base"
+        next_sim += len(task_args["sim_criteria"])
+    assert next_sim == 1003
+    assert len(scheduler.get_results()) == len(tasks)
+
+
+def test_expensive_criteria_reduce_chunk_size():
+    cheap = drain(make_scheduler(2000, 4, 200), {"basegame": 1.0, "wincap": 1.0})
+    heavy = drain(make_scheduler(2000, 4, 200), {"basegame": 1.0, "wincap": 1000.0})
+    assert len(heavy) > len(cheap)
+    assert max(len(task_args["sim_criteria"]) for task_args in heavy if task_args["first_sim"] in range(500, 600)) < 10
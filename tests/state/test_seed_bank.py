@@ -0,0 +1,42 @@
+"""Test that simulations started from a searched seed bank accept the same books as sequential runs."""
+
+import random
+
+from src.state.seed_bank import SeedSearchScheduler
+
+CRITERIA = {"rare": {"seed_search": True}, "common": {}}
+
+
+def rare_attempt(gamestate):
+    """Record a draw, 'rare' attempts are accepted when it exceeds 0.95."""
+    draw = random.random()
+    gamestate.book.add_event({"index": len(gamestate.book.events), "type": "draw", "value": draw})
+    gamestate.final_win = round(draw, 2)
+    return gamestate.criteria == "rare" and draw < 0.95
+
+
+def test_seed_bank_replays_sequential_books(make_gamestate, run_books):
+    sim_criteria = {sim: ("rare" if sim % 3 == 0 else "common") for sim in range(30)}
+    rare_sims = {sim: criteria for sim, criteria in sim_criteria.items() if criteria == "rare"}
+    seed_bank = make_gamestate(rare_attempt, CRITERIA).search_accepting_attempts("base", rare_sims)["seed_bank"]
+    assert sorted(seed_bank) == sorted(rare_sims)
+
+    sequential = make_gamestate(rare_attempt, CRITERIA)
+    banked = make_gamestate(rare_attempt, CRITERIA)
+    assert run_books(banked, sim_criteria, seed_bank) == run_books(sequential, sim_criteria)
+    assert banked.attempts == len(sim_criteria)
+
+
+def test_search_scheduler_covers_all_sims():
+    sim_criteria = {sim: "rare" for sim in range(0, 100, 7)}
+    scheduler = SeedSearchScheduler("base", sim_criteria, threads=2)
+    searched = {}
+    task = scheduler.next_task()
+    while task is not None:
+        task_index, task_args = task
+        assert task_args["betmode"] == "base"
+        searched.update(task_args["sim_criteria"])
+        scheduler.complete(task_index, {"seed_bank": {sim: 0 for sim in task_args["sim_criteria"]}})
+        task = scheduler.next_task()
+    assert searched == sim_criteria
+    assert scheduler.get_results() == {sim: 0 for sim in sim_criteria}
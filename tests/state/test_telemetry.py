@@ -0,0 +1,51 @@
+"""Test per-criteria attempt telemetry."""
+
+import random
+
+from src.state.telemetry import get_repeat_bucket, merge_telemetry, new_criteria_telemetry, summarise_telemetry
+
+
+def rare_attempt(gamestate):
+    """Accept the attempt when a draw exceeds 0.8."""
+    draw = random.random()
+    gamestate.final_win = round(draw, 2)
+    return draw < 0.8
+
+
+def test_repeat_buckets():
+    assert [get_repeat_bucket(r) for r in [0, 1, 2, 3, 4, 7, 8, 1000]] == [
+        "0",
+        "1",
+        "2-3",
+        "2-3",
+        "4-7",
+        "4-7",
+        "8-15",
+        "512-1023",
+    ]
+
+
+def test_gamestate_attempt_telemetry(make_gamestate, run_books):
+    gamestate = make_gamestate(rare_attempt, {"rare": {}})
+    gamestate._telemetry = {}
+    run_books(gamestate, dict.fromkeys(range(25), "rare"))
+    stats = gamestate._telemetry["rare"]
+    assert stats["accepted"] == 25
+    assert stats["attempts"] <= gamestate.attempts  # deferred replays are not counted
+    assert stats["attempts"] > stats["accepted"]
+    assert sum(stats["repeat_histogram"].values()) == 25
+    assert stats["rejected_seconds"] > 0
+
+
+def test_merge_and_summarise():
+    first, second = new_criteria_telemetry(), new_criteria_telemetry()
+    first.update({"attempts": 3, "accepted": 1, "accepted_seconds": 1.0, "rejected_seconds": 3.0})
+    first["repeat_histogram"] = {"2-3": 1}
+    second.update({"attempts": 1, "accepted": 1, "accepted_seconds": 1.0, "rejected_seconds": 0.0})
+    second["repeat_histogram"] = {"0": 1}
+    merged = merge_telemetry(merge_telemetry({}, {"wincap": first}), {"wincap": second})
+    summary = summarise_telemetry(merged)["wincap"]
+    assert summary["attempts"] == 4 and summary["accepted"] == 2 and summary["rejected"] == 2
+    assert summary["attempts_per_accepted"] == 2.0
+    assert summary["rejected_time_share"] == 0.6
+    assert list(summary["repeat_histogram"].items()) == [("0", 1), ("2-3", 1)]
@@ -0,0 +1,97 @@
+"""
+Reference cluster detection (the recursive implementation Cluster.get_clusters() replaced) and boards drawn from the
+0_0_cluster and crazy_lab reelstrips, shared by the cluster tests and utils/benchmarks/cluster_detection.py.
+"""
+
+import os
+import random
+from collections import defaultdict
+from types import SimpleNamespace
+
+from src.config.paths import PATH_TO_GAMES
+
+BENCHMARK_BOARDS = {
+    "0_0_cluster": ("BR0.csv", [7] * 7),
+    "crazy_lab": ("BR0.csv", [7] * 7),
+}
+
+
+def legacy_get_neighbours(board, reel, row, local_checked):
+    """Recursive-search neighbour lookup, as previously implemented in Cluster."""
+    neighbours = []
+    if reel > 0:
+        if (reel - 1, row) not in local_checked:
+            neighbours += [(reel - 1, row)]
+            local_checked += [(reel - 1, row)]
+    if reel < len(board) - 1:
+        if (reel + 1, row) not in local_checked:
+            neighbours += [(reel + 1, row)]
+            local_checked += [(reel + 1, row)]
+    if row > 0:
+        if (reel, row - 1) not in local_checked:
+            neighbours += [(reel, row - 1)]
+            local_checked += [(reel, row - 1)]
+    if row < len(board[reel]) - 1:
+        if (reel, row + 1) not in local_checked:
+            neighbours += [(reel, row + 1)]
+            local_checked += [(reel, row + 1)]
+    return neighbours
+
+
+def legacy_check_all_neighbours(board, already_checked, local_checked, potential_cluster, reel, row, og_symbol):
+    """Recursive like-symbol search, as previously implemented in Cluster."""
+    neighbours = legacy_get_neighbours(board, reel, row, local_checked)
+    for reel_, row_ in neighbours:
+        if og_symbol == board[reel_][row_].name:
+            potential_cluster += [(reel_, row_)]
+            already_checked += [(reel_, row_)]
+            legacy_check_all_neighbours(
+                board, already_checked, local_checked, potential_cluster, reel_, row_, og_symbol
+            )
+
+
+def legacy_get_clusters(board) -> dict:
+    """Reference (recursive, list-scanning) cluster detection."""
+    already_checked = []
+    clusters = defaultdict(list)
+    for reel, _ in enumerate(board):
+        for row, _ in enumerate(board[reel]):
+            if (reel, row) not in already_checked:
+                potential_cluster = [(reel, row)]
+                already_checked += [(reel, row)]
+                local_checked = [(reel, row)]
+                symbol = board[reel][row].name
+                legacy_check_all_neighbours(
+                    board, already_checked, local_checked, potential_cluster, reel, row, symbol
+                )
+                clusters[symbol].append(potential_cluster)
+    return clusters
+
+
+def load_reelstrip(game_id: str, filename: str) -> list:
+    """Reelstrip columns from a game's reel csv file."""
+    reels = []
+    with open(os.path.join(PATH_TO_GAMES, game_id, "reels", filename), "r", encoding="UTF-8") as f:
+        for line in f:
+            for reel, name in enumerate(line.strip().split(",")):
+                if reel == len(reels):
+                    reels.append([])
+                reels[reel].append(name.strip())
+    return reels
+
+
+def draw_boards(game_id: str, num_boards: int, seed: int = 0) -> list:
+    """Random boards (of objects with a .name attribute) drawn from reelstrip stop positions."""
+    filename, num_rows = BENCHMARK_BOARDS[game_id]
+    reels = load_reelstrip(game_id, filename)
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(num_boards):
+        board = []
+        for reel, rows in enumerate(num_rows):
+            stop = rng.randrange(len(reels[reel]))
+            board.append(
+                [SimpleNamespace(name=reels[reel][(stop + row) % len(reels[reel])]) for row in range(rows)]
+            )
+        boards.append(board)
+    return boards
@@ -1,8 +1,10 @@
 """Test basic cluster-calculation functionality."""
 
+from types import SimpleNamespace
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.cluster import Cluster
+from tests.win_calculations.cluster_reference import BENCHMARK_BOARDS, draw_boards, legacy_get_clusters
 
 
 class GameClusterConfig:
@@ -99,3 +101,12 @@ def test_basic_cluster(gamestate):
         clusters=clusters,
     )
     assert total_win == gamestate.config.paytable[(9, "H1")]
+
+
+def test_cluster_order_matches_recursive_search():
+    for game_id in BENCHMARK_BOARDS:
+        for board in draw_boards(game_id, 200, seed=7):
+            assert list(Cluster.get_clusters(board).items()) == list(legacy_get_clusters(board).items())
+
+    uniform_board = [[SimpleNamespace(name="H1") for _ in range(7)] for _ in range(7)]
+    assert list(Cluster.get_clusters(uniform_board).items()) == list(legacy_get_clusters(uniform_board).items())
@@ -0,0 +1,45 @@
+"""Test streamed book output."""
+
+import json
+import zstandard as zstd
+from src.write_data.book_writer import BookWriter
+
+
+def sample_books(num_books):
+    return [
+        {
+            "id": idx + 1,
+            "payoutMultiplier": idx * 10,
+            "events": [{"index": 0, "type": "reveal", "board": [[idx]]}, {"index": 1, "type": "finalWin", "amount": 0}],
+            "criteria": "basegame",
+            "baseGameWins": 0.0,
+            "freeGameWins": 0.0,
+        }
+        for idx in range(num_books)
+    ]
+
+
+def test_compressed_stream(tmp_path):
+    books = sample_books(5)
+    filename = str(tmp_path / "books.jsonl.zst")
+    writer = BookWriter(filename)
+    for book in books:
+        writer.write_book(book)
+    writer.close()
+
+    with open(filename, "rb") as f:
+        data = zstd.ZstdDecompressor().decompressobj().decompress(f.read()).decode("UTF-8")
+    assert data == "\n".join(json.dumps(book) for book in books) + "\n"
+    assert writer.event_items["reveal"] == {"type": "reveal", "board": [[0]]}
+
+
+def test_regular_json_stream(tmp_path):
+    books = sample_books(3)
+    filename = str(tmp_path / "books.json")
+    writer = BookWriter(filename, output_regular_json=True)
+    for book in books:
+        writer.write_book(book)
+    writer.close()
+
+    with open(filename, "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps(books)
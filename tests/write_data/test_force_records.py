@@ -0,0 +1,79 @@
+"""Test binary force-record chunks and their streamed merge."""
+
+import json
+from src.write_data.force_records import merge_force_tables, write_force_chunk, write_force_record
+
+
+def sample_chunks():
+    return [
+        {
+            (("kind", "3"), ("symbol", "H1")): {"timesTriggered": 2, "bookIds": [1, 5]},
+            (("gametype", "basegame"), ("symbol", "scatter")): {"timesTriggered": 1, "bookIds": [3]},
+        },
+        {
+            (("kind", "5"), ("symbol", "L1")): {"timesTriggered": 1, "bookIds": [7]},
+            (("kind", "3"), ("symbol", "H1")): {"timesTriggered": 3, "bookIds": [8, 300, 70000]},
+        },
+    ]
+
+
+def expected_force_record(chunks):
+    combined = {}
+    for chunk in chunks:
+        for description, details in chunk.items():
+            if description in combined:
+                combined[description]["timesTriggered"] += details["timesTriggered"]
+                combined[description]["bookIds"] += details["bookIds"]
+            else:
+                combined[description] = {"timesTriggered": details["timesTriggered"], "bookIds": list(details["bookIds"])}
+    return json.dumps(
+        [
+            {
+                "search": [{"name": key, "value": val} for key, val in description],
+                "timesTriggered": details["timesTriggered"],
+                "bookIds": details["bookIds"],
+            }
+            for description, details in combined.items()
+        ],
+        indent=4,
+    )
+
+
+def test_force_record_merge_matches_json_layout(tmp_path):
+    chunks = sample_chunks()
+    file_list = []
+    for chunk_index, recorded_events in enumerate(chunks):
+        filename = str(tmp_path / f"force_{chunk_index}.bin")
+        write_force_chunk(recorded_events, filename)
+        file_list.append(filename)
+
+    merged = merge_force_tables(file_list)
+    assert [description for description, _, _ in merged] == [
+        (("kind", "3"), ("symbol", "H1")),
+        (("gametype", "basegame"), ("symbol", "scatter")),
+        (("kind", "5"), ("symbol", "L1")),
+    ]
+
+    output_path = str(tmp_path / "force_record_base.json")
+    write_force_record(merged, output_path)
+    with open(output_path, "r", encoding="UTF-8") as f:
+        assert f.read() == expected_force_record(chunks)
+
+
+def test_empty_force_record(tmp_path):
+    filename = str(tmp_path / "force_0.bin")
+    write_force_chunk({}, filename)
+    output_path = str(tmp_path / "force_record_base.json")
+    write_force_record(merge_force_tables([filename]), output_path)
+    with open(output_path, "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps([], indent=4)
+
+
+def test_out_of_order_book_ids(tmp_path):
+    chunks = [{(("kind", "3"),): {"timesTriggered": 3, "bookIds": [40, 2, 300]}}]
+    filename = str(tmp_path / "force_0.bin")
+    write_force_chunk(chunks[0], filename)
+    output_path = str(tmp_path / "force_record_base.json")
+    write_force_record(merge_force_tables([filename]), output_path)
+    with open(output_path, "r", encoding="UTF-8") as f:
+        assert f.read() == expected_force_record(chunks)
@@ -0,0 +1,47 @@
+"""Test streaming merges of temporary book files."""
+
+import json
+import zstandard as zstd
+from src.write_data.book_writer import BookWriter
+from src.write_data.write_data import merge_compressed_books, merge_regular_json_books
+from tests.write_data.test_book_writer import sample_books
+
+
+def write_chunks(tmp_path, books, extension, output_regular_json=False):
+    file_list, num_bytes = [], 0
+    for chunk_index, first_book in enumerate(range(0, len(books), 3)):
+        filename = str(tmp_path / f"books_{chunk_index}{extension}")
+        writer = BookWriter(filename, output_regular_json=output_regular_json)
+        for book in books[first_book : first_book + 3]:
+            writer.write_book(book)
+        writer.close()
+        file_list.append(filename)
+        num_bytes += writer.num_bytes
+    return file_list, num_bytes
+
+
+def test_merge_compressed_books(tmp_path):
+    books = sample_books(10)
+    file_list, num_bytes = write_chunks(tmp_path, books, ".jsonl.zst")
+    output_path = str(tmp_path / "books.jsonl.zst")
+    merge_compressed_books(file_list, output_path, num_bytes)
+
+    with open(output_path, "rb") as f:
+        compressed = f.read()
+    assert zstd.frame_content_size(compressed) == num_bytes
+    assert zstd.ZstdDecompressor().decompress(compressed).decode("UTF-8") == "".join(
+        json.dumps(book) + "\n" for book in books
+    )
+
+
+def test_merge_regular_json_books(tmp_path):
+    books = sample_books(10)
+    file_list, _ = write_chunks(tmp_path, books, ".json", output_regular_json=True)
+    output_path = str(tmp_path / "books.json")
+    merge_regular_json_books(file_list, output_path)
+
+    chunks = [json.dumps(books[first_book : first_book + 3])[1:-1] for first_book in range(0, len(books), 3)]
+    with open(output_path, "r", encoding="UTF-8") as f:
+        merged = f.read()
+    assert merged == "[" + ",".join(chunks) + "]"
+    assert json.loads(merged) == books
@@ -0,0 +1,100 @@
+"""
+Board sampling benchmark: time per initial board of every bet mode criteria with config.board_sampling set to
+"rejection" and "conditioned". Forced-freegame criteria (i.e freegame and wincap) go through force_special_board(),
+other criteria redraw basegame boards until there are fewer scatters than the freegame trigger.
+Boards per draw counts the boards built per accepted board (1.0 for the conditioned sampler), from the detailed
+phase timers which are enabled in the benchmark processes.
+
+Usage: python -m utils.benchmarks.board_sampling [--games ...] [--draws 2000]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from contextlib import redirect_stdout
+from time import perf_counter
+
+from src.config.paths import PROJECT_PATH
+from src.state.phase_timer import take_phase_times
+from utils.benchmarks.simulation_suite import BENCHMARK_GAMES, RESULT_MARKER, load_game
+
+BOARD_SAMPLING_MODES = ("rejection", "conditioned")
+DEFAULT_DRAWS = 2000
+
+
+def time_board_draws(gamestate: object, mode: str, draws: int) -> dict:
+    """Time 'draws' initial boards of the current bet mode and criteria, after one untimed warm-up draw."""
+    gamestate.config.board_sampling = mode
+    gamestate.reset_seed(0)
+    gamestate.reset_book()
+    gamestate.draw_board(emit_event=False)
+    take_phase_times()
+    start = perf_counter()
+    for _ in range(draws):
+        gamestate.draw_board(emit_event=False)
+    seconds = perf_counter() - start
+    boards = take_phase_times().get("create_board_reelstrips", {"calls": 0})["calls"]
+    return {"us_per_draw": round(1e6 * seconds / draws, 1), "boards_per_draw": round(boards / draws, 3)}
+
+
+def run_game_board_benchmark(game_id: str, draws: int) -> dict:
+    """{betmode: {criteria: {mode: timing}}} for every criteria of a game."""
+    config, gamestate = load_game(game_id)
+    results = {}
+    for betmode in config.bet_modes:
+        gamestate.betmode = betmode.get_name()
+        for distribution in betmode.get_distributions():
+            gamestate.criteria = distribution.get_criteria()
+            timings = {mode: time_board_draws(gamestate, mode, draws) for mode in BOARD_SAMPLING_MODES}
+            timings["speedup"] = round(timings["rejection"]["us_per_draw"] / timings["conditioned"]["us_per_draw"], 2)
+            results.setdefault(betmode.get_name(), {})[distribution.get_criteria()] = timings
+    return results
+
+
+def run_game_in_subprocess(game_id: str, draws: int) -> dict:
+    """Benchmark a single game in a fresh interpreter (games import their modules by bare name)."""
+    command = [sys.executable, "-m", "utils.benchmarks.board_sampling", "--worker", game_id, "--draws", str(draws)]
+    env = dict(os.environ, PHASE_TIMERS="detailed")
+    completed = subprocess.run(command, cwd=PROJECT_PATH, env=env, capture_output=True, text=True, check=False)
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER) :])
+    return {"error": (completed.stderr or completed.stdout).strip().splitlines()[-10:]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rejection vs conditioned board sampling.")
+    parser.add_argument("--games", nargs="+", default=list(BENCHMARK_GAMES), choices=list(BENCHMARK_GAMES))
+    parser.add_argument("--draws", type=int, default=DEFAULT_DRAWS)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        with redirect_stdout(sys.stderr):
+            result = run_game_board_benchmark(args.worker, args.draws)
+        print(RESULT_MARKER + json.dumps(result))
+        return 0
+
+    failed = 0
+    for game_id in args.games:
+        result = run_game_in_subprocess(game_id, args.draws)
+        if "error" in result:
+            failed += 1
+            print(game_id, "failed:\n" + "\n".join(result["error"]))
+            continue
+        for betmode, criteria_timings in result.items():
+            for criteria, timings in criteria_timings.items():
+                rejection, conditioned = timings["rejection"], timings["conditioned"]
+                print(
+                    f"{game_id:14} {betmode:12} {criteria:10}",
+                    f"rejection {rejection['us_per_draw']:8}us ({rejection['boards_per_draw']} boards)",
+                    f"conditioned {conditioned['us_per_draw']:8}us",
+                    f"x{timings['speedup']}",
+                )
+    return 1 if failed > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Micro-benchmark of Cluster.get_clusters() against the previous recursive implementation.
+Boards are drawn from the 0_0_cluster and crazy_lab reelstrips (tests/win_calculations/cluster_reference.py).
+
+Usage: python -m utils.benchmarks.cluster_detection [num_boards]
+"""
+
+import sys
+import timeit
+
+from src.calculations.cluster import Cluster
+from tests.win_calculations.cluster_reference import BENCHMARK_BOARDS, draw_boards, legacy_get_clusters
+
+
+def run_benchmark(num_boards: int = 2000) -> dict:
+    """Time both implementations over the same boards and confirm identical output."""
+    results = {}
+    for game_id in BENCHMARK_BOARDS:
+        boards = draw_boards(game_id, num_boards)
+        for board in boards:
+            assert Cluster.get_clusters(board) == legacy_get_clusters(board), "Cluster outputs differ."
+        legacy = min(timeit.repeat(lambda: [legacy_get_clusters(b) for b in boards], number=1, repeat=3))
+        current = min(timeit.repeat(lambda: [Cluster.get_clusters(b) for b in boards], number=1, repeat=3))
+        results[game_id] = {
+            "boards": num_boards,
+            "legacy_us_per_board": round(1e6 * legacy / num_boards, 2),
+            "current_us_per_board": round(1e6 * current / num_boards, 2),
+            "speedup": round(legacy / current, 2),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_results = run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
+    for game, res in benchmark_results.items():
+        print(game, res)
@@ -0,0 +1,73 @@
+"""
+Compare book event recording against the previous deepcopy-per-event implementation on crazy_lab simulations.
+Reports run-time and the number of containers (dicts/lists) allocated by copying events into books.
+
+Usage: python -m utils.benchmarks.event_recording [num_sims]
+"""
+
+import sys
+from copy import deepcopy
+from time import perf_counter
+
+from src.state.books import Book, copy_json
+from games.crazy_lab.game_config import GameConfig
+from games.crazy_lab.gamestate import GameState
+
+
+def count_containers(value) -> int:
+    """Number of dict/list objects in a JSON-like structure."""
+    if isinstance(value, dict):
+        return 1 + sum(count_containers(val) for val in value.values())
+    if isinstance(value, list):
+        return 1 + sum(count_containers(val) for val in value)
+    return 0
+
+
+def run_sims(gamestate, betmode: str, num_sims: int, legacy: bool) -> dict:
+    """Run simulations, counting the containers copied by Book.add_event()."""
+    copied = {"containers": 0, "events": 0}
+
+    def legacy_add_event(book, event, detached=False):
+        copied["containers"] += count_containers(event)
+        copied["events"] += 1
+        book.events.append(deepcopy(event))
+
+    def current_add_event(book, event, detached=False):
+        if not detached:
+            copied["containers"] += count_containers(event)
+        copied["events"] += 1
+        if not detached:
+            event = copy_json(event)
+        book.events.append(event)
+
+    original_add_event = Book.add_event
+    Book.add_event = legacy_add_event if legacy else current_add_event
+    try:
+        gamestate.betmode = betmode
+        criteria = [d._criteria for d in gamestate.get_current_betmode().get_distributions()]
+        start = perf_counter()
+        for sim in range(num_sims):
+            gamestate.criteria = criteria[sim % len(criteria)]
+            gamestate.run_spin(sim)
+        elapsed = perf_counter() - start
+    finally:
+        Book.add_event = original_add_event
+    return {"seconds": round(elapsed, 3), **copied}
+
+
+def run_benchmark(num_sims: int = 200, betmode: str = "base") -> dict:
+    """Run the same simulations with legacy and detached event recording."""
+    gamestate = GameState(GameConfig())
+    legacy = run_sims(gamestate, betmode, num_sims, legacy=True)
+    current = run_sims(gamestate, betmode, num_sims, legacy=False)
+    return {
+        "sims": num_sims,
+        "legacy": legacy,
+        "current": current,
+        "containers_saved": legacy["containers"] - current["containers"],
+        "speedup": round(legacy["seconds"] / max(current["seconds"], 1e-9), 2),
+    }
+
+
+if __name__ == "__main__":
+    print(run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
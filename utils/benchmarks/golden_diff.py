@@ -0,0 +1,241 @@
+"""
+Golden-book differential harness.
+Runs a sample of simulation ids per bet mode through a reference and a candidate code path, and structurally
+compares the resulting books, lookup-table rows and force-record descriptions of every simulation.
+The first divergence is reported by bet mode, sim id, event index and the path of the differing field.
+
+Paths are registered in DIFF_PATHS. The reference can also be a golden file recorded earlier (i.e on the
+main branch) with --record, which is then compared against the candidate path with --golden.
+
+Usage:
+    python -m utils.benchmarks.golden_diff <game_id> [--sample 200] [--reference reference] [--candidate current]
+    python -m utils.benchmarks.golden_diff <game_id> --record golden.jsonl
+    python -m utils.benchmarks.golden_diff <game_id> --golden golden.jsonl
+"""
+
+import sys
+import json
+import random
+import argparse
+from itertools import zip_longest
+from contextlib import contextmanager, nullcontext
+
+from src.state.books import Book
+from src.state.run_sims import assign_sim_criteria, get_sim_splits
+from src.wins.win_manager import WinManager
+from utils.benchmarks.simulation_suite import load_game
+
+DEFAULT_SAMPLE = 200
+DEFAULT_NUM_SIMS = 10000
+SAMPLE_SEED = 0
+
+
+@contextmanager
+def reference_path(gamestate: object):
+    """
+    Unoptimised recording: every attempt is played to completion (abort conditions are not evaluated) and builds
+    its own events, and detached events are verified unchanged.
+    """
+    defer_rejected_events = gamestate.config.defer_rejected_events
+    check_detached_events = Book.check_detached_events
+    gamestate.config.defer_rejected_events = False
+    gamestate.check_abort_conditions = lambda: None
+    Book.check_detached_events = True
+    try:
+        yield
+    finally:
+        gamestate.config.defer_rejected_events = defer_rejected_events
+        del gamestate.check_abort_conditions
+        Book.check_detached_events = check_detached_events
+
+
+def current_path(gamestate: object):
+    """The game as configured."""
+    return nullcontext()
+
+
+DIFF_PATHS = {
+    "reference": reference_path,
+    "current": current_path,
+}
+
+
+class BookCollector:
+    """In-memory stand-in for BookWriter, keeping the last imprinted book."""
+
+    def __init__(self):
+        self.book = None
+
+    def write_book(self, book: dict) -> None:
+        """Store a JSON round-trip of the book, so tuples and lists compare as they are written."""
+        self.book = json.loads(json.dumps(book))
+
+
+def get_sample_sims(gamestate: object, betmode: str, sample: int, num_sims: int = DEFAULT_NUM_SIMS) -> dict:
+    """
+    Criteria allocation of a num_sims run of 'betmode' (as run_multi_process_sims() assigns it),
+    reduced to a fixed random sample of sim ids {sim: criteria}.
+    """
+    sim_allocation = assign_sim_criteria(get_sim_splits(gamestate, num_sims, betmode), num_sims)
+    sims = sorted(random.Random(SAMPLE_SEED).sample(range(len(sim_allocation)), min(sample, len(sim_allocation))))
+    return {sim: sim_allocation[sim] for sim in sims}
+
+
+def run_sim_records(gamestate: object, betmode: str, sim_criteria: dict):
+    """Yield the book, lookup row and force descriptions of each simulation, without writing any files."""
+    gamestate.win_manager = WinManager(gamestate.config.basegame_type, gamestate.config.freegame_type)
+    gamestate.library = {}
+    gamestate.temp_wins = []
+    gamestate.betmode = betmode
+    gamestate.book_writer = BookCollector()
+    for sim, criteria in sim_criteria.items():
+        gamestate.criteria = criteria
+        gamestate.recorded_events = {}
+        gamestate.run_sim(sim)
+        lookup = gamestate.library.pop(sim + 1)
+        yield {
+            "betmode": betmode,
+            "sim": sim,
+            "book": gamestate.book_writer.book,
+            "lookup": [lookup["id"], 1, lookup["payoutMultiplier"]],
+            "force": sorted(json.loads(json.dumps(description)) for description in gamestate.recorded_events),
+        }
+    gamestate.book_writer = None
+
+
+def run_path(game_id: str, path_name: str, sims_per_betmode: dict):
+    """Run the sampled simulations of every bet mode on a fresh gamestate through the named path."""
+    _, gamestate = load_game(game_id)
+    with DIFF_PATHS[path_name](gamestate):
+        for betmode, sim_criteria in sims_per_betmode.items():
+            yield from run_sim_records(gamestate, betmode, sim_criteria)
+
+
+def find_first_difference(reference, candidate, path: str = ""):
+    """
+    Depth-first structural comparison, returning (path, reference value, candidate value) of the first
+    difference or None. Types and dict key order are compared too, as both change the written bytes.
+    """
+    if type(reference) is not type(candidate):
+        return path, reference, candidate
+    if isinstance(reference, dict):
+        if list(reference) != list(candidate):
+            return f"{path}.keys()", list(reference), list(candidate)
+        for key, value in reference.items():
+            difference = find_first_difference(value, candidate[key], f"{path}.{key}")
+            if difference is not None:
+                return difference
+        return None
+    if isinstance(reference, list):
+        for index, (ref_item, cand_item) in enumerate(zip(reference, candidate)):
+            difference = find_first_difference(ref_item, cand_item, f"{path}[{index}]")
+            if difference is not None:
+                return difference
+        if len(reference) != len(candidate):
+            return f"{path}.length", len(reference), len(candidate)
+        return None
+    if reference != candidate:
+        return path, reference, candidate
+    return None
+
+
+def diff_records(reference: dict, candidate: dict):
+    """First divergence between the records of the same simulation, checking lookup, force and book in turn."""
+    for part in ("lookup", "force", "book"):
+        difference = find_first_difference(reference[part], candidate[part], part)
+        if difference is not None:
+            field, ref_value, cand_value = difference
+            event_index = None
+            if field.startswith("book.events["):
+                event_index = int(field[len("book.events[") : field.index("]")])
+            return {
+                "betmode": reference["betmode"],
+                "sim": reference["sim"],
+                "book_id": reference["sim"] + 1,
+                "event_index": event_index,
+                "field": field,
+                "reference": ref_value,
+                "candidate": cand_value,
+            }
+    return None
+
+
+def compare_records(reference_records, candidate_records) -> dict:
+    """
+    Compare two record streams sim by sim, returning the number of simulations compared per bet mode
+    and the first divergence (None if every record is identical).
+    """
+    compared = {}
+    for reference, candidate in zip_longest(reference_records, candidate_records):
+        reference_key = None if reference is None else [reference["betmode"], reference["sim"]]
+        candidate_key = None if candidate is None else [candidate["betmode"], candidate["sim"]]
+        if reference_key != candidate_key:
+            return {
+                "compared": compared,
+                "first_divergence": {"field": "sim", "reference": reference_key, "candidate": candidate_key},
+            }
+        divergence = diff_records(reference, candidate)
+        if divergence is not None:
+            return {"compared": compared, "first_divergence": divergence}
+        compared[reference["betmode"]] = compared.get(reference["betmode"], 0) + 1
+    return {"compared": compared, "first_divergence": None}
+
+
+def read_golden(filename: str):
+    """Stream records from a golden file written by write_golden()."""
+    with open(filename, "r", encoding="UTF-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def write_golden(records, filename: str) -> int:
+    """Write records as json lines, returning the number written."""
+    count = 0
+    with open(filename, "w", encoding="UTF-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+def get_sims_per_betmode(game_id: str, betmodes: list, sample: int, num_sims: int) -> dict:
+    """Sampled {betmode: {sim: criteria}} for the requested (or all) bet modes of a game."""
+    config, gamestate = load_game(game_id)
+    betmodes = betmodes or [betmode.get_name() for betmode in config.bet_modes]
+    return {betmode: get_sample_sims(gamestate, betmode, sample, num_sims) for betmode in betmodes}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Differential book comparison between two code paths.")
+    parser.add_argument("game_id")
+    parser.add_argument("--betmodes", nargs="+")
+    parser.add_argument("--sample", type=int, default=DEFAULT_SAMPLE, help="sims sampled per bet mode")
+    parser.add_argument("--num-sims", type=int, default=DEFAULT_NUM_SIMS, help="run size the sample is drawn from")
+    parser.add_argument("--reference", default="reference", choices=list(DIFF_PATHS))
+    parser.add_argument("--candidate", default="current", choices=list(DIFF_PATHS))
+    parser.add_argument("--record", help="write the reference path records to a golden file and exit")
+    parser.add_argument("--golden", help="compare the candidate path against a recorded golden file")
+    args = parser.parse_args()
+
+    sims_per_betmode = get_sims_per_betmode(args.game_id, args.betmodes, args.sample, args.num_sims)
+    if args.record is not None:
+        count = write_golden(run_path(args.game_id, args.reference, sims_per_betmode), args.record)
+        print("Recorded", count, "simulations to", args.record)
+        return 0
+
+    if args.golden is not None:
+        reference_records = read_golden(args.golden)
+    else:
+        # paths may change process-wide settings, so the reference is run to completion before the candidate
+        reference_records = list(run_path(args.game_id, args.reference, sims_per_betmode))
+    result = compare_records(reference_records, run_path(args.game_id, args.candidate, sims_per_betmode))
+    print("Compared", result["compared"])
+    if result["first_divergence"] is not None:
+        print("First divergence:", json.dumps(result["first_divergence"], indent=4))
+        return 1
+    print("Books, lookup rows and force records are identical.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Reproducible end-to-end simulation benchmark over the sample games.
+Every game runs in its own process with fixed simulation counts. Simulations are seeded by their index and
+PYTHONHASHSEED is fixed, so each run performs identical work. Simulation, merge (lookup/force/book files) and
+verification (book and lookup payout checks) are measured separately: wall-time, sims/sec and peak RSS,
+together with the per-phase breakdown from the phase timers (--detailed-phases adds per-call phases). fifty_fifty has no win evaluation and
+measures the framework overhead, the sims/sec of every other game is also reported relative to it.
+
+Results are written as json and compared against a stored baseline, timings or peak RSS above
+the baseline by more than the tolerance are flagged as regressions. A missing baseline fails the run, unless
+--update-baseline is passed to create it (baselines are machine specific, so none is committed).
+Note: outputs are written to games/<game_id>/library, as with a regular run.py.
+
+Usage: python -m utils.benchmarks.simulation_suite [--games ...] [--scale 1.0] [--baseline file] [--update-baseline]
+       [--detailed-phases]
+"""
+
+import os
+import sys
+import json
+import shutil
+import resource
+import argparse
+import platform
+import importlib
+import subprocess
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from time import perf_counter
+
+from src.config.paths import PATH_TO_GAMES, PROJECT_PATH
+from src.state.phase_timer import merge_phase_times, summarise_phase_times, take_phase_times
+from src.state.run_sims import run_multi_process_sims
+from src.state.worker_pool import WorkerPool
+from src.write_data.write_data import output_lookup_and_force_files
+from utils.rgs_verification import compare_payout_values, verify_books_and_payout_mults, verify_lookup_format
+
+FRAMEWORK_BASELINE_GAME = "fifty_fifty"
+BENCHMARK_GAMES = {
+    "fifty_fifty": {"base": 20000},
+    "0_0_lines": {"base": 2000, "bonus": 200},
+    "0_0_ways": {"base": 2000, "bonus": 200},
+    "0_0_cluster": {"base": 1000, "bonus": 100},
+    "0_0_scatter": {"base": 1000, "bonus": 100},
+    "0_0_expwilds": {"base": 1000, "bonus": 100, "superspin": 100},
+    "crazy_lab": {"base": 500, "bonus": 50, "super_bonus": 50},
+}
+BENCHMARK_STAGES = ("simulation", "merge", "verification")
+BENCHMARK_BATCH_SIZE = 1000
+RESULTS_FILE = os.path.join(PROJECT_PATH, "utils", "benchmarks", "simulation_results.json")
+BASELINE_FILE = os.path.join(PROJECT_PATH, "utils", "benchmarks", "simulation_baseline.json")
+DEFAULT_TOLERANCE = 0.15
+MIN_REGRESSION = {"seconds": 0.05, "peak_rss_mb": 5.0}
+RESULT_MARKER = "BENCHMARK_RESULT "
+
+
+def get_peak_rss_mb() -> float:
+    """Peak resident set size of this process (since the last reset_peak_rss(), where supported)."""
+    try:
+        with open("/proc/self/status", "r", encoding="UTF-8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel peak RSS counter (Linux only), returns False if peak RSS is cumulative."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="UTF-8") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class StageRecorder:
+    """Accumulate wall-time and peak RSS of each benchmark stage."""
+
+    def __init__(self):
+        self.stages = {stage: {"seconds": 0.0, "peak_rss_mb": 0.0} for stage in BENCHMARK_STAGES}
+        self.rss_resettable = True
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Time a block of work and record the peak RSS reached within it."""
+        self.rss_resettable = reset_peak_rss() and self.rss_resettable
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage]["seconds"] += perf_counter() - start
+            self.stages[stage]["peak_rss_mb"] = max(self.stages[stage]["peak_rss_mb"], get_peak_rss_mb())
+
+
+def load_game(game_id: str):
+    """Import a sample game's config and gamestate, supporting both bare and package imports within games."""
+    sys.path.insert(0, os.path.join(PATH_TO_GAMES, game_id))
+    config = importlib.import_module(f"games.{game_id}.game_config").GameConfig()
+    gamestate = importlib.import_module(f"games.{game_id}.gamestate").GameState(config)
+    return config, gamestate
+
+
+def verify_betmode(gamestate: object, betmode: str) -> None:
+    """Check books against the merged lookup table, as the RGS verification does before upload."""
+    _, lut_payouts, _, _, _ = verify_lookup_format(gamestate.output_files.get_final_lookup_name(betmode))
+    book_payouts, _ = verify_books_and_payout_mults(gamestate.output_files.get_final_book_name(betmode, True))
+    compare_payout_values(book_payouts, lut_payouts)
+
+
+def run_game_benchmark(game_id: str, num_sim_args: dict, threads: int = 1) -> dict:
+    """Simulate, merge and verify every bet mode of a game, measuring each stage separately."""
+    config, gamestate = load_game(game_id)
+    recorder = StageRecorder()
+    phases = {}
+    take_phase_times()
+    with WorkerPool(gamestate, threads) if threads > 1 else nullcontext() as pool:
+        for betmode, num_sims in num_sim_args.items():
+            gamestate.betmode = betmode
+            with recorder.measure("simulation"):
+                chunk_results = run_multi_process_sims(
+                    threads,
+                    BENCHMARK_BATCH_SIZE,
+                    config.game_id,
+                    betmode,
+                    gamestate,
+                    num_sims=num_sims,
+                    compress=True,
+                    write_event_list=config.write_event_list,
+                    pool=pool,
+                )
+            with recorder.measure("merge"):
+                output_lookup_and_force_files(chunk_results, config.game_id, betmode, gamestate, compress=True)
+            with recorder.measure("verification"):
+                verify_betmode(gamestate, betmode)
+            phase_times = merge_phase_times(gamestate.simulation_telemetry[betmode]["phases"], take_phase_times())
+            phases[betmode] = summarise_phase_times(phase_times)
+    shutil.rmtree(gamestate.output_files.temp_path)
+
+    total_sims = sum(num_sim_args.values())
+    stages = {}
+    for stage, measured in recorder.stages.items():
+        stages[stage] = {
+            "seconds": round(measured["seconds"], 4),
+            "sims_per_second": round(total_sims / measured["seconds"], 1) if measured["seconds"] > 0 else None,
+            "peak_rss_mb": round(measured["peak_rss_mb"], 1),
+        }
+    return {
+        "sims": dict(num_sim_args),
+        "threads": threads,
+        "stages": stages,
+        "peak_rss_per_stage": recorder.rss_resettable,
+        "phases": phases,
+    }
+
+
+def run_game_in_subprocess(game_id: str, scale: float, threads: int, detailed_phases: bool = False) -> dict:
+    """Benchmark a single game in a fresh interpreter, so imports and peak RSS are not shared between games."""
+    env = dict(os.environ, PYTHONHASHSEED="0", PHASE_TIMERS="detailed" if detailed_phases else "coarse")
+    command = [sys.executable, "-m", "utils.benchmarks.simulation_suite", "--worker", game_id]
+    command += ["--scale", str(scale), "--threads", str(threads)]
+    completed = subprocess.run(command, cwd=PROJECT_PATH, env=env, capture_output=True, text=True, check=False)
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER) :])
+    return {"error": (completed.stderr or completed.stdout).strip().splitlines()[-10:]}
+
+
+def get_scaled_sims(game_id: str, scale: float) -> dict:
+    """Fixed simulation counts of a game, multiplied by 'scale'."""
+    return {betmode: max(int(num_sims * scale), 1) for betmode, num_sims in BENCHMARK_GAMES[game_id].items()}
+
+
+def add_framework_relative_speed(results: dict) -> None:
+    """Simulation sims/sec of each game as a fraction of the framework-overhead baseline (fifty_fifty)."""
+    framework = results.get(FRAMEWORK_BASELINE_GAME, {}).get("stages", {}).get("simulation", {})
+    framework_speed = framework.get("sims_per_second")
+    for result in results.values():
+        simulation = result.get("stages", {}).get("simulation")
+        if simulation is not None and framework_speed:
+            simulation["relative_to_framework"] = round(simulation["sims_per_second"] / framework_speed, 4)
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Return a description of every stage whose time or peak RSS exceeds the baseline by more than 'tolerance'
+    (and by more than MIN_REGRESSION, so that noise on very short stages is not flagged).
+    Games which failed, or ran different simulation counts or threads than the baseline, are not compared.
+    """
+    regressions = []
+    for game_id, result in results.items():
+        reference = baseline.get(game_id)
+        if reference is None or "error" in reference or "error" in result:
+            continue
+        if reference["sims"] != result["sims"] or reference["threads"] != result["threads"]:
+            continue
+        for stage, measured in result["stages"].items():
+            for metric in ("seconds", "peak_rss_mb"):
+                previous, current = reference["stages"][stage][metric], measured[metric]
+                if current - previous < MIN_REGRESSION[metric]:
+                    continue
+                if previous > 0 and current > previous * (1 + tolerance):
+                    increase = round(100 * (current / previous - 1), 1)
+                    regressions.append(f"{game_id} {stage} {metric}: {current} vs baseline {previous} (+{increase}%)")
+    return regressions
+
+
+def run_suite(games: list, scale: float = 1.0, threads: int = 1, detailed_phases: bool = False) -> dict:
+    """Benchmark each game in turn, returning {game_id: result}."""
+    results = {}
+    for game_id in games:
+        print("Benchmarking", game_id, get_scaled_sims(game_id, scale), flush=True)
+        results[game_id] = run_game_in_subprocess(game_id, scale, threads, detailed_phases)
+        if "error" in results[game_id]:
+            print("\n".join(results[game_id]["error"]))
+        else:
+            stages = results[game_id]["stages"]
+            print(", ".join(f"{stage}: {stages[stage]['seconds']}s" for stage in BENCHMARK_STAGES), flush=True)
+    add_framework_relative_speed(results)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reproducible simulation benchmark over the sample games.")
+    parser.add_argument("--games", nargs="+", default=list(BENCHMARK_GAMES), choices=list(BENCHMARK_GAMES))
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier applied to the fixed simulation counts")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--output", default=RESULTS_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument(
+        "--detailed-phases", action="store_true", help="also time board draws, win evaluation and event emitters"
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        with redirect_stdout(sys.stderr):
+            result = run_game_benchmark(args.worker, get_scaled_sims(args.worker, args.scale), args.threads)
+        print(RESULT_MARKER + json.dumps(result))
+        return 0
+
+    results = run_suite(args.games, args.scale, args.threads, args.detailed_phases)
+    report = {"python": platform.python_version(), "machine": platform.machine(), "games": results}
+    with open(args.output, "w", encoding="UTF-8") as f:
+        f.write(json.dumps(report, indent=4))
+    print("Results written to", args.output)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="UTF-8") as f:
+            f.write(json.dumps(report, indent=4))
+        print("Baseline updated:", args.baseline)
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline found at", args.baseline, "(run with --update-baseline to create one)")
+        return 1
+    with open(args.baseline, "r", encoding="UTF-8") as f:
+        baseline = json.load(f)["games"]
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    for regression in regressions:
+        print("REGRESSION", regression)
+    print(len(regressions), "regressions against", args.baseline)
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
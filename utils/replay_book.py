@@ -0,0 +1,129 @@
+"""
+Regenerate a single book by id, without running a batch.
+Simulations are seeded from their sim id (see GeneralGameState.reset_seed()), so one book can be rebuilt
+given its criteria. The criteria is read from the segmented lookup table of a previous run when available,
+otherwise the criteria assignment of a 'num_sims' run is reconstructed with get_sim_splits()/assign_sim_criteria().
+Regenerated books can be verified against the published books file.
+
+Usage:
+    python -m utils.replay_book <game_id> <betmode> <book_id> [--num-sims N] [--timing] [--verify] [--output file]
+    python -m utils.replay_book <game_id> <betmode> --random 20 --verify
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+from io import TextIOWrapper
+from time import perf_counter
+
+import zstandard as zstd
+
+from src.state.phase_timer import summarise_phase_times, take_phase_times
+from src.state.run_sims import assign_sim_criteria, get_sim_splits
+from utils.benchmarks.golden_diff import find_first_difference, run_sim_records
+from utils.benchmarks.simulation_suite import load_game
+
+
+def read_segmented_criteria(gamestate: object, betmode: str) -> dict:
+    """{book_id: criteria} from the segmented lookup table of a previous run, empty if it does not exist."""
+    filename = gamestate.output_files.get_final_segmented_name(betmode)
+    if not os.path.exists(filename):
+        return {}
+    criteria = {}
+    with open(filename, "r", encoding="UTF-8") as f:
+        for line in f:
+            book_id, book_criteria, _ = line.split(",", 2)
+            criteria[int(book_id)] = book_criteria
+    return criteria
+
+
+def get_book_criteria(gamestate: object, betmode: str, book_ids: list, num_sims: int = None) -> dict:
+    """Criteria of each requested book, from the previous run's lookup or the reconstructed assignment."""
+    if num_sims is None:
+        segmented = read_segmented_criteria(gamestate, betmode)
+        if len(segmented) == 0:
+            raise RuntimeError(f"No segmented lookup table for '{betmode}', pass the run's num_sims instead.")
+        return {book_id: segmented[book_id] for book_id in book_ids}
+    sim_allocation = assign_sim_criteria(get_sim_splits(gamestate, num_sims, betmode), num_sims)
+    return {book_id: sim_allocation[book_id - 1] for book_id in book_ids}
+
+
+def replay_books(gamestate: object, betmode: str, book_criteria: dict) -> list:
+    """Regenerate books {book_id: criteria} in memory, returning [(book, seconds, phase times)]."""
+    replayed = []
+    take_phase_times()
+    for book_id in sorted(book_criteria):
+        start = perf_counter()
+        record = next(run_sim_records(gamestate, betmode, {book_id - 1: book_criteria[book_id]}))
+        replayed.append((record["book"], perf_counter() - start, take_phase_times()))
+    return replayed
+
+
+def read_published_books(gamestate: object, betmode: str, book_ids: set) -> dict:
+    """Books with the requested ids from the compressed books file, parsing only the matching lines."""
+    filename = gamestate.output_files.get_final_book_name(betmode, True)
+    books = {}
+    with open(filename, "rb") as f:
+        with zstd.ZstdDecompressor().stream_reader(f) as reader:
+            for line_index, line in enumerate(TextIOWrapper(reader, encoding="UTF-8")):
+                if line_index + 1 in book_ids:
+                    book = json.loads(line)
+                    books[book["id"]] = book
+                    if len(books) == len(book_ids):
+                        break
+    return books
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Regenerate single books by id.")
+    parser.add_argument("game_id")
+    parser.add_argument("betmode")
+    parser.add_argument("book_ids", nargs="*", type=int)
+    parser.add_argument("--num-sims", type=int, help="sims of the original run, if no lookup tables are available")
+    parser.add_argument("--random", type=int, help="replay this many random books of the previous run")
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="print replay time and phase breakdown (set PHASE_TIMERS=detailed for per-call phases)",
+    )
+    parser.add_argument("--verify", action="store_true", help="compare against the published books file")
+    parser.add_argument("--output", help="write regenerated books to a file instead of printing them")
+    args = parser.parse_args()
+
+    _, gamestate = load_game(args.game_id)
+    book_ids = list(args.book_ids)
+    if args.random is not None:
+        num_books = args.num_sims or len(read_segmented_criteria(gamestate, args.betmode))
+        book_ids += random.sample(range(1, num_books + 1), min(args.random, num_books))
+    book_criteria = get_book_criteria(gamestate, args.betmode, book_ids, args.num_sims)
+    replayed = replay_books(gamestate, args.betmode, book_criteria)
+
+    if args.timing:
+        for book, seconds, phase_times in replayed:
+            print(f"book {book['id']} ({book['criteria']}) replayed in {round(1000 * seconds, 2)}ms")
+            print(json.dumps(summarise_phase_times(phase_times), indent=4))
+    if args.output is not None:
+        with open(args.output, "w", encoding="UTF-8") as f:
+            for book, _, _ in replayed:
+                f.write(json.dumps(book) + "\n")
+    elif not args.verify:
+        for book, _, _ in replayed:
+            print(json.dumps(book, indent=4))
+
+    if args.verify:
+        published = read_published_books(gamestate, args.betmode, set(book_criteria))
+        mismatches = 0
+        for book, _, _ in replayed:
+            difference = find_first_difference(published.get(book["id"]), book, "book")
+            if difference is not None:
+                mismatches += 1
+                print(f"book {book['id']} differs at {difference[0]}: published {difference[1]}, replayed {difference[2]}")
+        print(len(replayed) - mismatches, "of", len(replayed), "books match the published file.")
+        return 1 if mismatches > 0 else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())